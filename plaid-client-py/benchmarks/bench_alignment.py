@@ -0,0 +1,125 @@
+"""Long-form transcript insertion: AlignmentProcessor's planning steps.
+
+Simulates a second ASR pass over a multi-hour recording. Half the segments
+were already transcribed (the existing alignment tokens, every other
+segment), and the new pass brings every segment again. The benchmark times
+the local work ``_create_time_alignment_tokens`` does before it writes
+anything:
+
+* filter out new segments that collide in time with existing tokens;
+* find each remaining segment's insertion point;
+* assemble the new text and the new token offsets;
+* reindex the existing tokens past the inserted text.
+
+It runs the old pairwise / per-insert-slicing code and then the processor's
+current methods.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_alignment.py [max_segments]
+"""
+
+import os
+import sys
+import timeit
+from bisect import bisect_right
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.asr import AlignmentProcessor
+from plaid_client.workflows.asr.alignment_processor import _time_begin
+
+# Beyond this many segments the old code takes too long to be worth timing.
+OLD_LIMIT = 4000
+WORDS = 'the quick brown fox jumps over the lazy dog and keeps on running'.split()
+
+
+def make_transcript(n_segments):
+    segments = [{'start': i * 3.0, 'end': i * 3.0 + 2.5,
+                 'text': ' '.join(WORDS[(i + k) % len(WORDS)] for k in range(8))}
+                for i in range(n_segments)]
+    existing, pos = [], 0
+    for seg in segments[::2]:
+        existing.append({'begin': pos, 'end': pos + len(seg['text']),
+                         'metadata': {'timeBegin': seg['start'], 'timeEnd': seg['end']}})
+        pos += len(seg['text']) + 1
+    text = ' '.join(seg['text'] for seg in segments[::2])
+    # Slightly shifted timings, so the odd segments fall in the gaps.
+    transcriptions = [dict(seg, start=seg['start'] + 0.1, end=seg['end'] + 0.2)
+                      for seg in segments]
+    return text, existing, transcriptions
+
+
+def _modification(position, trans, final):
+    segment = trans['text'].strip()
+    return {'position': position, 'new_text': segment if final else segment + ' ',
+            'segment_start_offset': 0, 'segment_length': len(segment)}
+
+
+def old_plan(text, existing, transcriptions):
+    kept = []
+    for trans in transcriptions:
+        if not any(not (trans['end'] <= e['metadata']['timeBegin']
+                        or trans['start'] >= e['metadata']['timeEnd']) for e in existing):
+            kept.append(trans)
+    mods = []
+    for i, trans in enumerate(kept):
+        by_time = sorted(existing, key=_time_begin)
+        position = by_time[-1]['end']
+        for j, token in enumerate(by_time):
+            if trans['start'] < _time_begin(token):
+                position = 0 if j == 0 else by_time[j - 1]['end']
+                break
+        mods.append(_modification(position, trans, i == len(kept) - 1))
+    mods.sort(key=lambda m: m['position'])
+    new_text, offset, extents = text, 0, []
+    for mod in mods:
+        at = mod['position'] + offset
+        new_text = new_text[:at] + mod['new_text'] + new_text[at:]
+        extents.append((at, at + mod['segment_length']))
+        offset += len(mod['new_text'])
+    shifted = [t['begin'] + sum(len(m['new_text']) for m in mods if m['position'] <= t['begin'])
+               for t in existing]
+    return new_text, extents, shifted
+
+
+def new_plan(processor, text, existing, transcriptions):
+    kept = processor._filter_time_collisions(transcriptions, existing)
+    times = [_time_begin(t) for t in existing]
+    mods = [_modification(processor._find_text_insertion_position(text, existing, trans['start'],
+                                                                  times=times),
+                          trans, i == len(kept) - 1)
+            for i, trans in enumerate(kept)]
+    mods.sort(key=lambda m: m['position'])
+    new_text, extents = processor._apply_text_modifications(text, mods)
+    positions = [m['position'] for m in mods]
+    inserted = [0] + list(accumulate(len(m['new_text']) for m in mods))
+    shifted = [t['begin'] + inserted[bisect_right(positions, t['begin'])] for t in existing]
+    return new_text, extents, shifted
+
+
+def best(fn, *args):
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=3))
+
+
+def main():
+    max_segments = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    processor = AlignmentProcessor()
+    print(f'{"segments":>9} {"hours":>6} {"chars":>9} {"old":>12} {"indexed":>12}')
+    n = 1000
+    while n <= max_segments:
+        text, existing, transcriptions = make_transcript(n)
+        if n <= OLD_LIMIT:
+            assert old_plan(text, existing, transcriptions) == \
+                new_plan(processor, text, existing, transcriptions)
+            old_t = f'{best(old_plan, text, existing, transcriptions) * 1000:10.1f}ms'
+        else:
+            old_t = '-'
+        new_t = best(new_plan, processor, text, existing, transcriptions) * 1000
+        print(f'{n:>9} {n * 3 / 3600:6.1f} {len(text) * 2:>9} {old_t:>12} {new_t:10.1f}ms')
+        n *= 4
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Micro-benchmark for the JSON codec on document-sized payloads.
+
+Compares the stdlib and orjson backends (when installed) encoding and
+decoding a ``documents.get(include_body=True)``-shaped body.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_codec.py [n_tokens]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_transforms import make_document
+from plaid_client.codec import ORJSON, STDLIB
+
+
+def bench(label, fn, number=5):
+    best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f'  {label:<22} {best * 1000:8.2f} ms')
+    return best
+
+
+def main():
+    n_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    doc = make_document(n_tokens)
+    codecs = [STDLIB] + ([ORJSON] if ORJSON is not None else [])
+    encoded = STDLIB.dumps(doc)
+    print(f'document with {n_tokens} tokens + spans, {len(encoded) / 1e6:.1f} MB encoded')
+
+    timings = {}
+    for c in codecs:
+        timings[c.name] = (bench(f'{c.name} dumps', lambda: c.dumps(doc)),
+                           bench(f'{c.name} loads', lambda: c.loads(encoded)))
+    if ORJSON is None:
+        print('orjson not installed; pip install orjson to compare')
+    else:
+        std, fast = timings['json'], timings['orjson']
+        print(f'  speed-up: dumps {std[0] / fast[0]:.1f}x, loads {std[1] / fast[1]:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Scaling of sentence/word/morpheme grouping: nested scans vs IntervalIndex.
+
+Times the two groupings the UD parser does on an already-tokenized document —
+words under their sentences, and each syntactic word to its sentence — for
+growing sentence counts (10 words per sentence, one syntactic word per word),
+first with the nested scans it used to run, then with
+:class:`~plaid_client.workflows.intervals.IntervalIndex`. The index columns
+grow linearly; the nested scans quadruple with every doubling.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_intervals.py [max_sentences]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.intervals import IntervalIndex
+
+# Beyond this many sentences the nested scans take too long to be worth timing.
+NESTED_LIMIT = 2000
+
+
+def make_document(n_sentences):
+    words = [{'id': f'w{i}', 'begin': i * 6, 'end': i * 6 + 5} for i in range(n_sentences * 10)]
+    sentences = [{'id': f's{i}', 'begin': i * 60, 'end': i * 60 + 60} for i in range(n_sentences)]
+    morphemes = [dict(w, id=f'm{i}') for i, w in enumerate(words)]
+    return sentences, words, morphemes
+
+
+def nested(sentences, words, morphemes):
+    groups = [(s, [w for w in words if s['begin'] <= w['begin'] and w['end'] <= s['end']])
+              for s in sentences]
+    m2s = {}
+    for m in morphemes:
+        for idx, (s, _ws) in enumerate(groups):
+            if s['begin'] <= m['begin'] and m['end'] <= s['end']:
+                m2s[m['id']] = idx
+                break
+    return groups, m2s
+
+
+def indexed(sentences, words, morphemes):
+    index = IntervalIndex(words)
+    groups = [(s, index.within(s['begin'], s['end'])) for s in sentences]
+    by_sentence = IntervalIndex(s for s, _ws in groups)
+    m2s = {}
+    for m in morphemes:
+        idx = by_sentence.find_container(m['begin'], m['end'])
+        if idx is not None:
+            m2s[m['id']] = idx
+    return groups, m2s
+
+
+def best(fn, *args):
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=3))
+
+
+def main():
+    max_sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    print(f'{"sentences":>10} {"words":>8} {"nested":>12} {"IntervalIndex":>14}')
+    n = 500
+    while n <= max_sentences:
+        document = make_document(n)
+        if n <= 1000:
+            assert nested(*document) == indexed(*document)
+        nested_t = f'{best(nested, *document) * 1000:10.1f}ms' if n <= NESTED_LIMIT else '-'
+        index_t = best(indexed, *document) * 1000
+        print(f'{n:>10} {n * 10:>8} {nested_t:>12} {index_t:12.1f}ms')
+        n *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Payload comparison: ``documents.get(include_body=True)`` vs ``get_skeleton``.
+
+Builds the wire bodies of a synthetic UD-annotated document (sentence, word
+and syntactic-word token layers; form/lemma/UPOS/XPOS/feature spans with
+provenance metadata; dependency relations) and of the two query responses a
+skeleton read of its sentence + word layers returns, then reports their
+encoded sizes and decode times.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_skeleton.py [n_words]
+"""
+
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.codec import dumps, loads
+
+PROV = {'prov': 'inferred', 'provSource': 'service:stanza-parser',
+        'provDetail': {'model': 'stanza==1.9.2', 'language': 'en'}}
+
+
+def _id():
+    return str(uuid.uuid4())
+
+
+def _tokens(layer, extents, metadata=None):
+    return [{'token/id': _id(), 'token/text': 'TXT', 'token/layer': layer,
+             'token/begin': b, 'token/end': e, 'token/precedence': None,
+             **({'metadata': dict(metadata)} if metadata else {})} for b, e in extents]
+
+
+def make_documents(n_words):
+    words = [(i * 6, i * 6 + 5) for i in range(n_words)]
+    sentences = [(i * 60, min((i + 10) * 6, n_words * 6)) for i in range(0, n_words, 10)]
+    sentence_tokens = _tokens('SENT', sentences)
+    word_tokens = _tokens('WORD', words)
+    morph_tokens = _tokens('MORPH', words, PROV)
+
+    def spans(layer, value, per_token=1):
+        return [{'span/id': _id(), 'span/layer': layer, 'span/value': value,
+                 'span/tokens': [t['token/id']], 'metadata': dict(PROV)}
+                for t in morph_tokens for _ in range(per_token)]
+
+    lemma = spans('LEMMA', 'lemma')
+    relations = [{'relation/id': _id(), 'relation/layer': 'DEP', 'relation/value': 'nsubj',
+                  'relation/source': lemma[i - 1]['span/id'], 'relation/target': s['span/id'],
+                  'metadata': dict(PROV)} for i, s in enumerate(lemma)]
+    span_layers = [
+        {'span-layer/id': 'FORM', 'span-layer/spans': spans('FORM', 'form')},
+        {'span-layer/id': 'LEMMA', 'span-layer/spans': lemma,
+         'span-layer/relation-layers': [{'relation-layer/id': 'DEP',
+                                         'relation-layer/relations': relations}]},
+        {'span-layer/id': 'UPOS', 'span-layer/spans': spans('UPOS', 'NOUN')},
+        {'span-layer/id': 'XPOS', 'span-layer/spans': spans('XPOS', 'NN')},
+        {'span-layer/id': 'FEATS', 'span-layer/spans': spans('FEATS', 'Number=Sing', 3)},
+    ]
+    text = {'text/id': _id(), 'text/body': 'abcde ' * n_words, 'text/layer': 'TXT',
+            'text/document': 'D'}
+    full = {
+        'document/id': 'D', 'document/name': 'bench', 'document/project': 'P',
+        'document/text-layers': [{
+            'text-layer/id': 'TXT', 'text-layer/text': text,
+            'text-layer/token-layers': [
+                {'token-layer/id': 'SENT', 'token-layer/tokens': sentence_tokens},
+                {'token-layer/id': 'WORD', 'token-layer/tokens': word_tokens},
+                {'token-layer/id': 'MORPH', 'token-layer/tokens': morph_tokens,
+                 'token-layer/span-layers': span_layers},
+            ],
+        }],
+    }
+    texts = {'return': 'entities', 'columns': ['?x'], 'results': [[text]],
+             'count': 1, 'truncated': False}
+    rows = [[t['token/layer'], t['token/id'], t['token/begin'], t['token/end'], None, 1]
+            for t in sentence_tokens + word_tokens]
+    tokens = {'return': 'aggregate', 'columns': [], 'results': rows,
+              'count': len(rows), 'truncated': False}
+    return full, [texts, tokens]
+
+
+def bench(label, fn, number=5):
+    best = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f'  {label:<22} {best * 1000:8.2f} ms')
+    return best
+
+
+def main():
+    n_words = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    full, parts = make_documents(n_words)
+    full_bytes = dumps(full)
+    part_bytes = [dumps(p) for p in parts]
+    skeleton_size = sum(len(b) for b in part_bytes)
+    print(f'document with {n_words} words, fully UD-annotated')
+    print(f'  full document          {len(full_bytes) / 1e6:8.2f} MB')
+    print(f'  skeleton (sent + word) {skeleton_size / 1e6:8.2f} MB')
+    print(f'  ratio                  {len(full_bytes) / skeleton_size:8.1f}x smaller')
+    full_t = bench('decode full', lambda: loads(full_bytes))
+    skel_t = bench('decode skeleton', lambda: [loads(b) for b in part_bytes])
+    print(f'  decode speed-up: {full_t / skel_t:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Memory and scan cost: token dicts vs :class:`~plaid_client.tables.TokenTable`.
+
+Decodes a synthetic word layer (UUID ids, provenance metadata on every token)
+the way a ``documents.get`` response arrives, then measures the memory held by
+the list of token dicts and by the equivalent table, and the time to group the
+words under their sentences both ways.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_tables.py [n_tokens]
+"""
+
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.codec import dumps, loads
+from plaid_client.tables import TokenTable
+
+PROV = {'prov': 'inferred', 'provSource': 'service:stanza-parser'}
+
+
+def make_payloads(n_tokens):
+    text_id = str(uuid.uuid4())
+    words = [{'id': str(uuid.uuid4()), 'text': text_id, 'begin': i * 6, 'end': i * 6 + 5,
+              'precedence': None, 'metadata': dict(PROV)} for i in range(n_tokens)]
+    sentences = [{'id': str(uuid.uuid4()), 'text': text_id, 'begin': i * 6,
+                  'end': min(i + 20, n_tokens) * 6, 'precedence': None}
+                 for i in range(0, n_tokens, 20)]
+    return dumps(words), dumps(sentences)
+
+
+def held(build):
+    """Bytes still allocated by ``build()``'s result once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def group_dicts(sentences, words):
+    groups = []
+    for s in sentences:
+        groups.append([w for w in words if s['begin'] <= w['begin'] and w['end'] <= s['end']])
+    return groups
+
+
+def main():
+    n_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    word_bytes, sentence_bytes = make_payloads(n_tokens)
+
+    words, dict_size = held(lambda: loads(word_bytes))
+    table, table_size = held(lambda: TokenTable.from_tokens(loads(word_bytes)))
+    print(f'{n_tokens} word tokens ({len(word_bytes) / 1e6:.1f} MB of JSON)')
+    print(f'  list of dicts  {dict_size / 1e6:8.1f} MB')
+    print(f'  TokenTable     {table_size / 1e6:8.1f} MB  ({dict_size / table_size:.1f}x smaller)')
+
+    sentences = loads(sentence_bytes)
+    sentence_table = TokenTable.from_tokens(sentences)
+    # The dict scan is quadratic: time it on a slice so the benchmark finishes.
+    n_dict = min(len(sentences), 200)
+    dict_t = min(timeit.repeat(lambda: group_dicts(sentences[:n_dict], words),
+                               number=1, repeat=3)) * len(sentences) / n_dict
+    table_t = min(timeit.repeat(lambda: sentence_table.group(table), number=1, repeat=3))
+    print(f'group {n_tokens} words under {len(sentences)} sentences')
+    print(f'  nested scan over dicts  {dict_t * 1000:10.1f} ms (extrapolated)')
+    print(f'  TokenTable.group        {table_t * 1000:10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
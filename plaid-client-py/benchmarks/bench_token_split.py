@@ -0,0 +1,91 @@
+"""Scaling of TokenProcessor's cross-sentence retokenization core.
+
+Times what ``_process_tokens_locked`` does with the existing word tokens when
+the sentence partition is reset: split every word that crosses a sentence
+boundary and work out which originals were split into which pieces. The old
+path checked every token against every sentence and then re-scanned all split
+pieces once per original token; the sweep does both in one pass. Documents
+have 15 words per sentence, and every third sentence boundary falls inside a
+word.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_token_split.py [max_tokens]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.tokenization import TokenProcessor
+
+# Beyond this many tokens the old path takes too long to be worth timing.
+OLD_LIMIT = 10000
+
+
+def make_document(n_tokens):
+    tokens = [{'id': f't{i}', 'begin': i * 6, 'end': i * 6 + 5} for i in range(n_tokens)]
+    # Boundary k sits just before word 15k, or two characters into it.
+    cuts = [i * 6 + (2 if (i // 15) % 3 == 0 else -1) for i in range(15, n_tokens, 15)]
+    edges = [0] + cuts + [n_tokens * 6]
+    sentences = [{'begin': b, 'end': e} for b, e in zip(edges, edges[1:])]
+    return tokens, sentences
+
+
+def old_path(tokens, sentences):
+    boundaries = sorted((s['begin'], s['end']) for s in sentences)
+    split = []
+    for t in tokens:
+        hits = [(b, e) for b, e in boundaries if t['begin'] < e and t['end'] > b]
+        if len(hits) <= 1:
+            split.append(t)
+        else:
+            split.extend({'begin': max(t['begin'], b), 'end': min(t['end'], e)}
+                         for b, e in hits if max(t['begin'], b) < min(t['end'], e))
+    deleted, pieces = [], []
+    for orig in tokens:
+        matching = [t for t in split if t['begin'] >= orig['begin'] and t['end'] <= orig['end']]
+        if len(matching) > 1:
+            deleted.append(orig['id'])
+            pieces.extend({'begin': t['begin'], 'end': t['end']} for t in matching)
+        elif len(matching) == 1:
+            pieces.append({'begin': orig['begin'], 'end': orig['end']})
+    return deleted, pieces
+
+
+def new_path(processor, tokens, sentences):
+    deleted, pieces = [], []
+    for orig, split in zip(tokens, processor._split_pieces(tokens, sentences)):
+        if split is not None:
+            deleted.append(orig['id'])
+            pieces.extend(split)
+        else:
+            pieces.append({'begin': orig['begin'], 'end': orig['end']})
+    return deleted, pieces
+
+
+def best(fn, *args):
+    return min(timeit.repeat(lambda: fn(*args), number=1, repeat=3))
+
+
+def main():
+    max_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    processor = TokenProcessor()
+    print(f'{"tokens":>9} {"sentences":>10} {"old":>12} {"sweep":>12}')
+    n = 1000
+    while n <= max_tokens:
+        tokens, sentences = make_document(n)
+        if n <= OLD_LIMIT:
+            assert old_path(tokens, sentences) == new_path(processor, tokens, sentences)
+            old_t = f'{best(old_path, tokens, sentences) * 1000:10.1f}ms'
+        else:
+            old_t = '-'
+        new_t = best(new_path, processor, tokens, sentences) * 1000
+        print(f'{n:>9} {len(sentences):>10} {old_t:>12} {new_t:10.1f}ms')
+        n *= 10
+
+
+if __name__ == '__main__':
+    main()
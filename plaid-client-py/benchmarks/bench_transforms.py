@@ -0,0 +1,101 @@
+"""Micro-benchmark for request/response key transforms.
+
+Times ``transform_response`` / ``transform_request`` on a synthetic
+``documents.get(include_body=True)``-shaped payload against the original
+recursive, uncached implementation kept inline below.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_transforms.py [n_tokens]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.transforms import OPAQUE_KEYS, transform_request, transform_response
+
+
+def _recursive_response(obj):
+    if isinstance(obj, list):
+        return [_recursive_response(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        new_key = re.sub(r'^[^/]+/', '', key).replace('-', '_')
+        if new_key in OPAQUE_KEYS and isinstance(value, dict):
+            out[new_key] = value
+        else:
+            out[new_key] = _recursive_response(value)
+    return out
+
+
+def _recursive_request(obj):
+    if isinstance(obj, list):
+        return [_recursive_request(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        new_key = key.replace('_', '-')
+        if key in OPAQUE_KEYS and isinstance(value, dict):
+            out[new_key] = value
+        else:
+            out[new_key] = _recursive_request(value)
+    return out
+
+
+def make_document(n_tokens):
+    tokens = [{'token/id': f'tok-{i}', 'token/text': 'T', 'token/begin': i * 5,
+               'token/end': i * 5 + 4, 'token/precedence': None,
+               'metadata': {'lemma-form': 'x'}} for i in range(n_tokens)]
+    spans = [{'span/id': f'span-{i}', 'span/value': 'NOUN', 'span/tokens': [f'tok-{i}'],
+              'span/layer': 'SL'} for i in range(n_tokens)]
+    return {
+        'document/id': 'D', 'document/name': 'bench', 'document/version': 'v',
+        'document/text-layers': [{
+            'text-layer/id': 'TL', 'text-layer/name': 'Text',
+            'text-layer/text': {'text/id': 'T', 'text/body': 'x' * (n_tokens * 5)},
+            'text-layer/token-layers': [{
+                'token-layer/id': 'TKL', 'token-layer/tokens': tokens,
+                'token-layer/span-layers': [{'span-layer/id': 'SL', 'span-layer/spans': spans}],
+            }],
+        }],
+    }
+
+
+def make_bulk_body(n_tokens):
+    return [{'token_layer_id': 'TKL', 'text': 'T', 'begin': i * 5, 'end': i * 5 + 4,
+             'precedence': None, 'metadata': {'lemma_form': 'x'}} for i in range(n_tokens)]
+
+
+def bench(label, fn, arg, number):
+    best = min(timeit.repeat(lambda: fn(arg), number=number, repeat=5)) / number
+    print(f'  {label:<28} {best * 1000:8.2f} ms')
+    return best
+
+
+def main():
+    n_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    doc = make_document(n_tokens)
+    body = make_bulk_body(n_tokens)
+    assert transform_response(doc) == _recursive_response(doc)
+    assert transform_request(body) == _recursive_request(body)
+
+    print(f'transform_response, document with {n_tokens} tokens + spans')
+    old = bench('recursive (original)', _recursive_response, doc, 3)
+    new = bench('iterative + key cache', transform_response, doc, 3)
+    print(f'  speed-up: {old / new:.2f}x')
+
+    print(f'transform_request, bulk body with {n_tokens} tokens')
+    old = bench('recursive (original)', _recursive_request, body, 3)
+    new = bench('iterative + key cache', transform_request, body, 3)
+    print(f'  speed-up: {old / new:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
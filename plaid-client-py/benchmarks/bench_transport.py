@@ -0,0 +1,94 @@
+"""The requests transport against the httpx one, sequential and concurrent.
+
+Each run makes N small JSON calls (``documents.get``), first one after the
+other, then spread over a thread pool the way ``bulk_max_workers`` and the
+async client spread them. By default the calls go to a local stub server with
+an artificial per-request latency; pass a server URL and token to measure a
+real deployment instead. HTTP/2 is negotiated over TLS, so only an
+``https://`` server shows multiplexing — against the plain-http stub both
+transports speak HTTP/1.1 and the numbers show the per-call overhead of each
+client library.
+
+Run with::
+
+    cd plaid-client-py && python benchmarks/bench_transport.py [url token document_id]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client import PlaidClient
+
+CALLS = 400
+WORKERS = 16
+LATENCY = 0.005  # seconds per request at the stub server
+BODY = json.dumps({'document/id': 'D', 'document/name': 'bench',
+                   'document/version': 'v1'}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY each
+    # response stalls on the client's delayed ACK.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def run(client, document_id, workers):
+    client.documents.get(document_id)  # warm the connection pool
+    start = time.perf_counter()
+    if workers == 1:
+        for _ in range(CALLS):
+            client.documents.get(document_id)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda _: client.documents.get(document_id), range(CALLS)))
+    return time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) > 3:
+        url, token, document_id = sys.argv[1:4]
+    else:
+        _server, url = _stub_server()
+        token, document_id = 'tok', 'D'
+    print(f'{CALLS} calls to {url}')
+    print(f'{"transport":>10} {"sequential":>12} {f"{WORKERS} threads":>12}')
+    for transport in ('requests', 'httpx'):
+        try:
+            client = PlaidClient(url, token, transport=transport)
+        except ImportError as e:
+            print(f'{transport:>10}  skipped: {e}')
+            continue
+        with client:
+            seq = run(client, document_id, 1)
+            par = run(client, document_id, WORKERS)
+        print(f'{transport:>10} {seq * 1000:10.0f}ms {par * 1000:10.0f}ms')
+
+
+if __name__ == '__main__':
+    main()
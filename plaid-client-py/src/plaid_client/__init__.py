@@ -1,5 +1,7 @@
 from plaid_client.client import PlaidClient
-from plaid_client.http import PlaidAPIError
+from plaid_client.async_client import AsyncPlaidClient
+from plaid_client.http import PlaidAPIError, PartialBatchError
+from plaid_client.cache import AsOfCache, ConditionalCache, DocumentCache
 from plaid_client.service import BaseService
 from plaid_client.service_schema import (
     TASKS,
@@ -28,10 +30,17 @@ from plaid_client.roles import (
     read_role,
     find_by_role,
 )
+from plaid_client.layer_index import LayerIndex, get_layer_index
+from plaid_client.tables import TokenTable, SpanTable
 
 __all__ = [
     "PlaidClient",
+    "AsyncPlaidClient",
     "PlaidAPIError",
+    "PartialBatchError",
+    "DocumentCache",
+    "ConditionalCache",
+    "AsOfCache",
     "BaseService",
     "TASKS",
     "Param",
@@ -54,4 +63,8 @@ __all__ = [
     "ROLES",
     "read_role",
     "find_by_role",
+    "LayerIndex",
+    "get_layer_index",
+    "TokenTable",
+    "SpanTable",
 ]
@@ -0,0 +1,291 @@
+"""Asyncio front-end for :class:`PlaidClient`.
+
+``AsyncPlaidClient`` exposes the same resource bundles as the sync client
+(``client.documents``, ``client.tokens``, …) but every method is awaitable, so
+an importer can keep many requests in flight at once::
+
+    async with AsyncPlaidClient(base_url, token, max_concurrency=32) as client:
+        docs = await asyncio.gather(*(client.documents.get(d, include_body=True)
+                                      for d in doc_ids))
+
+It does not re-implement the HTTP layer: each call runs the sync client's own
+method on a bounded worker pool, so request transforms, strict-mode
+document-version stamping, audit-message stamping, batching and error handling
+(:class:`PlaidAPIError`) are exactly the sync client's. ``max_concurrency``
+bounds the number of requests in flight; further calls wait their turn.
+
+Client-wide state (strict mode, batch mode, ``document_versions``) is shared by
+every task using the client, just as it is shared by threads using a sync
+client. The ambient audit message is the exception: ``audit_message()`` here is
+scoped to the current task, so concurrent tasks can carry different messages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from plaid_client import sse_async
+from plaid_client.client import PlaidClient, _BatchContext
+from plaid_client.http import DEFAULT_TIMEOUT_S
+
+#: Default number of requests an ``AsyncPlaidClient`` keeps in flight.
+DEFAULT_MAX_CONCURRENCY = 16
+
+# Per-task ambient audit message (see AsyncPlaidClient.audit_message). A
+# ContextVar rather than a client attribute: asyncio copies the context into
+# every task, so one task's ``with client.audit_message(...)`` never leaks into
+# a sibling task's writes.
+_audit_message_var: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    'plaid_async_audit_message', default=None)
+
+_END = object()
+
+
+class _AsyncResource:
+    """Awaitable view of one sync resource bundle.
+
+    Public methods are looked up on the wrapped sync resource and returned as
+    coroutine functions. ``iter_*`` methods (cursor pagination) return async
+    iterators instead, fetching each page on the worker pool.
+    """
+
+    def __init__(self, client: AsyncPlaidClient, resource):
+        self._client = client
+        self._resource = resource
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+        if name.startswith('iter_'):
+            wrapped = self._wrap_iter(attr)
+        else:
+            wrapped = self._wrap(attr)
+        functools.update_wrapper(wrapped, attr)
+        return wrapped
+
+    def __dir__(self):
+        return sorted(set(super().__dir__())
+                      | {n for n in dir(self._resource) if not n.startswith('_')})
+
+    def _wrap(self, method):
+        takes_audit = 'audit_message' in inspect.signature(method).parameters
+
+        async def call(*args, **kwargs):
+            if takes_audit and kwargs.get('audit_message') is None:
+                ambient = _audit_message_var.get()
+                if ambient is not None:
+                    kwargs['audit_message'] = ambient
+            return await self._client._run(method, *args, **kwargs)
+        return call
+
+    def _wrap_iter(self, method):
+        def call(*args, **kwargs):
+            return self._client._aiter(method, *args, **kwargs)
+        return call
+
+
+class _AsyncDocumentsResource(_AsyncResource):
+    @asynccontextmanager
+    async def locked(self, document_id: str):
+        """Async peer of :meth:`DocumentsResource.locked`: hold the document's
+        server-enforced lock for an ``async with`` block, releasing it on exit
+        (including on error). Same semantics and caveats as the sync version."""
+        sync_cm = self._resource.locked(document_id)
+        await self._client._run(sync_cm.__enter__)
+        try:
+            yield
+        except BaseException as e:
+            await self._client._run(sync_cm.__exit__, type(e), e, e.__traceback__)
+            raise
+        else:
+            await self._client._run(sync_cm.__exit__, None, None, None)
+
+
+class _AsyncMessagesResource(_AsyncResource):
+    def events(self, project_id: str, path: str | None = None):
+        """Async iterator of ``(event_type, data)`` from a project's stream,
+        read on the running event loop rather than a thread of its own (see
+        :func:`plaid_client.sse_async.listen`); the stream is reopened when it
+        drops. ``path`` as in :meth:`MessagesResource.listen`::
+
+            async for event_type, data in client.messages.events(project_id):
+                ...
+        """
+        return sse_async.listen(self._client.sync, project_id, path=path)
+
+
+_ASYNC_RESOURCES = {'documents': _AsyncDocumentsResource,
+                    'messages': _AsyncMessagesResource}
+
+
+class AsyncPlaidClient:
+    """Awaitable Plaid client with bounded request concurrency.
+
+    Args:
+        base_url: The base URL for the API
+        token: The authentication token
+        timeout: Per-request timeout in seconds (default 30; ``None`` disables it).
+        max_concurrency: Maximum number of requests in flight at once
+            (default 16). Also sizes the HTTP connection pool (``pool_maxsize``)
+            so every worker can hold its own keep-alive connection.
+        raw_responses: Return read results untransformed by default (see
+            :class:`PlaidClient`).
+        transport: ``'requests'`` (default) or ``'httpx'``, which multiplexes
+            the concurrent requests over HTTP/2 (see :class:`PlaidClient`).
+    """
+
+    def __init__(self, base_url: str, token: str, timeout: float | None = DEFAULT_TIMEOUT_S,
+                 *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, raw_responses: bool = False,
+                 transport: str = 'requests'):
+        # urllib3 keeps at most pool_maxsize idle connections per host; size it
+        # to the worker count so concurrent requests reuse connections instead
+        # of opening and discarding extra ones.
+        self._init(PlaidClient(base_url, token, timeout=timeout, pool_maxsize=max_concurrency,
+                               raw_responses=raw_responses, transport=transport),
+                   max_concurrency)
+
+    def _init(self, sync_client: PlaidClient, max_concurrency: int, owns_client: bool = True):
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self.sync = sync_client
+        # A client passed in by the caller stays theirs to close.
+        self._owns_client = owns_client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='plaid-async')
+
+        for name, resource in vars(sync_client).items():
+            if type(resource).__name__.endswith('Resource'):
+                cls = _ASYNC_RESOURCES.get(name, _AsyncResource)
+                setattr(self, name, cls(self, resource))
+
+    @classmethod
+    def from_client(cls, client: PlaidClient, *,
+                    max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> AsyncPlaidClient:
+        """Wrap an existing sync client (sharing its session, token, strict-mode
+        state and document versions). The session's pool is used as configured,
+        so build the client with ``pool_maxsize >= max_concurrency``.
+        :meth:`aclose` leaves the wrapped client open."""
+        self = cls.__new__(cls)
+        self._init(client, max_concurrency, owns_client=False)
+        return self
+
+    # --- execution ----------------------------------------------------------
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _aiter(self, method, *args, **kwargs):
+        it = await self._run(method, *args, **kwargs)
+        try:
+            while True:
+                item = await self._run(next, it, _END)
+                if item is _END:
+                    return
+                yield item
+        finally:
+            close = getattr(it, 'close', None)
+            if close is not None:
+                close()
+
+    # --- shared client state ------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        return self.sync.base_url
+
+    @property
+    def token(self) -> str:
+        return self.sync.token
+
+    @property
+    def document_versions(self) -> dict[str, str]:
+        return self.sync.document_versions
+
+    async def query(self, body: Any, *, raw: bool | None = None) -> Any:
+        """Run a query over every project you can read. See
+        :meth:`PlaidClient.query`."""
+        return await self._run(self.sync.query, body, raw=raw)
+
+    def enter_strict_mode(self, document_id: str) -> None:
+        """Enter strict mode for a document (client-wide; see
+        :meth:`PlaidClient.enter_strict_mode`)."""
+        self.sync.enter_strict_mode(document_id)
+
+    def exit_strict_mode(self) -> None:
+        """Exit strict mode."""
+        self.sync.exit_strict_mode()
+
+    @contextmanager
+    def audit_message(self, message: str):
+        """Run the block with a custom audit-log message applied to its writes.
+
+        Unlike the sync client this is scoped to the current asyncio task (and
+        tasks it spawns), so concurrent tasks can each carry their own message.
+        An explicit per-call ``audit_message=`` still wins."""
+        reset = _audit_message_var.set(message)
+        try:
+            yield
+        finally:
+            _audit_message_var.reset(reset)
+
+    @asynccontextmanager
+    async def batched(self, *, chunk_size: int | None = None, max_workers: int = 1):
+        """Collect the awaited calls in this block into ONE atomic batch request.
+
+        Same semantics as :meth:`PlaidClient.batched`. Batch mode is client-wide,
+        so don't run unrelated requests on this client concurrently with the
+        block — they would be queued into the batch too::
+
+            async with client.batched() as b:
+                await client.tokens.bulk_create(sentence_ops)
+                await client.tokens.bulk_create(word_ops)
+            sentence_results, word_results = b.results
+        """
+        self.sync.begin_batch()
+        ctx = _BatchContext()
+        try:
+            yield ctx
+        except BaseException:
+            if self.sync.is_batch_mode():
+                self.sync.abort_batch()
+            raise
+        else:
+            ctx.results = await self._run(self.sync.submit_batch, chunk_size=chunk_size,
+                                          max_workers=max_workers)
+
+    # --- lifecycle ----------------------------------------------------------
+
+    async def aclose(self) -> None:
+        """Shut down the worker pool and close the underlying HTTP session,
+        unless the sync client was passed in with :meth:`from_client`."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_client:
+            self.sync.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    @classmethod
+    async def login(cls, base_url: str, user_id: str, password: str,
+                    timeout: float | None = DEFAULT_TIMEOUT_S, *,
+                    max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> AsyncPlaidClient:
+        """Authenticate and return a new async client. See :meth:`PlaidClient.login`."""
+        sync_client = await asyncio.to_thread(PlaidClient.login, base_url, user_id,
+                                              password, timeout, pool_maxsize=max_concurrency)
+        self = cls.from_client(sync_client, max_concurrency=max_concurrency)
+        self._owns_client = True
+        return self
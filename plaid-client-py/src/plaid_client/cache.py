@@ -0,0 +1,339 @@
+"""Client-side caches for read-heavy workloads.
+
+``DocumentCache`` keeps recent ``documents.get`` responses keyed on the
+document's tracked version (``PlaidClient.document_versions``, fed by every
+response's ``X-Document-Versions`` header). A repeated read is served locally
+for as long as the version this client last saw is unchanged; any write made
+through the same client bumps that version, so the next read goes back to the
+server. Writes by *other* clients are only noticed once this client sees a new
+version, so pass ``ttl`` to bound staleness when other writers are active.
+
+``ConditionalCache`` stores HTTP validators (``ETag`` / ``Last-Modified``) per
+GET URL and revalidates with ``If-None-Match`` / ``If-Modified-Since``; a
+``304 Not Modified`` reply is answered from the stored body, so an unchanged
+multi-MB payload costs one round-trip but no download.
+
+``AsOfCache`` persists responses to ``as_of``-stamped GETs in a SQLite file.
+A snapshot of the past never changes, so those reads are served from disk —
+across process restarts — without contacting the server at all.
+
+All of them hold the response's wire bytes rather than parsed objects: each hit
+decodes a fresh copy (so callers may mutate what they get back), and the size
+bound is exact.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+#: Default bounds for the caches below.
+DEFAULT_CACHE_ENTRIES = 64
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def _fingerprint(token):
+    """Short digest identifying ``token`` without storing it."""
+    return hashlib.sha256((token or '').encode('utf-8')).hexdigest()[:16]
+
+
+class _BoundedCache:
+    """Thread-safe LRU map of ``key -> (meta, content bytes)``, bounded by
+    entry count and total content size."""
+
+    def __init__(self, max_entries, max_bytes):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError('max_entries and max_bytes must be positive')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _lookup(self, key):
+        # Caller holds the lock.
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, meta, content):
+        # Caller holds the lock.
+        self._discard(key)
+        if len(content) > self.max_bytes:
+            return
+        self._entries[key] = (meta, content)
+        self.nbytes += len(content)
+        while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, old) = self._entries.popitem(last=False)
+            self.nbytes -= len(old)
+            self.evictions += 1
+
+    def _discard(self, key):
+        # Caller holds the lock.
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= len(entry[1])
+
+
+class DocumentCache(_BoundedCache):
+    """LRU cache of document responses, bounded by entry count and total bytes.
+
+    Pass one to ``PlaidClient(document_cache=...)`` (or ``True`` for the
+    defaults). Thread-safe; may be shared by several clients. Entries are
+    keyed by the server URL and a fingerprint of the client's token as well as
+    the document (see :meth:`key`), so clients of other servers or with other
+    identities never read each other's entries.
+
+    Args:
+        max_entries: Maximum number of cached responses.
+        max_bytes: Maximum total size of cached response bodies. A single
+            response larger than this is not cached.
+        ttl: Seconds an entry may be served without re-checking the server
+            (``None``: no age limit; only a version change invalidates).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_BYTES, ttl: float | None = None):
+        super().__init__(max_entries, max_bytes)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(document_id, include_body, base_url, token):
+        """Cache key for ``document_id`` read from ``base_url`` with ``token``."""
+        return (document_id, bool(include_body), f'{_fingerprint(token)} {base_url}')
+
+    def get(self, key, version):
+        """Return the cached body for ``key`` if it was stored at ``version``
+        (and is within ``ttl``), else ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_version, stored_at = entry[0]
+                if (stored_version != version
+                        or (self.ttl is not None and time.monotonic() - stored_at > self.ttl)):
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, content: bytes):
+        """Store ``content`` for ``key`` at ``version``, evicting least recently
+        used entries to stay within bounds."""
+        with self._lock:
+            if version is None:
+                self._discard(key)
+            else:
+                self._store(key, (version, time.monotonic()), content)
+
+    def invalidate(self, document_id: str):
+        """Drop every cached response for ``document_id``."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == document_id]:
+                self._discard(key)
+
+
+class CachedResponse:
+    """A stored GET response: its validators, replayable headers and body."""
+    __slots__ = ('etag', 'last_modified', 'headers', 'content')
+
+    def __init__(self, etag, last_modified, headers, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.content = content
+
+    def conditional_headers(self):
+        """Request headers that revalidate this response."""
+        if self.etag:
+            return {'If-None-Match': self.etag}
+        return {'If-Modified-Since': self.last_modified}
+
+
+# Response headers replayed on a 304 (the body-dependent ones make_request reads).
+_REPLAYED_HEADERS = ('content-type', 'X-Document-Versions')
+
+
+class ConditionalCache(_BoundedCache):
+    """Per-URL store of validated GET responses for conditional requests.
+
+    Pass one to ``PlaidClient(conditional_cache=...)`` (or ``True`` for the
+    defaults). Only responses carrying an ``ETag`` or ``Last-Modified`` header
+    (and not ``Cache-Control: no-store``) are kept. Entries are keyed by the
+    full request URL, so share an instance only between clients whose
+    credentials may read the same resources — the server still authorizes
+    every revalidation.
+
+    Args:
+        max_entries: Maximum number of stored responses.
+        max_bytes: Maximum total size of stored response bodies.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES,
+                 max_bytes: int = DEFAULT_CACHE_BYTES):
+        super().__init__(max_entries, max_bytes)
+
+    def lookup(self, url):
+        """Return the stored :class:`CachedResponse` for ``url``, or ``None``."""
+        with self._lock:
+            entry = self._lookup(url)
+        return entry[0] if entry is not None else None
+
+    def record(self, url, response):
+        """Store (or drop) ``url``'s entry from a fresh 2xx ``response``."""
+        headers = response.headers
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if (not (etag or last_modified)
+                    or 'no-store' in (headers.get('Cache-Control') or '')):
+                self._discard(url)
+                return
+            content = response.content
+            replay = {name: headers[name] for name in _REPLAYED_HEADERS if headers.get(name)}
+            self._store(url, CachedResponse(etag, last_modified, replay, content), content)
+
+    def replay(self, entry):
+        """Answer a ``304 Not Modified`` from ``entry``: ``(headers, content)``."""
+        with self._lock:
+            self.hits += 1
+        return entry.headers, entry.content
+
+
+#: ``as_of`` timestamps closer to "now" than this are not cached: the server's
+#: clock may run ahead of ours, and writes still committing may land there.
+DEFAULT_AS_OF_MIN_AGE_S = 300.0
+
+
+def _parse_timestamp(value):
+    """Parse an ISO-8601 ``as_of`` value to an aware datetime (naive = UTC)."""
+    text = str(value).strip()
+    if text.endswith(('Z', 'z')):
+        text = text[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(text)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class AsOfCache:
+    """Persistent on-disk cache for responses to ``as_of``-stamped GETs.
+
+    Pass one to ``PlaidClient(as_of_cache=...)`` (or a file path to open one).
+    Every GET carrying an ``as-of`` query parameter that lies at least
+    ``min_age`` seconds in the past is answered from the file when present and
+    stored there otherwise; other requests are unaffected. A hit does not touch
+    the server, so it also leaves ``document_versions`` alone.
+
+    Entries are keyed by URL *and* a fingerprint of the client's token, so
+    separate identities never share entries. Revoking a user's access does not
+    purge what they already cached; delete the file for that.
+
+    Thread-safe. The file may also be shared by several processes (SQLite
+    handles the locking).
+
+    Args:
+        path: SQLite database file (created if missing).
+        max_bytes: Bound on the total size of stored bodies; least recently
+            used entries are evicted beyond it (``None``: unbounded).
+        min_age: Only cache ``as_of`` values at least this many seconds old.
+    """
+
+    def __init__(self, path, *, max_bytes: int | None = None,
+                 min_age: float = DEFAULT_AS_OF_MIN_AGE_S):
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS snapshots ('
+                ' key TEXT PRIMARY KEY, content_type TEXT NOT NULL,'
+                ' body BLOB NOT NULL, last_used REAL NOT NULL)')
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS snapshots_last_used ON snapshots (last_used)')
+
+    def cacheable(self, as_of) -> bool:
+        """Whether ``as_of`` is far enough in the past to be immutable."""
+        try:
+            moment = _parse_timestamp(as_of)
+        except (TypeError, ValueError):
+            return False
+        return (datetime.now(timezone.utc) - moment).total_seconds() >= self.min_age
+
+    @staticmethod
+    def key(url, token):
+        """Cache key for ``url`` fetched with ``token``."""
+        return f'{_fingerprint(token)} {url}'
+
+    def get(self, key):
+        """Return ``(content_type, body)`` for ``key``, or ``None``."""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT content_type, body FROM snapshots WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._db:
+                self._db.execute('UPDATE snapshots SET last_used = ? WHERE key = ?',
+                                 (time.time(), key))
+            return row[0], bytes(row[1])
+
+    def put(self, key, content_type, body: bytes):
+        """Store a response body, evicting least recently used entries beyond
+        ``max_bytes``."""
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO snapshots (key, content_type, body, last_used)'
+                ' VALUES (?, ?, ?, ?)', (key, content_type or '', body, time.time()))
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self):
+        total = self._db.execute(
+            'SELECT COALESCE(SUM(LENGTH(body)), 0) FROM snapshots').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+                'SELECT key, LENGTH(body) FROM snapshots ORDER BY last_used').fetchall():
+            self._db.execute('DELETE FROM snapshots WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM snapshots')
+
+    def close(self):
+        """Close the database file."""
+        with self._lock:
+            self._db.close()
@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from typing import Any
+from urllib.parse import quote
 
-import requests as req_lib
-
+from plaid_client.cache import AsOfCache, ConditionalCache, DocumentCache
+from plaid_client.codec import decode_response, dumps, loads
 from plaid_client.http import (
-    PlaidAPIError, make_request, extract_document_versions,
-    list_all, list_page, iter_pages, build_api_error, DEFAULT_TIMEOUT_S,
+    PlaidAPIError, PartialBatchError, make_request, bulk_create, extract_document_versions,
+    iter_json_array,
+    list_all, list_page, iter_pages, iter_all, build_api_error, make_session, DEFAULT_TIMEOUT_S,
+    DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, MAX_BATCH_OPS,
 )
+from plaid_client.skeleton import fetch_skeleton
+from plaid_client.transport import TRANSPORTS, make_httpx_session
 from plaid_client.transforms import transform_response
 from plaid_client.sse import SSEConnection
 from plaid_client import services as svc
@@ -31,6 +39,52 @@ def _body_of(**kwargs):
     return {k: v for k, v in kwargs.items() if v is not _UNSET}
 
 
+_DOC_VERSION_RE = re.compile(r'([?&])document-version=[^&]*')
+
+
+def _restamp_document_version(ops, version):
+    """Copy of ``ops`` with the first write's ``document-version`` set to
+    ``version`` (strict mode stamps only a batch's first write; see
+    http.make_request)."""
+    ops = list(ops)
+    stamp = quote(str(version), safe='')
+    for i, op in enumerate(ops):
+        if op['method'] == 'GET':
+            continue
+        path = op['path']
+        if _DOC_VERSION_RE.search(path):
+            path = _DOC_VERSION_RE.sub(lambda m: f'{m.group(1)}document-version={stamp}', path, count=1)
+        else:
+            path += f'{"&" if "?" in path else "?"}document-version={stamp}'
+        ops[i] = {**op, 'path': path}
+        break
+    return ops
+
+
+def _merge_bulk_groups(ops, results):
+    """Fold the results of a ``bulk_create`` that was queued as several
+    sub-operations (tagged with a shared ``bulk_group``; see
+    http.bulk_create) back into ONE result whose ``body.ids`` lists every
+    created id in input order, so batch results line up with the calls made."""
+    merged = []
+    prev_group = None
+    for op, result in zip(ops, results):
+        group = op.get('bulk_group')
+        if group is not None and group is prev_group:
+            last = merged[-1]
+            last['body']['ids'].extend((result.get('body') or {}).get('ids') or [])
+            last['status'] = result.get('status', last.get('status'))
+            last['headers'] = result.get('headers', last.get('headers'))
+        elif group is not None:
+            body = dict(result.get('body') or {})
+            body['ids'] = list(body.get('ids') or [])
+            merged.append({**result, 'body': body})
+        else:
+            merged.append(result)
+        prev_group = group
+    return merged
+
+
 class _BatchContext:
     """Carries the submitted results out of a ``with client.batch()`` block.
 
@@ -51,6 +105,10 @@ class _Resource:
     def _request(self, method, path, **kwargs):
         return make_request(self._client, method, path, **kwargs)
 
+    def _raw(self, raw):
+        """Resolve a per-call ``raw`` flag against the client-wide default."""
+        return self._client.raw_responses if raw is None else raw
+
 
 class VocabLinksResource(_Resource):
     def create(self, vocab_item: str, tokens: list, metadata: Any = _UNSET, audit_message=None) -> Any:
@@ -65,7 +123,7 @@ class VocabLinksResource(_Resource):
         return self._request('POST', '/api/v1/vocab-links',
                              body=_body_of(vocab_item=vocab_item, tokens=tokens, metadata=metadata), audit_message=audit_message)
 
-    def bulk_create(self, body: list, audit_message=None) -> dict:
+    def bulk_create(self, body: list, audit_message=None, *, chunked: bool | None = None) -> dict:
         """Create multiple vocab links in a single operation.
 
         Entries may reference different vocab items, but all tokens across the
@@ -74,12 +132,16 @@ class VocabLinksResource(_Resource):
 
         Args:
             body: The vocab links to create
+            chunked: Split an oversized body into size-bounded sub-requests
+                (see ``http.bulk_create``). ``None`` follows the client's
+                ``bulk_chunk_*`` settings.
 
         Returns:
             ``{"ids": [...]}`` — the created link IDs, in input order. (All
             bulk_create endpoints share this shape; bulk_delete returns no body.)
         """
-        return self._request('POST', '/api/v1/vocab-links/bulk', body=body, audit_message=audit_message)
+        return bulk_create(self._client, '/api/v1/vocab-links/bulk', body,
+                           audit_message=audit_message, chunked=chunked)
 
     def bulk_delete(self, body: list, audit_message=None) -> Any:
         """Delete multiple vocab links in a single operation. Provide a list of IDs.
@@ -127,15 +189,17 @@ class VocabLinksResource(_Resource):
         return self._request('PATCH', f'/api/v1/vocab-links/{id}/metadata',
                              raw_body=body, skip_response_transform=True, audit_message=audit_message)
 
-    def get(self, id: str, *, as_of: str | None = None) -> Any:
+    def get(self, id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a vocab link by ID.
 
         Args:
             id: The resource ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/vocab-links/{id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, id: str, audit_message=None) -> Any:
         """Delete a vocab link.
@@ -147,16 +211,20 @@ class VocabLinksResource(_Resource):
 
 
 class VocabLayersResource(_Resource):
-    def get(self, id: str, *, include_items: bool | None = None, as_of: str | None = None) -> Any:
+    def get(self, id: str, *, include_items: bool | None = None, as_of: str | None = None,
+            raw: bool | None = None) -> Any:
         """Get a vocab layer by ID.
 
         Args:
             id: The resource ID
             include_items: Include vocab items
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/vocab-layers/{id}',
-                             query_params={'include-items': include_items, 'as-of': as_of})
+                             query_params={'include-items': include_items, 'as-of': as_of},
+                             skip_response_transform=self._raw(raw))
 
     def delete(self, id: str, audit_message=None) -> Any:
         """Delete a vocab layer.
@@ -199,7 +267,7 @@ class VocabLayersResource(_Resource):
         return self._request('DELETE', f'/api/v1/vocab-layers/{id}/config/{namespace}/{config_key}',
                              skip_response_transform=True, audit_message=audit_message)
 
-    def list(self, *, as_of: str | None = None) -> Any:
+    def list(self, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """List all vocab layers accessible to the current user.
 
         Transparently follows server-side pagination cursors and returns the
@@ -209,23 +277,28 @@ class VocabLayersResource(_Resource):
 
         Args:
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, '/api/v1/vocab-layers',
-                        query={'as-of': as_of})
+                        query={'as-of': as_of}, raw=self._raw(raw))
 
     def list_page(self, *, limit: int | None = None, cursor: str | None = None,
-                  as_of: str | None = None) -> Any:
+                  as_of: str | None = None, raw: bool | None = None) -> Any:
         """List one page of vocab layers.
 
         Args:
             limit: Page size (1..1000)
             cursor: Opaque cursor from a previous page's ``next_cursor``
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_page(self._client, '/api/v1/vocab-layers',
-                         limit=limit, cursor=cursor, query={'as-of': as_of})
+                         limit=limit, cursor=cursor, query={'as-of': as_of}, raw=self._raw(raw))
 
-    def iter_pages(self, *, page_size: int = 1000, as_of: str | None = None):
+    def iter_pages(self, *, page_size: int = 1000, as_of: str | None = None,
+                   raw: bool | None = None):
         """Iterate over pages of vocab layers, yielding each page's entries list.
 
         Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
@@ -233,9 +306,28 @@ class VocabLayersResource(_Resource):
         Args:
             page_size: Page size (1..1000)
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return iter_pages(self._client, '/api/v1/vocab-layers',
-                          page_size=page_size, query={'as-of': as_of})
+                          page_size=page_size, query={'as-of': as_of}, raw=self._raw(raw))
+
+    def iter_all(self, *, page_size: int = 1000, as_of: str | None = None,
+                 raw: bool | None = None):
+        """Iterate over all vocab layers, yielding one entry at a time.
+
+        Like ``list`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            page_size: Page size (1..1000)
+            as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, '/api/v1/vocab-layers',
+                        page_size=page_size, query={'as-of': as_of}, raw=self._raw(raw))
 
     def create(self, name: str, audit_message=None) -> Any:
         """Create a new vocab layer.
@@ -323,15 +415,17 @@ class RelationsResource(_Resource):
         return self._request('PUT', f'/api/v1/relations/{relation_id}/source',
                              body=_body_of(span_id=span_id), audit_message=audit_message)
 
-    def get(self, relation_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, relation_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a relation by ID.
 
         Args:
             relation_id: The relation ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/relations/{relation_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, relation_id: str, audit_message=None) -> Any:
         """Delete a relation.
@@ -370,16 +464,20 @@ class RelationsResource(_Resource):
                              body=_body_of(layer_id=layer_id, source_id=source_id,
                                            target_id=target_id, value=value, metadata=metadata), audit_message=audit_message)
 
-    def bulk_create(self, body: list, audit_message=None) -> dict:
+    def bulk_create(self, body: list, audit_message=None, *, chunked: bool | None = None) -> dict:
         """Create multiple relations in a single operation.
 
         Args:
             body: The request body
+            chunked: Split an oversized body into size-bounded sub-requests
+                (see ``http.bulk_create``). ``None`` follows the client's
+                ``bulk_chunk_*`` settings.
 
         Returns:
             ``{"ids": [...]}`` — the created relation IDs, in input order.
         """
-        return self._request('POST', '/api/v1/relations/bulk', body=body, audit_message=audit_message)
+        return bulk_create(self._client, '/api/v1/relations/bulk', body,
+                           audit_message=audit_message, chunked=chunked)
 
     def bulk_delete(self, body: list, audit_message=None) -> Any:
         """Delete multiple relations in a single operation. Provide a list of IDs.
@@ -391,15 +489,17 @@ class RelationsResource(_Resource):
 
 
 class SpanLayersResource(_Resource):
-    def get(self, span_layer_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, span_layer_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a span layer by ID.
 
         Args:
             span_layer_id: The span layer ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/span-layers/{span_layer_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, span_layer_id: str, audit_message=None) -> Any:
         """Delete a span layer.
@@ -509,15 +609,17 @@ class SpansResource(_Resource):
         return self._request('PUT', f'/api/v1/spans/{span_id}/tokens',
                              body=_body_of(tokens=tokens), audit_message=audit_message)
 
-    def get(self, span_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, span_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a span by ID.
 
         Args:
             span_id: The span ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/spans/{span_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, span_id: str, audit_message=None) -> Any:
         """Delete a span.
@@ -554,16 +656,20 @@ class SpansResource(_Resource):
                              body=_body_of(span_layer_id=span_layer_id, tokens=tokens,
                                            value=value, metadata=metadata), audit_message=audit_message)
 
-    def bulk_create(self, body: list, audit_message=None) -> dict:
+    def bulk_create(self, body: list, audit_message=None, *, chunked: bool | None = None) -> dict:
         """Create multiple spans in a single operation.
 
         Args:
             body: The request body
+            chunked: Split an oversized body into size-bounded sub-requests
+                (see ``http.bulk_create``). ``None`` follows the client's
+                ``bulk_chunk_*`` settings.
 
         Returns:
             ``{"ids": [...]}`` — the created span IDs, in input order.
         """
-        return self._request('POST', '/api/v1/spans/bulk', body=body, audit_message=audit_message)
+        return bulk_create(self._client, '/api/v1/spans/bulk', body,
+                           audit_message=audit_message, chunked=chunked)
 
     def bulk_delete(self, body: list, audit_message=None) -> Any:
         """Delete multiple spans in a single operation. Provide a list of IDs.
@@ -592,15 +698,17 @@ class TextsResource(_Resource):
                              body=_body_of(text_layer_id=text_layer_id, document_id=document_id,
                                            body=body, metadata=metadata), audit_message=audit_message)
 
-    def get(self, text_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, text_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a text.
 
         Args:
             text_id: The text ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/texts/{text_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, text_id: str, audit_message=None) -> Any:
         """Delete a text and all dependent data.
@@ -661,7 +769,8 @@ class TextsResource(_Resource):
 
 
 class UsersResource(_Resource):
-    def list(self, *, q: str | None = None, as_of: str | None = None) -> Any:
+    def list(self, *, q: str | None = None, as_of: str | None = None,
+             raw: bool | None = None) -> Any:
         """List (or search) users. Admin-or-maintainer only.
 
         Transparently follows server-side pagination cursors and returns the
@@ -672,12 +781,15 @@ class UsersResource(_Resource):
         Args:
             q: Filter to usernames containing this text (case-insensitive)
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, '/api/v1/users',
-                        query={'q': q, 'as-of': as_of})
+                        query={'q': q, 'as-of': as_of}, raw=self._raw(raw))
 
     def list_page(self, *, q: str | None = None, limit: int | None = None,
-                  cursor: str | None = None, as_of: str | None = None) -> Any:
+                  cursor: str | None = None, as_of: str | None = None,
+                  raw: bool | None = None) -> Any:
         """List one page of users (optionally filtered by ``q``).
 
         Args:
@@ -685,12 +797,15 @@ class UsersResource(_Resource):
             limit: Page size (1..1000)
             cursor: Opaque cursor from a previous page's ``next_cursor``
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_page(self._client, '/api/v1/users',
-                         limit=limit, cursor=cursor, query={'q': q, 'as-of': as_of})
+                         limit=limit, cursor=cursor, query={'q': q, 'as-of': as_of},
+                         raw=self._raw(raw))
 
     def iter_pages(self, *, q: str | None = None, page_size: int = 1000,
-                   as_of: str | None = None):
+                   as_of: str | None = None, raw: bool | None = None):
         """Iterate over pages of users, yielding each page's entries list.
 
         Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
@@ -699,9 +814,29 @@ class UsersResource(_Resource):
             q: Filter to usernames containing this text (case-insensitive)
             page_size: Page size (1..1000)
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return iter_pages(self._client, '/api/v1/users',
-                          page_size=page_size, query={'q': q, 'as-of': as_of})
+                          page_size=page_size, query={'q': q, 'as-of': as_of}, raw=self._raw(raw))
+
+    def iter_all(self, *, q: str | None = None, page_size: int = 1000,
+                 as_of: str | None = None, raw: bool | None = None):
+        """Iterate over all users, yielding one entry at a time.
+
+        Like ``list`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            q: Filter to usernames containing this text (case-insensitive)
+            page_size: Page size (1..1000)
+            as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, '/api/v1/users',
+                        page_size=page_size, query={'q': q, 'as-of': as_of}, raw=self._raw(raw))
 
     def create(self, username: str, password: str, is_admin: bool, audit_message=None) -> Any:
         """Create a new user.
@@ -714,15 +849,17 @@ class UsersResource(_Resource):
         return self._request('POST', '/api/v1/users',
                              body=_body_of(username=username, password=password, is_admin=is_admin), audit_message=audit_message)
 
-    def get(self, id: str, *, as_of: str | None = None) -> Any:
+    def get(self, id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a user by ID.
 
         Args:
             id: The resource ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/users/{id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, id: str, audit_message=None) -> Any:
         """Deactivate a user.
@@ -769,7 +906,7 @@ class UsersResource(_Resource):
                              body=_body_of(password=password, username=username, is_admin=is_admin), audit_message=audit_message)
 
     def audit(self, user_id: str, *, start_time: str | None = None, end_time: str | None = None,
-              as_of: str | None = None) -> Any:
+              as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get audit log for a user's actions.
 
         Transparently follows server-side pagination cursors and returns the
@@ -782,13 +919,38 @@ class UsersResource(_Resource):
             start_time: Start of time range
             end_time: End of time range
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, f'/api/v1/users/{user_id}/audit',
-                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of})
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
+
+    def iter_audit(self, user_id: str, *, start_time: str | None = None,
+                   end_time: str | None = None, as_of: str | None = None,
+                   page_size: int = 1000, raw: bool | None = None):
+        """Iterate over a user's audit log, yielding one entry at a time.
+
+        Like ``audit`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            user_id: The user ID
+            start_time: Start of time range
+            end_time: End of time range
+            as_of: Temporal query timestamp
+            page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, f'/api/v1/users/{user_id}/audit', page_size=page_size,
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
 
 
 class ApiTokensResource(_Resource):
-    def list(self, user_id: str) -> Any:
+    def list(self, user_id: str, *, raw: bool | None = None) -> Any:
         """List a user's named API tokens.
 
         Never includes the signed token string itself — that is only returned
@@ -799,22 +961,26 @@ class ApiTokensResource(_Resource):
 
         Args:
             user_id: The user ID who owns the tokens
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
-        return list_all(self._client, f'/api/v1/users/{user_id}/tokens')
+        return list_all(self._client, f'/api/v1/users/{user_id}/tokens', raw=self._raw(raw))
 
     def list_page(self, user_id: str, *, limit: int | None = None,
-                  cursor: str | None = None) -> Any:
+                  cursor: str | None = None, raw: bool | None = None) -> Any:
         """List one page of a user's named API tokens.
 
         Args:
             user_id: The user ID who owns the tokens
             limit: Page size (1..1000)
             cursor: Opaque cursor from a previous page's ``next_cursor``
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_page(self._client, f'/api/v1/users/{user_id}/tokens',
-                         limit=limit, cursor=cursor)
+                         limit=limit, cursor=cursor, raw=self._raw(raw))
 
-    def iter_pages(self, user_id: str, *, page_size: int = 1000):
+    def iter_pages(self, user_id: str, *, page_size: int = 1000, raw: bool | None = None):
         """Iterate over pages of a user's API tokens, yielding each page's entries.
 
         Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
@@ -822,9 +988,25 @@ class ApiTokensResource(_Resource):
         Args:
             user_id: The user ID who owns the tokens
             page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return iter_pages(self._client, f'/api/v1/users/{user_id}/tokens',
-                          page_size=page_size)
+                          page_size=page_size, raw=self._raw(raw))
+
+    def iter_all(self, user_id: str, *, page_size: int = 1000, raw: bool | None = None):
+        """Iterate over a user's API tokens, yielding one entry at a time.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            user_id: The user ID who owns the tokens
+            page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, f'/api/v1/users/{user_id}/tokens',
+                        page_size=page_size, raw=self._raw(raw))
 
     def create(self, user_id: str, name: str, audit_message=None) -> Any:
         """Mint a named API token for a user.
@@ -855,15 +1037,17 @@ class ApiTokensResource(_Resource):
 
 
 class TokenLayersResource(_Resource):
-    def get(self, token_layer_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, token_layer_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a token layer by ID.
 
         Args:
             token_layer_id: The token layer ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/token-layers/{token_layer_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, token_layer_id: str, audit_message=None) -> Any:
         """Delete a token layer.
@@ -1057,7 +1241,7 @@ class DocumentsResource(_Resource):
                              no_batch=True, audit_message=audit_message)
 
     def get(self, document_id: str, *, include_body: bool | None = None,
-            as_of: str | None = None) -> Any:
+            as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a document.
 
         Set ``include_body`` to true to include all data contained in the
@@ -1067,9 +1251,68 @@ class DocumentsResource(_Resource):
             document_id: The document ID
             include_body: Include document body data
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+
+        With a client ``document_cache``, a repeated read (without ``as_of``)
+        is served locally while the document's tracked version is unchanged.
+        """
+        client = self._client
+        cache = client.document_cache
+        if cache is None or as_of is not None or client.is_batching:
+            return self._request('GET', f'/api/v1/documents/{document_id}',
+                                 query_params={'include-body': include_body, 'as-of': as_of},
+                                 skip_response_transform=self._raw(raw))
+
+        key = cache.key(document_id, include_body, client.base_url, client.token)
+        version = client.document_versions.get(document_id)
+        content = cache.get(key, version) if version is not None else None
+        if content is None:
+            content = self._request('GET', f'/api/v1/documents/{document_id}',
+                                    query_params={'include-body': include_body},
+                                    binary_response=True)
+            data = loads(content)
+            extract_document_versions(client, {}, data)
+            cache.put(key, client.document_versions.get(document_id), content)
+        else:
+            data = loads(content)
+        return data if self._raw(raw) else transform_response(data)
+
+    def get_skeleton(self, document_id: str, token_layer_ids, *,
+                     text_layer_ids=None, metadata: bool | list[str] | None = None,
+                     tables: bool = False) -> dict:
+        """Get a document's texts and the bare tokens of some token layers.
+
+        A light alternative to ``get(include_body=True)`` for callers that only
+        need text and token offsets: no spans, relations or vocab links are
+        transferred, and only the requested layers' tokens are. Runs two
+        queries (see :meth:`PlaidClient.query`), so it cannot be batched.
+
+        Args:
+            document_id: The document ID
+            token_layer_ids: Token layers whose tokens to return
+            text_layer_ids: Text layers whose text to return (``None``: every
+                text in the document; an empty list: none)
+            metadata: Token metadata to include. ``None`` for none; a list of
+                keys for just those (values are read as SQL scalars, so JSON
+                booleans come back as ``1``/``0``); ``True`` for all of it,
+                which is slower server-side (every token is read in full).
+            tables: Return each token layer as a
+                :class:`~plaid_client.tables.TokenTable` (columnar, sorted by
+                ``(begin, end)``) instead of a list of dicts — much smaller for
+                large documents.
+
+        Returns:
+            ``{'texts': {text_layer_id: text}, 'token_layers': {token_layer_id:
+            [token, ...]}}``. A text is the usual text entity (``id``,
+            ``body``, ``layer``, ...). A token has ``id``, ``begin``, ``end``
+            and ``precedence``, plus ``metadata`` when requested. Each layer's
+            tokens are sorted by ``(begin, end)``. Every requested layer is
+            present, empty if it has no tokens in this document.
         """
-        return self._request('GET', f'/api/v1/documents/{document_id}',
-                             query_params={'include-body': include_body, 'as-of': as_of})
+        return fetch_skeleton(self._client, document_id, token_layer_ids,
+                              text_layer_ids=text_layer_ids, metadata=metadata,
+                              tables=tables)
 
     def delete(self, document_id: str, audit_message=None) -> Any:
         """Delete a document and all data contained.
@@ -1077,6 +1320,8 @@ class DocumentsResource(_Resource):
         Args:
             document_id: The document ID
         """
+        if self._client.document_cache is not None:
+            self._client.document_cache.invalidate(document_id)
         return self._request('DELETE', f'/api/v1/documents/{document_id}', audit_message=audit_message)
 
     def update(self, document_id: str, name: str, audit_message=None) -> Any:
@@ -1137,7 +1382,8 @@ class DocumentsResource(_Resource):
                              raw_body=body, skip_response_transform=True, audit_message=audit_message)
 
     def audit(self, document_id: str, *, start_time: str | None = None,
-              end_time: str | None = None, as_of: str | None = None) -> Any:
+              end_time: str | None = None, as_of: str | None = None,
+              raw: bool | None = None) -> Any:
         """Get audit log for a document.
 
         Transparently follows server-side pagination cursors and returns the
@@ -1150,13 +1396,40 @@ class DocumentsResource(_Resource):
             start_time: Start of time range
             end_time: End of time range
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, f'/api/v1/documents/{document_id}/audit',
-                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of})
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
+
+    def iter_audit(self, document_id: str, *, start_time: str | None = None,
+                   end_time: str | None = None, as_of: str | None = None,
+                   page_size: int = 1000, raw: bool | None = None):
+        """Iterate over a document's audit log, yielding one entry at a time.
+
+        Like ``audit`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            document_id: The document ID
+            start_time: Start of time range
+            end_time: End of time range
+            as_of: Temporal query timestamp
+            page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, f'/api/v1/documents/{document_id}/audit',
+                        page_size=page_size,
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
 
 
 class MessagesResource(_Resource):
-    def listen(self, project_id: str, on_event, path: str | None = None) -> SSEConnection:
+    def listen(self, project_id: str, on_event, path: str | None = None,
+               mux=None, resume=None) -> SSEConnection:
         """Open a Server-Sent Events stream for a project.
 
         Args:
@@ -1166,11 +1439,21 @@ class MessagesResource(_Resource):
             path: Stream path under the base URL. Defaults to the project
                 /listen bus (audit-log + broadcast messages); service request
                 channels pass their own path.
+            mux: Optional :class:`~plaid_client.sse_mux.SSEMultiplexer` to
+                read the stream on, so that many listeners share one
+                event-loop thread. Its channels reopen themselves when the
+                stream drops.
+            resume: Optional :class:`~plaid_client.sse.ResumePoint`. Pass the
+                same one when reopening a dropped stream to receive what was
+                missed in between (replayed by ``Last-Event-ID``, or read back
+                from the project audit log) instead of starting afresh.
 
         Returns:
             SSE connection object with .close() and .get_stats() methods
         """
-        return SSEConnection(self._client, project_id, on_event, path=path)
+        if mux is not None:
+            return mux.open(self._client, project_id, on_event, path=path, resume=resume)
+        return SSEConnection(self._client, project_id, on_event, path=path, resume=resume)
 
     def send_message(self, project_id: str, data: Any, audit_message=None) -> Any:
         """Send a message to project listeners.
@@ -1214,7 +1497,7 @@ class MessagesResource(_Resource):
         return svc.discard_service(self._client, project_id, service_id)
 
     def serve(self, project_id: str, service_info: dict, on_service_request,
-              extras: dict | None = None) -> svc.ServiceRegistration:
+              extras: dict | None = None, mux=None) -> svc.ServiceRegistration:
         """Register as a service and handle incoming work requests.
 
         Requests are delivered over the service's own addressed channel (not the
@@ -1225,12 +1508,15 @@ class MessagesResource(_Resource):
             service_info: Service information {service_id, service_name, description}
             on_service_request: Callback (data, response_helper)
             extras: Optional additional service metadata
+            mux: Optional :class:`~plaid_client.sse_mux.SSEMultiplexer` to
+                read the request channel on, so that many registrations share
+                one event-loop thread
 
         Returns:
             Service registration object with .stop() method
         """
         return svc.serve(
-            self._client, project_id, service_info, on_service_request, extras)
+            self._client, project_id, service_info, on_service_request, extras, mux=mux)
 
     def request_service(self, project_id: str, service_id: str, data: Any,
                         timeout: float = 10.0, on_progress=None) -> Any:
@@ -1265,7 +1551,7 @@ class ProjectsResource(_Resource):
         return self._request('POST', '/api/v1/projects',
                              body=_body_of(name=name), audit_message=audit_message)
 
-    def list(self, *, as_of: str | None = None) -> Any:
+    def list(self, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """List all projects accessible to the current user.
 
         Transparently follows server-side pagination cursors and returns the
@@ -1275,23 +1561,28 @@ class ProjectsResource(_Resource):
 
         Args:
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, '/api/v1/projects',
-                        query={'as-of': as_of})
+                        query={'as-of': as_of}, raw=self._raw(raw))
 
     def list_page(self, *, limit: int | None = None, cursor: str | None = None,
-                  as_of: str | None = None) -> Any:
+                  as_of: str | None = None, raw: bool | None = None) -> Any:
         """List one page of projects.
 
         Args:
             limit: Page size (1..1000)
             cursor: Opaque cursor from a previous page's ``next_cursor``
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_page(self._client, '/api/v1/projects',
-                         limit=limit, cursor=cursor, query={'as-of': as_of})
+                         limit=limit, cursor=cursor, query={'as-of': as_of}, raw=self._raw(raw))
 
-    def iter_pages(self, *, page_size: int = 1000, as_of: str | None = None):
+    def iter_pages(self, *, page_size: int = 1000, as_of: str | None = None,
+                   raw: bool | None = None):
         """Iterate over pages of projects, yielding each page's entries list.
 
         Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
@@ -1299,11 +1590,30 @@ class ProjectsResource(_Resource):
         Args:
             page_size: Page size (1..1000)
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return iter_pages(self._client, '/api/v1/projects',
-                          page_size=page_size, query={'as-of': as_of})
+                          page_size=page_size, query={'as-of': as_of}, raw=self._raw(raw))
+
+    def iter_all(self, *, page_size: int = 1000, as_of: str | None = None,
+                 raw: bool | None = None):
+        """Iterate over all projects, yielding one entry at a time.
+
+        Like ``list`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            page_size: Page size (1..1000)
+            as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, '/api/v1/projects',
+                        page_size=page_size, query={'as-of': as_of}, raw=self._raw(raw))
 
-    def list_documents(self, id: str) -> Any:
+    def list_documents(self, id: str, *, raw: bool | None = None) -> Any:
         """List all documents (IDs and names) in a project.
 
         Transparently follows server-side pagination cursors and returns the
@@ -1317,11 +1627,13 @@ class ProjectsResource(_Resource):
 
         Args:
             id: The project ID
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
-        return list_all(self._client, f'/api/v1/projects/{id}/documents')
+        return list_all(self._client, f'/api/v1/projects/{id}/documents', raw=self._raw(raw))
 
     def list_documents_page(self, id: str, *, limit: int | None = None,
-                            cursor: str | None = None) -> Any:
+                            cursor: str | None = None, raw: bool | None = None) -> Any:
         """List one page of a project's documents.
 
         Note: this endpoint does not support temporal (``as-of``) queries; the
@@ -1331,11 +1643,13 @@ class ProjectsResource(_Resource):
             id: The project ID
             limit: Page size (1..1000)
             cursor: Opaque cursor from a previous page's ``next_cursor``
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_page(self._client, f'/api/v1/projects/{id}/documents',
-                         limit=limit, cursor=cursor)
+                         limit=limit, cursor=cursor, raw=self._raw(raw))
 
-    def iter_documents(self, id: str, *, page_size: int = 1000):
+    def iter_documents(self, id: str, *, page_size: int = 1000, raw: bool | None = None):
         """Iterate over pages of a project's documents, yielding each page's entries.
 
         Note: this endpoint does not support temporal (``as-of``) queries; the
@@ -1346,11 +1660,33 @@ class ProjectsResource(_Resource):
         Args:
             id: The project ID
             page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return iter_pages(self._client, f'/api/v1/projects/{id}/documents',
-                          page_size=page_size)
+                          page_size=page_size, raw=self._raw(raw))
+
+    def iter_all_documents(self, id: str, *, page_size: int = 1000, raw: bool | None = None):
+        """Iterate over a project's documents (IDs and names), one entry at a time.
+
+        Like ``list_documents`` but streamed: only the current page is held in
+        memory, so work can start on the first document immediately.
+
+        Note: this endpoint does not support temporal (``as-of``) queries; the
+        server rejects ``?as-of=`` on the documents-list route with a 400.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            id: The project ID
+            page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, f'/api/v1/projects/{id}/documents',
+                        page_size=page_size, raw=self._raw(raw))
 
-    def get(self, id: str, *, as_of: str | None = None) -> Any:
+    def get(self, id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a project by ID.
 
         To fetch the project's document IDs and names, use ``list_documents``
@@ -1359,9 +1695,11 @@ class ProjectsResource(_Resource):
         Args:
             id: The resource ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/projects/{id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, id: str, audit_message=None, timeout=None) -> Any:
         """Delete a project and everything in it. This is irrecoverable.
@@ -1466,7 +1804,8 @@ class ProjectsResource(_Resource):
                              skip_response_transform=True, audit_message=audit_message)
 
     def audit(self, project_id: str, *, start_time: str | None = None,
-              end_time: str | None = None, as_of: str | None = None) -> Any:
+              end_time: str | None = None, as_of: str | None = None,
+              raw: bool | None = None) -> Any:
         """Get audit log for a project.
 
         Transparently follows server-side pagination cursors and returns the
@@ -1479,9 +1818,35 @@ class ProjectsResource(_Resource):
             start_time: Start of time range
             end_time: End of time range
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return list_all(self._client, f'/api/v1/projects/{project_id}/audit',
-                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of})
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
+
+    def iter_audit(self, project_id: str, *, start_time: str | None = None,
+                   end_time: str | None = None, as_of: str | None = None,
+                   page_size: int = 1000, raw: bool | None = None):
+        """Iterate over a project's audit log, yielding one entry at a time.
+
+        Like ``audit`` but streamed: only the current page is held in memory.
+
+        Cannot be used inside a batch (it auto-paginates across requests); raises RuntimeError on first iteration if called while batching — use list_page() for a single page in a batch.
+
+        Args:
+            project_id: The project ID
+            start_time: Start of time range
+            end_time: End of time range
+            as_of: Temporal query timestamp
+            page_size: Page size (1..1000)
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
+        """
+        return iter_all(self._client, f'/api/v1/projects/{project_id}/audit',
+                        page_size=page_size,
+                        query={'start-time': start_time, 'end-time': end_time, 'as-of': as_of},
+                        raw=self._raw(raw))
 
     def link_vocab(self, id: str, vocab_id: str, audit_message=None) -> Any:
         """Link a vocabulary to a project.
@@ -1503,15 +1868,17 @@ class ProjectsResource(_Resource):
 
 
 class TextLayersResource(_Resource):
-    def get(self, text_layer_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, text_layer_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a text layer by ID.
 
         Args:
             text_layer_id: The text layer ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/text-layers/{text_layer_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, text_layer_id: str, audit_message=None) -> Any:
         """Delete a text layer.
@@ -1588,7 +1955,7 @@ class VocabItemsResource(_Resource):
         return self._request('POST', '/api/v1/vocab-items',
                              body=_body_of(vocab_layer_id=vocab_layer_id, form=form, metadata=metadata), audit_message=audit_message)
 
-    def bulk_create(self, body: list, audit_message=None) -> dict:
+    def bulk_create(self, body: list, audit_message=None, *, chunked: bool | None = None) -> dict:
         """Create multiple vocab items in a single operation.
 
         Entries may target different vocab layers; the user must have write
@@ -1597,12 +1964,16 @@ class VocabItemsResource(_Resource):
 
         Args:
             body: The vocab items to create
+            chunked: Split an oversized body into size-bounded sub-requests
+                (see ``http.bulk_create``). ``None`` follows the client's
+                ``bulk_chunk_*`` settings.
 
         Returns:
             ``{"ids": [...]}`` — the created item IDs, in input order. (All
             bulk_create endpoints share this shape; bulk_delete returns no body.)
         """
-        return self._request('POST', '/api/v1/vocab-items/bulk', body=body, audit_message=audit_message)
+        return bulk_create(self._client, '/api/v1/vocab-items/bulk', body,
+                           audit_message=audit_message, chunked=chunked)
 
     def bulk_delete(self, body: list, audit_message=None) -> Any:
         """Delete multiple vocab items in a single operation. Provide a list of IDs.
@@ -1614,15 +1985,17 @@ class VocabItemsResource(_Resource):
         """
         return self._request('DELETE', '/api/v1/vocab-items/bulk', body=body, audit_message=audit_message)
 
-    def get(self, id: str, *, as_of: str | None = None) -> Any:
+    def get(self, id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a vocab item by ID.
 
         Args:
             id: The resource ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/vocab-items/{id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, id: str, audit_message=None) -> Any:
         """Delete a vocab item.
@@ -1679,15 +2052,18 @@ class VocabItemsResource(_Resource):
 
 
 class RelationLayersResource(_Resource):
-    def get(self, relation_layer_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, relation_layer_id: str, *, as_of: str | None = None,
+            raw: bool | None = None) -> Any:
         """Get a relation layer by ID.
 
         Args:
             relation_layer_id: The relation layer ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/relation-layers/{relation_layer_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, relation_layer_id: str, audit_message=None) -> Any:
         """Delete a relation layer.
@@ -1787,15 +2163,17 @@ class TokensResource(_Resource):
         return self._request('PATCH', f'/api/v1/tokens/{token_id}/metadata',
                              raw_body=body, skip_response_transform=True, audit_message=audit_message)
 
-    def get(self, token_id: str, *, as_of: str | None = None) -> Any:
+    def get(self, token_id: str, *, as_of: str | None = None, raw: bool | None = None) -> Any:
         """Get a token.
 
         Args:
             token_id: The token ID
             as_of: Temporal query timestamp
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
         """
         return self._request('GET', f'/api/v1/tokens/{token_id}',
-                             query_params={'as-of': as_of})
+                             query_params={'as-of': as_of}, skip_response_transform=self._raw(raw))
 
     def delete(self, token_id: str, audit_message=None) -> Any:
         """Delete a token and remove it from any spans.
@@ -1857,16 +2235,24 @@ class TokensResource(_Resource):
                                            begin=begin, end=end, precedence=precedence,
                                            metadata=metadata), audit_message=audit_message)
 
-    def bulk_create(self, body: list, audit_message=None) -> dict:
+    def bulk_create(self, body: list, audit_message=None, *, chunked: bool | None = None) -> dict:
         """Create multiple tokens in a single operation.
 
+        A ``:partitioning`` layer's tokens must be created in one request (the
+        server rejects a bulk create into a layer that already has tokens), so
+        pass ``chunked=False`` there when the client splits bulk bodies.
+
         Args:
             body: The request body
+            chunked: Split an oversized body into size-bounded sub-requests
+                (see ``http.bulk_create``). ``None`` follows the client's
+                ``bulk_chunk_*`` settings.
 
         Returns:
             ``{"ids": [...]}`` — the created token IDs, in input order.
         """
-        return self._request('POST', '/api/v1/tokens/bulk', body=body, audit_message=audit_message)
+        return bulk_create(self._client, '/api/v1/tokens/bulk', body,
+                           audit_message=audit_message, chunked=chunked)
 
     def bulk_delete(self, body: list, audit_message=None) -> Any:
         """Delete multiple tokens in a single operation. Provide a list of IDs.
@@ -1934,7 +2320,16 @@ class BatchResource(_Resource):
 
 
 class PlaidClient:
-    def __init__(self, base_url: str, token: str, timeout: float | None = DEFAULT_TIMEOUT_S):
+    def __init__(self, base_url: str, token: str, timeout: float | None = DEFAULT_TIMEOUT_S, *,
+                 session=None, transport: str = 'requests',
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE, pool_block: bool = False,
+                 bulk_chunk_ops: int | None = None, bulk_chunk_bytes: int | None = None,
+                 bulk_max_workers: int = 1, stream_json: bool = False,
+                 raw_responses: bool = False, prefetch_pages: int = 0,
+                 document_cache: DocumentCache | bool | None = None,
+                 conditional_cache: ConditionalCache | bool | None = None,
+                 as_of_cache: AsOfCache | str | os.PathLike | None = None):
         """Create a new PlaidClient instance.
 
         Args:
@@ -1942,6 +2337,51 @@ class PlaidClient:
             token: The authentication token
             timeout: Per-request timeout in seconds (default 30; ``None`` disables
                 it). Also bounds media up/downloads — raise it for large files.
+            session: An existing ``requests.Session`` to send requests through,
+                e.g. one from :func:`plaid_client.http.make_session` shared by
+                several clients holding different tokens. A shared session is
+                not closed by :meth:`close`. When given, ``transport`` and the
+                ``pool_*`` options are ignored.
+            transport: HTTP stack of the session built when none is given:
+                ``'requests'`` (HTTP/1.1, the default) or ``'httpx'`` (HTTP/2
+                multiplexing; needs the optional httpx dependency — see
+                :mod:`plaid_client.transport`).
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Keep-alive connections kept per host; size it to the
+                number of threads sharing this client.
+            pool_block: Wait for a free pooled connection instead of opening a
+                throwaway one once ``pool_maxsize`` are busy.
+            bulk_chunk_ops: Split ``bulk_create`` bodies into sub-requests of at
+                most this many items (``None``: no op-count limit).
+            bulk_chunk_bytes: Split ``bulk_create`` bodies into sub-requests of
+                roughly at most this many encoded bytes (``None``: no limit).
+                Splitting is off unless one of the two limits is set.
+            bulk_max_workers: Send up to this many ``bulk_create`` sub-requests
+                concurrently (outside batches and strict mode).
+            stream_json: Encode list request bodies (bulk creates/deletes and
+                batch submissions) incrementally and send them as chunked
+                uploads, so neither the full JSON string nor a full transformed
+                copy of the body is built in memory.
+            raw_responses: Default for the ``raw`` flag of read methods
+                (``get``, ``list``/``list_page``/``iter_pages`` and
+                :meth:`query`): return the server's JSON exactly as sent —
+                kebab-case, namespaced keys such as ``document/id`` — skipping
+                the snake_case copy of every response. Writes are unaffected.
+            prefetch_pages: Read-ahead depth for auto-paginating list methods
+                (``list``, ``iter_pages``, …): while one page is being consumed,
+                a background thread fetches up to this many following pages
+                (``0``: fetch each page on demand).
+            document_cache: A :class:`DocumentCache` (or ``True`` for one with
+                default bounds) serving repeated ``documents.get`` reads locally
+                while the document's tracked version is unchanged. Off by default.
+            conditional_cache: A :class:`ConditionalCache` (or ``True`` for one
+                with default bounds) that revalidates GETs whose responses
+                carried an ``ETag``/``Last-Modified`` validator, answering a
+                ``304 Not Modified`` from the stored body. Off by default.
+            as_of_cache: An :class:`AsOfCache` (or a path to its SQLite file)
+                persisting responses to ``as_of``-stamped GETs, which describe
+                immutable history, so repeated snapshot reads — even across
+                restarts — never reach the server. Off by default.
         """
         self.base_url = base_url.rstrip('/')
         self.token = token
@@ -1955,7 +2395,30 @@ class PlaidClient:
         # set_audit_message / the audit_message() context manager (a context
         # manager method can't share the attribute's name).
         self._audit_message: str | None = None
-        self.session = req_lib.Session()
+        self.bulk_chunk_ops = bulk_chunk_ops
+        self.bulk_chunk_bytes = bulk_chunk_bytes
+        self.bulk_max_workers = bulk_max_workers
+        self.stream_json = stream_json
+        self.raw_responses = raw_responses
+        self.prefetch_pages = prefetch_pages
+        if document_cache is True:
+            document_cache = DocumentCache()
+        self.document_cache = None if document_cache is False else document_cache
+        if conditional_cache is True:
+            conditional_cache = ConditionalCache()
+        self.conditional_cache = None if conditional_cache is False else conditional_cache
+        self._owns_as_of_cache = isinstance(as_of_cache, (str, os.PathLike))
+        self.as_of_cache = AsOfCache(as_of_cache) if self._owns_as_of_cache else as_of_cache
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport {transport!r}; expected one of {TRANSPORTS}")
+        self._owns_session = session is None
+        if session is not None:
+            self.session = session
+        elif transport == 'httpx':
+            self.session = make_httpx_session(pool_maxsize=pool_maxsize, pool_block=pool_block)
+        else:
+            self.session = make_session(pool_connections=pool_connections,
+                                        pool_maxsize=pool_maxsize, pool_block=pool_block)
 
         self.vocab_links = VocabLinksResource(self)
         self.vocab_layers = VocabLayersResource(self)
@@ -1975,7 +2438,7 @@ class PlaidClient:
         self.tokens = TokensResource(self)
         self.batch = BatchResource(self)
 
-    def query(self, body: Any) -> Any:
+    def query(self, body: Any, *, raw: bool | None = None) -> Any:
         """Run a query over every project you can read.
 
         ``body`` is the query AST. Its keys follow the usual client convention
@@ -2009,13 +2472,16 @@ class PlaidClient:
         Args:
             body: The query AST ({find, where, scope?, limit?, order_by?,
                 return?, bindings?}).
+            raw: Return the server's JSON untransformed (kebab-case, namespaced
+                keys). ``None`` follows the client's ``raw_responses`` setting.
 
         Returns:
             For 'ids'/'entities': {columns, results, count, truncated}. For
             'count': {return: 'count', count}. Entity cells are full entity
             dicts (same shape as the GET endpoints).
         """
-        return make_request(self, 'POST', '/api/v1/query', body=body)
+        return make_request(self, 'POST', '/api/v1/query', body=body,
+                            skip_response_transform=self.raw_responses if raw is None else raw)
 
     def enter_strict_mode(self, document_id: str) -> None:
         """Enter strict mode for a specific document.
@@ -2082,13 +2548,35 @@ class PlaidClient:
         # of the batch only (see http.make_request) — reset the marker per batch.
         self.batch_version_stamped = False
 
-    def submit_batch(self) -> list[Any]:
+    def submit_batch(self, *, chunk_size: int | None = None,
+                     max_workers: int = 1) -> list[Any]:
         """Submit all queued batch operations as a single batch request.
 
         If any operation fails, all changes are rolled back.
 
+        The server caps one batch at ``MAX_BATCH_OPS`` (1000) operations. A
+        larger queue raises :class:`PlaidAPIError` here, before anything is
+        sent, unless ``chunk_size`` is given: the queued operations are then
+        split, in order, into sub-batches of at most ``chunk_size`` ops, each
+        submitted as its own atomic batch. Atomicity then holds per chunk only —
+        if a later chunk fails after earlier ones committed,
+        :class:`PartialBatchError` reports exactly which chunks committed.
+
+        In strict mode each sequential chunk's first write is re-stamped with
+        the document version the previous chunk returned, so OCC still guards
+        every chunk against interleaved writers.
+
+        Args:
+            chunk_size: Split into sub-batches of at most this many ops
+                (1..MAX_BATCH_OPS). ``None`` sends one batch.
+            max_workers: Submit up to this many chunks concurrently. Only for
+                chunks that are independent of one another (no chunk creates
+                something a later chunk writes to) and outside strict mode.
+                Sequential submission (the default) stops at the first failed
+                chunk.
+
         Returns:
-            List of results corresponding to each operation
+            List of results corresponding to each operation, in queue order
         """
         if not self.is_batching:
             raise PlaidAPIError('No active batch. Call begin_batch() first.')
@@ -2098,33 +2586,105 @@ class PlaidClient:
             return []
 
         try:
-            url = f'{self.base_url}/api/v1/batch'
-            body = []
-            for op in self.batch_operations:
+            ops = self.batch_operations
+            if chunk_size is None:
+                if len(ops) > MAX_BATCH_OPS:
+                    raise PlaidAPIError(
+                        f'Batch has {len(ops)} operations, over the server cap of '
+                        f'{MAX_BATCH_OPS}; pass chunk_size to submit it in chunks.')
+                return _merge_bulk_groups(ops, self._post_batch(ops))
+            if not 1 <= chunk_size <= MAX_BATCH_OPS:
+                raise ValueError(f'chunk_size must be between 1 and {MAX_BATCH_OPS}')
+            if max_workers > 1 and self.strict_mode_document_id:
+                raise ValueError('Concurrent chunks cannot be used in strict mode: each '
+                                 'chunk must be stamped with the version the previous one produced.')
+            chunks = [(i, min(i + chunk_size, len(ops))) for i in range(0, len(ops), chunk_size)]
+            if len(chunks) == 1:
+                return _merge_bulk_groups(ops, self._post_batch(ops))
+            return _merge_bulk_groups(ops, self._submit_chunks(ops, chunks, max_workers))
+        finally:
+            self.is_batching = False
+            self.batch_operations = []
+
+    def _submit_chunks(self, ops, chunks, max_workers):
+        """Submit ``ops`` as the given sub-batches; see :meth:`submit_batch`."""
+        chunk_results: dict[int, list] = {}
+        failed: dict[int, PlaidAPIError] = {}
+
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+                futures = [pool.submit(self._post_batch, ops[b:e]) for b, e in chunks]
+                for i, future in enumerate(futures):
+                    try:
+                        chunk_results[i] = future.result()
+                    except PlaidAPIError as e:
+                        failed[i] = e
+        else:
+            doc_id = self.strict_mode_document_id
+            for i, (b, e) in enumerate(chunks):
+                chunk_ops = ops[b:e]
+                if i > 0 and doc_id and self.document_versions.get(doc_id):
+                    chunk_ops = _restamp_document_version(chunk_ops, self.document_versions[doc_id])
+                try:
+                    chunk_results[i] = self._post_batch(chunk_ops)
+                except PlaidAPIError as err:
+                    failed[i] = err
+                    break
+
+        if not failed:
+            return [r for i in range(len(chunks)) for r in chunk_results[i]]
+
+        committed = sorted(chunk_results)
+        if not committed:
+            # Nothing committed: the batch is still all-or-nothing, so surface
+            # the underlying error as-is.
+            raise failed[min(failed)]
+        skipped = [i for i in range(len(chunks)) if i not in chunk_results and i not in failed]
+        results: list[Any] = [None] * len(ops)
+        for i in committed:
+            b, e = chunks[i]
+            results[b:e] = chunk_results[i]
+        ranges = ', '.join(f'{b}-{e - 1}' for b, e in (chunks[i] for i in committed))
+        first = min(failed)
+        raise PartialBatchError(
+            f'Chunked batch partially committed: {len(committed)} of {len(chunks)} '
+            f'chunks committed (ops {ranges}); chunk {first} failed: {failed[first]}',
+            chunks=chunks, committed=committed, failed=failed, skipped=skipped,
+            results=results)
+
+    def _post_batch(self, ops) -> list[Any]:
+        """Send one list of queued operations as a single atomic batch request."""
+        url = f'{self.base_url}/api/v1/batch'
+        try:
+            def entry_of(op):
                 entry = {'path': op['path'], 'method': op['method'].upper()}
                 if 'body' in op:
                     entry['body'] = op['body']
-                body.append(entry)
+                return entry
 
             headers = {
                 'Authorization': f'Bearer {self.token}',
                 'Content-Type': 'application/json',
             }
 
-            response = self.session.post(url, headers=headers, data=json.dumps(body),
+            if self.stream_json:
+                data = iter_json_array(ops, entry_of)
+            else:
+                data = dumps([entry_of(op) for op in ops])
+            response = self.session.post(url, headers=headers, data=data,
                                          timeout=self.timeout)
 
             if not response.ok:
                 raise build_api_error(response, url, 'POST')
 
-            results = response.json()
+            results = decode_response(response)
 
             for result in results:
                 if isinstance(result, dict) and 'headers' in result:
                     dv_header = result['headers'].get('X-Document-Versions')
                     if dv_header:
                         try:
-                            versions_map = json.loads(dv_header)
+                            versions_map = loads(dv_header)
                             if isinstance(versions_map, dict):
                                 self.document_versions.update(versions_map)
                         except (json.JSONDecodeError, TypeError):
@@ -2134,12 +2694,8 @@ class PlaidClient:
         except PlaidAPIError:
             raise
         except Exception as e:
-            raise PlaidAPIError(f'Network error: {e} at {self.base_url}/api/v1/batch',
-                                url=f'{self.base_url}/api/v1/batch', method='POST',
-                                original_error=e)
-        finally:
-            self.is_batching = False
-            self.batch_operations = []
+            raise PlaidAPIError(f'Network error: {e} at {url}',
+                                url=url, method='POST', original_error=e)
 
     def abort_batch(self) -> None:
         """Abort the current batch without executing any operations."""
@@ -2155,7 +2711,7 @@ class PlaidClient:
         return self.is_batching
 
     @contextmanager
-    def batched(self):
+    def batched(self, *, chunk_size: int | None = None, max_workers: int = 1):
         """Collect the calls in this block into ONE atomic batch request.
 
         Begins a batch, runs the block (every mutating call inside is queued
@@ -2174,6 +2730,9 @@ class PlaidClient:
         a batch runs sequentially in one transaction, so a child op sees parents
         created earlier in the same block, and any op's failure rolls the whole
         batch back. Not nestable (begin/submit is per-client state).
+
+        ``chunk_size`` / ``max_workers`` are forwarded to :meth:`submit_batch`
+        for blocks that queue more than the server's per-batch cap.
         """
         self.begin_batch()
         ctx = _BatchContext()
@@ -2186,11 +2745,15 @@ class PlaidClient:
                 self.abort_batch()
             raise
         else:
-            ctx.results = self.submit_batch()
+            ctx.results = self.submit_batch(chunk_size=chunk_size, max_workers=max_workers)
 
     def close(self) -> None:
-        """Close the underlying HTTP session."""
-        self.session.close()
+        """Close the underlying HTTP session (unless it was passed in shared), and
+        the ``as_of_cache`` file if the client opened it."""
+        if self._owns_session:
+            self.session.close()
+        if self._owns_as_of_cache:
+            self.as_of_cache.close()
 
     def __enter__(self):
         return self
@@ -2200,7 +2763,7 @@ class PlaidClient:
 
     @classmethod
     def login(cls, base_url: str, user_id: str, password: str,
-              timeout: float | None = DEFAULT_TIMEOUT_S) -> PlaidClient:
+              timeout: float | None = DEFAULT_TIMEOUT_S, **session_options) -> PlaidClient:
         """Authenticate and return a new client instance with token.
 
         This is the single auth entry point — there is no ``client.login`` resource.
@@ -2210,18 +2773,22 @@ class PlaidClient:
             user_id: User ID for authentication
             password: Password for authentication
             timeout: Per-request timeout in seconds, forwarded to the new client.
+            **session_options: ``session`` / ``pool_*`` options forwarded to the
+                constructor. The login request already goes through the new
+                client's session, so its connection is reused afterwards.
 
         Returns:
             Authenticated client instance
         """
-        base_url = base_url.rstrip('/')
-        url = f'{base_url}/api/v1/login'
+        client = cls(base_url, '', timeout=timeout, **session_options)
+        url = f'{client.base_url}/api/v1/login'
         try:
-            response = req_lib.post(url,
-                                    headers={'Content-Type': 'application/json'},
-                                    data=json.dumps({'user-id': user_id, 'password': password}),
-                                    timeout=timeout)
+            response = client.session.post(url,
+                                           headers={'Content-Type': 'application/json'},
+                                           data=dumps({'user-id': user_id, 'password': password}),
+                                           timeout=timeout)
         except Exception as e:
+            client.close()
             if type(e).__name__ in ('Timeout', 'ConnectTimeout', 'ReadTimeout'):
                 raise PlaidAPIError(f'Request timed out at {url}', url=url, method='POST',
                                     original_error=e)
@@ -2229,8 +2796,9 @@ class PlaidClient:
                                 original_error=e)
 
         if not response.ok:
+            client.close()
             raise build_api_error(response, url, 'POST')
 
-        data = response.json()
-        token = data.get('token', '')
-        return cls(base_url, token, timeout=timeout)
+        data = decode_response(response)
+        client.token = data.get('token', '')
+        return client
@@ -0,0 +1,108 @@
+"""JSON codec shared by every wire path (requests, batches, SSE, services).
+
+The client spends a large share of its time on big responses just encoding and
+decoding JSON. When `orjson <https://github.com/ijl/orjson>`_ is installed it
+is selected automatically — it is several times faster than the stdlib on
+document-sized bodies. Otherwise the stdlib ``json`` module is used. orjson is
+an optional dependency; nothing else changes when it is absent.
+
+Either codec's ``dumps`` returns UTF-8 ``bytes`` (ready to send) and its
+``loads`` accepts ``bytes`` or ``str``. Decode errors are always
+:class:`json.JSONDecodeError` (orjson's error subclasses it). To force a
+backend, e.g. to compare them::
+
+    from plaid_client.codec import set_json_codec
+    set_json_codec('json')      # or 'orjson', or 'auto'
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class JSONCodec:
+    """A named ``dumps`` (object -> UTF-8 bytes) / ``loads`` (bytes|str -> object) pair."""
+    __slots__ = ('name', 'dumps', 'loads')
+
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        return f'JSONCodec({self.name!r})'
+
+
+def _stdlib_dumps(obj):
+    # ensure_ascii (the default) keeps the output pure ASCII, so encoding is free.
+    return json.dumps(obj, separators=(',', ':')).encode('ascii')
+
+
+STDLIB = JSONCodec('json', _stdlib_dumps, json.loads)
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+    def _orjson_dumps(obj):
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS)
+        except TypeError:
+            # Values orjson rejects but the stdlib accepts (integers beyond
+            # 64 bits, for example) still encode, just more slowly.
+            return _stdlib_dumps(obj)
+
+    ORJSON = JSONCodec('orjson', _orjson_dumps, orjson.loads)
+else:
+    ORJSON = None
+
+_codec = ORJSON or STDLIB
+
+
+def get_json_codec():
+    """Return the active :class:`JSONCodec`."""
+    return _codec
+
+
+def set_json_codec(codec):
+    """Select the JSON backend process-wide.
+
+    Args:
+        codec: ``'auto'`` (orjson if installed, else stdlib), ``'orjson'``,
+            ``'json'``, or a :class:`JSONCodec` instance.
+
+    Returns:
+        The previously active codec, so callers can restore it.
+    """
+    global _codec
+    previous = _codec
+    if isinstance(codec, JSONCodec):
+        _codec = codec
+    elif codec == 'auto':
+        _codec = ORJSON or STDLIB
+    elif codec == 'json':
+        _codec = STDLIB
+    elif codec == 'orjson':
+        if ORJSON is None:
+            raise ImportError("orjson is not installed (pip install orjson)")
+        _codec = ORJSON
+    else:
+        raise ValueError(f"Unknown JSON codec {codec!r}; expected 'auto', 'orjson' or 'json'")
+    return previous
+
+
+def dumps(obj):
+    """Encode ``obj`` to UTF-8 JSON bytes with the active codec."""
+    return _codec.dumps(obj)
+
+
+def loads(data):
+    """Decode JSON ``bytes`` or ``str`` with the active codec."""
+    return _codec.loads(data)
+
+
+def decode_response(response):
+    """Decode a ``requests`` response body (replaces ``response.json()``)."""
+    return _codec.loads(response.content)
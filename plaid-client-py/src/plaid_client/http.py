@@ -1,7 +1,14 @@
 import json
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode, quote
 
+import requests
+from requests.adapters import HTTPAdapter
+
+from plaid_client.codec import decode_response, dumps, loads
 from plaid_client.transforms import transform_request, transform_response
 
 logger = logging.getLogger(__name__)
@@ -12,6 +19,26 @@ logger = logging.getLogger(__name__)
 # this also bounds media up/downloads — raise it (or disable) for large files.
 DEFAULT_TIMEOUT_S = 30.0
 
+# Server-side cap on operations per atomic batch (``max-batch-ops`` in
+# plaid-core's batch.clj); larger batches are rejected with a 400. Keep in sync.
+MAX_BATCH_OPS = 1000
+
+# Default sub-request limits for a chunked ``bulk_create`` (see bulk_create
+# below). The byte limit stays well under the server's JSON body cap
+# (``max-json-body-mb``, 10 MiB by default), which rejects larger bodies with 413.
+DEFAULT_BULK_CHUNK_OPS = 2000
+DEFAULT_BULK_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Target size of each piece a streamed JSON request body is written in (see
+# iter_json_array). Large enough to keep per-chunk framing overhead negligible,
+# small enough that only one piece is ever held in memory.
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Default connection-pool sizing, matching urllib3's own defaults: up to 10
+# per-host pools cached, each keeping up to 10 idle keep-alive connections.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
 # Sentinel distinguishing "no per-call timeout override" from an explicit
 # ``timeout=None`` (which disables the timeout for that call).
 _UNSET = object()
@@ -40,10 +67,67 @@ class PlaidAPIError(Exception):
         self.original_error = original_error
 
 
+class PartialBatchError(PlaidAPIError):
+    """Raised by a chunked ``submit_batch`` or chunked ``bulk_create`` when some
+    sub-requests committed and others did not.
+
+    Each sub-request is atomic on its own, but the whole is not: the committed
+    chunks stay committed. The inherited PlaidAPIError fields (``status``,
+    ``response_data``, …) describe the first failed chunk.
+
+    Attributes:
+        chunks: ``(start, end)`` op-index range of each sub-request, in order.
+        committed: Indices into ``chunks`` of the sub-requests that committed.
+        failed: ``{chunk index: PlaidAPIError}`` for sub-requests rolled back.
+        skipped: Indices of sub-requests never sent (sequential mode stops at
+            the first failure).
+        results: Per-op results in original op order (batch results, or
+            created ids for ``bulk_create``); ``None`` for every op whose
+            sub-request did not commit. In a batch, a ``bulk_create`` split into
+            several queued ops occupies one slot per queued op here.
+    """
+
+    def __init__(self, message, *, chunks, committed, failed, skipped, results):
+        first = failed[min(failed)]
+        super().__init__(message, status=first.status, url=first.url, method=first.method,
+                         response_data=first.response_data, status_text=first.status_text,
+                         original_error=first)
+        self.chunks = chunks
+        self.committed = committed
+        self.failed = failed
+        self.skipped = skipped
+        self.results = results
+
+
+def make_session(*, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False):
+    """Build a ``requests.Session`` with a tuned keep-alive connection pool.
+
+    Pass the result as ``session=`` to several ``PlaidClient`` instances to
+    share one pool between them — the bearer token travels per request, so
+    clients holding different tokens can safely share a session.
+
+    Args:
+        pool_connections: Number of per-host pools to cache (one per distinct
+            scheme/host/port the session talks to).
+        pool_maxsize: Keep-alive connections kept per host. Size it to the
+            number of threads sharing the session; with the urllib3 default of
+            10, an 11th concurrent request opens a throwaway connection.
+        pool_block: If True, a request waits for a free pooled connection once
+            ``pool_maxsize`` are in use instead of opening an extra one.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          pool_block=pool_block)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 def parse_error_body(response):
     """Read a failed response's body as parsed JSON, falling back to text."""
     try:
-        return response.json()
+        return decode_response(response)
     except Exception:
         try:
             return {'message': response.text}
@@ -68,7 +152,7 @@ def extract_document_versions(client, response_headers, response_body=None):
     header = response_headers.get('X-Document-Versions')
     if header:
         try:
-            versions_map = json.loads(header)
+            versions_map = loads(header)
             if isinstance(versions_map, dict):
                 client.document_versions.update(versions_map)
         except (json.JSONDecodeError, TypeError):
@@ -90,7 +174,7 @@ def _merge_query(query, **extra):
     return merged
 
 
-def list_page(client, path, *, limit=None, cursor=None, query=None):
+def list_page(client, path, *, limit=None, cursor=None, query=None, raw=False):
     """Fetch a single page from a paginated collection endpoint.
 
     Returns the transformed envelope dict ``{"entries": [...],
@@ -104,12 +188,112 @@ def list_page(client, path, *, limit=None, cursor=None, query=None):
         limit: Page size (1..1000). ``None`` lets the server use its default.
         cursor: Opaque cursor from a previous page's ``next_cursor``.
         query: Extra query params (e.g. ``{"as-of": ...}``).
+        raw: Skip the response transform; the envelope (and every entry) keeps
+            the server's keys, i.e. ``next-cursor`` rather than ``next_cursor``.
     """
     qp = _merge_query(query, limit=limit, cursor=cursor)
-    return make_request(client, 'GET', path, query_params=qp or None)
+    return make_request(client, 'GET', path, query_params=qp or None,
+                        skip_response_transform=raw)
+
 
+def _iter_page_responses(client, path, *, page_size, query, raw):
+    """Generator yielding each page response in turn, following cursors.
 
-def iter_pages(client, path, *, page_size=1000, query=None):
+    A bare-list response (non-paginated server or proxy) is yielded and ends
+    the sequence; the callers decide what to make of it.
+    """
+    cursor_key = 'next-cursor' if raw else 'next_cursor'
+    cursor = None
+    while True:
+        # Sent even if the caller has since opened a batch: a page read
+        # queued into it would come back as the batch's result list.
+        qp = _merge_query(query, limit=page_size, cursor=cursor)
+        page = make_request(client, 'GET', path, query_params=qp or None,
+                            skip_response_transform=raw, send_now=True)
+        yield page
+        if not isinstance(page, dict):
+            return
+        prev_cursor = cursor
+        cursor = page.get(cursor_key)
+        if cursor is None:
+            return
+        # Guard against a buggy server/proxy that returns a constant non-null
+        # cursor, which would otherwise loop forever.
+        if cursor == prev_cursor:
+            raise RuntimeError(
+                'Pagination cursor did not advance; aborting to avoid an '
+                'infinite loop.'
+            )
+
+
+def _offer(q, item, stop):
+    """Put ``item`` on the bounded queue ``q``, giving up once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.05)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _read_ahead(source, depth):
+    """Iterate the generator ``source`` on a background thread, ``depth`` items ahead.
+
+    Cursor pagination is inherently sequential, but the next page can be on the
+    wire while the caller is still working through the current one. The pump
+    thread keeps at most ``depth`` fetched pages queued (plus the one it is
+    fetching). Errors are re-raised in the consumer at the point they occurred.
+    Closing the consumer generator early stops the pump after its in-flight
+    request; nothing further is fetched.
+    """
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def pump():
+        try:
+            for item in source:
+                if not _offer(q, (True, item), stop):
+                    return
+            _offer(q, (False, None), stop)
+        except BaseException as e:
+            _offer(q, (False, e), stop)
+        finally:
+            source.close()
+
+    threading.Thread(target=pump, name='plaid-prefetch', daemon=True).start()
+    try:
+        while True:
+            ok, item = q.get()
+            if not ok:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _page_responses(client, path, *, page_size, query, raw, prefetch):
+    pages = _iter_page_responses(client, path, page_size=page_size, query=query, raw=raw)
+    if prefetch is None:
+        prefetch = getattr(client, 'prefetch_pages', 0)
+    if prefetch:
+        pages = _read_ahead(pages, prefetch)
+    return pages
+
+
+def _refuse_in_batch(client, path):
+    if client.is_batching:
+        raise RuntimeError(
+            f'Cannot auto-paginate {path} inside a batch: list methods follow '
+            'cursors across multiple requests, which a batch cannot do. Use '
+            'list_page() for a single page inside a batch, or call the list '
+            'method outside the batch.'
+        )
+
+
+def iter_pages(client, path, *, page_size=1000, query=None, raw=False, prefetch=None):
     """Generator yielding each page's ``entries`` list, following cursors.
 
     Each yielded value is the list of entries for one page. Iteration stops
@@ -126,44 +310,75 @@ def iter_pages(client, path, *, page_size=1000, query=None):
         path: Collection path, e.g. ``/api/v1/projects``.
         page_size: Page size requested as ``limit`` (1..1000).
         query: Extra query params (e.g. ``{"as-of": ...}``).
+        raw: Yield untransformed entries (see ``list_page``).
+        prefetch: Fetch up to this many pages ahead on a background thread
+            while the caller consumes the current one (``0``: fetch on demand;
+            ``None``: the client's ``prefetch_pages``). Closing the generator
+            early stops the read-ahead.
     """
-    if client.is_batching:
-        raise RuntimeError(
-            f'Cannot auto-paginate {path} inside a batch: list methods follow '
-            'cursors across multiple requests, which a batch cannot do. Use '
-            'list_page() for a single page inside a batch, or call the list '
-            'method outside the batch.'
-        )
-    cursor = None
-    while True:
-        page = list_page(client, path, limit=page_size, cursor=cursor, query=query)
-        entries = page.get('entries', []) or []
-        # Suppress the trailing empty page that the server emits when a
-        # collection's size is an exact multiple of the page size (a final full
-        # page with a non-null cursor, then an empty page). Still follow the
-        # cursor below.
-        if entries:
-            yield entries
-        prev_cursor = cursor
-        cursor = page.get('next_cursor')
-        if cursor is None:
-            break
-        # Guard against a buggy server/proxy that returns a constant non-null
-        # cursor, which would otherwise loop forever.
-        if cursor == prev_cursor:
-            raise RuntimeError(
-                'Pagination cursor did not advance; aborting to avoid an '
-                'infinite loop.'
-            )
+    _refuse_in_batch(client, path)
+    pages = _page_responses(client, path, page_size=page_size, query=query, raw=raw,
+                            prefetch=prefetch)
+    try:
+        for page in pages:
+            entries = page.get('entries', []) or []
+            # Suppress the trailing empty page that the server emits when a
+            # collection's size is an exact multiple of the page size (a final
+            # full page with a non-null cursor, then an empty page).
+            if entries:
+                yield entries
+    finally:
+        pages.close()
+
+
+def iter_all(client, path, *, page_size=1000, query=None, raw=False, prefetch=None):
+    """Generator yielding every entry of a paginated collection, one at a time.
+
+    The streaming form of ``list_all``: entries are yielded as each page
+    arrives, so the caller can start on the first one right away and only the
+    current page (plus any ``prefetch`` pages) is held in memory, whatever the
+    collection's size.
 
+    NOTE: Like ``iter_pages`` this CANNOT be used inside a batch; it raises
+    ``RuntimeError`` on first iteration when the client is in batch mode.
 
-def list_all(client, path, *, page_size=1000, query=None):
+    Args:
+        client: PlaidClient instance.
+        path: Collection path, e.g. ``/api/v1/projects``.
+        page_size: Page size requested as ``limit`` (1..1000).
+        query: Extra query params (e.g. ``{"as-of": ...}``).
+        raw: Yield untransformed entries (see ``list_page``).
+        prefetch: Pages to fetch ahead while earlier ones are consumed (see
+            ``iter_pages``).
+    """
+    _refuse_in_batch(client, path)
+    pages = _page_responses(client, path, page_size=page_size, query=query, raw=raw,
+                            prefetch=prefetch)
+    try:
+        for page in pages:
+            # Compatibility shim: a non-paginated server (or proxy) may return a
+            # bare list. Treat it as a terminal full result with no further paging.
+            if isinstance(page, list):
+                yield from page
+            elif isinstance(page, dict) and 'entries' in page:
+                yield from page.get('entries') or []
+            else:
+                raise ValueError(
+                    "Unexpected list response shape (no 'entries'); server may be "
+                    "incompatible."
+                )
+    finally:
+        pages.close()
+
+
+def list_all(client, path, *, page_size=1000, query=None, raw=False, prefetch=None):
     """Fetch the full flat list from a paginated collection endpoint.
 
     Transparently follows ``next_cursor`` until exhausted and concatenates
     every page's ``entries``. An empty first page yields ``[]``. This is the
     backward-compatible shape the old ``.list()`` methods returned before the
-    server moved to a paginated envelope.
+    server moved to a paginated envelope. Use ``iter_all`` to stream entries
+    instead of materialising them.
 
     NOTE: This auto-paginates and therefore CANNOT be used inside a batch — each
     page's request needs the previous page's ``next_cursor``, which doesn't
@@ -176,49 +391,151 @@ def list_all(client, path, *, page_size=1000, query=None):
         path: Collection path, e.g. ``/api/v1/projects``.
         page_size: Page size requested as ``limit`` (1..1000).
         query: Extra query params (e.g. ``{"as-of": ...}``).
+        raw: Return untransformed entries (see ``list_page``).
+        prefetch: Pages to fetch ahead while earlier ones are collected (see
+            ``iter_pages``).
     """
+    return list(iter_all(client, path, page_size=page_size, query=query, raw=raw,
+                         prefetch=prefetch))
+
+
+def iter_json_array(items, transform=None, *, chunk_bytes=STREAM_CHUNK_BYTES):
+    """Yield the JSON encoding of the list ``items`` as byte chunks.
+
+    Items are encoded one at a time (and run through ``transform`` first, if
+    given) and flushed every ``chunk_bytes``, so the full body string — and,
+    with a transform, the full transformed copy — never exists in memory.
+    Passed as a request's ``data``, ``requests`` sends it as a chunked upload.
+    """
+    buf = [b'[']
+    size = 1
+    for i, item in enumerate(items):
+        if transform is not None:
+            item = transform(item)
+        piece = dumps(item)
+        if i:
+            piece = b',' + piece
+        buf.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield b''.join(buf)
+            buf = []
+            size = 0
+    buf.append(b']')
+    yield b''.join(buf)
+
+
+def split_bulk_body(items, *, max_ops, max_bytes, transform=None):
+    """Split bulk items into ``(start, end)`` chunks holding at most
+    ``max_ops`` items and roughly ``max_bytes`` of encoded JSON each.
+
+    Items are measured as sent: run through ``transform`` first, if given (one
+    item at a time, so no transformed copy of the whole body is built). A
+    single item larger than ``max_bytes`` still gets a chunk of its own (the
+    server decides whether it fits).
+    """
+    chunks = []
+    start = 0
+    size = 2  # the enclosing brackets
+    for i, item in enumerate(items):
+        item_size = len(dumps(item if transform is None else transform(item))) + 1  # + comma
+        if i > start and (i - start >= max_ops or size + item_size > max_bytes):
+            chunks.append((start, i))
+            start, size = i, 2
+        size += item_size
+    if start < len(items):
+        chunks.append((start, len(items)))
+    return chunks
+
+
+def bulk_create(client, path, body, *, audit_message=None, chunked=None):
+    """POST a bulk-create body, splitting it into size-bounded sub-requests.
+
+    Splitting follows ``client.bulk_chunk_ops`` / ``client.bulk_chunk_bytes``
+    (off when both are ``None``, the default); ``chunked=True`` forces it with
+    the module defaults where the client sets none, ``chunked=False`` disables
+    it. A body that fits in one chunk is sent exactly as before.
+
+    Outside a batch the chunks are sent in order — or up to
+    ``client.bulk_max_workers`` at a time, outside strict mode — and the
+    returned ``{"ids": [...]}`` lists are stitched into one, in input order. A
+    failure after some chunks committed raises :class:`PartialBatchError`.
+    Inside a batch each chunk is queued as its own operation and
+    ``submit_batch`` stitches their results back into a single result entry,
+    so callers indexing batch results by call position are unaffected.
+
+    A bulk create on a ``:partitioning`` token layer must establish the whole
+    partition in one request; pass ``chunked=False`` for those.
+    """
+    max_ops = getattr(client, 'bulk_chunk_ops', None)
+    max_bytes = getattr(client, 'bulk_chunk_bytes', None)
+    if chunked is True:
+        max_ops = max_ops or DEFAULT_BULK_CHUNK_OPS
+        max_bytes = max_bytes or DEFAULT_BULK_CHUNK_BYTES
+    if chunked is False or not (max_ops or max_bytes) or not body:
+        return make_request(client, 'POST', path, body=body, audit_message=audit_message)
+
+    # Each chunk is transformed only as it is sent (or, with stream_json,
+    # item by item while it is written), never the whole body up front.
+    items = body
+    chunks = split_bulk_body(items, max_ops=max_ops or len(items),
+                             max_bytes=max_bytes or float('inf'), transform=transform_request)
+    if len(chunks) == 1:
+        return make_request(client, 'POST', path, body=items, audit_message=audit_message)
+
     if client.is_batching:
-        raise RuntimeError(
-            f'Cannot auto-paginate {path} inside a batch: list methods follow '
-            'cursors across multiple requests, which a batch cannot do. Use '
-            'list_page() for a single page inside a batch, or call the list '
-            'method outside the batch.'
-        )
-    results = []
-    cursor = None
-    prev_cursor = None
-    while True:
-        page = list_page(client, path, limit=page_size, cursor=cursor, query=query)
-        # Compatibility shim: a non-paginated server (or proxy) may return a
-        # bare list. Treat it as a terminal full result with no further paging.
-        if isinstance(page, list):
-            results.extend(page)
-            break
-        if isinstance(page, dict) and 'entries' in page:
-            results.extend(page.get('entries') or [])
-        else:
-            raise ValueError(
-                "Unexpected list response shape (no 'entries'); server may be "
-                "incompatible."
-            )
-        prev_cursor = cursor
-        cursor = page.get('next_cursor')
-        if cursor is None:
-            break
-        # Guard against a buggy server/proxy that returns a constant non-null
-        # cursor, which would otherwise loop forever.
-        if cursor == prev_cursor:
-            raise RuntimeError(
-                'Pagination cursor did not advance; aborting to avoid an '
-                'infinite loop.'
-            )
-    return results
+        group = object()
+        for b, e in chunks:
+            make_request(client, 'POST', path, body=items[b:e], audit_message=audit_message)
+            client.batch_operations[-1]['bulk_group'] = group
+        return {'batched': True}
+
+    def send(chunk):
+        b, e = chunk
+        return make_request(client, 'POST', path, body=items[b:e],
+                            audit_message=audit_message)['ids']
+
+    chunk_ids = {}
+    failed = {}
+    workers = getattr(client, 'bulk_max_workers', 1)
+    if workers > 1 and not client.strict_mode_document_id:
+        with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            futures = [pool.submit(send, c) for c in chunks]
+            for i, future in enumerate(futures):
+                try:
+                    chunk_ids[i] = future.result()
+                except PlaidAPIError as err:
+                    failed[i] = err
+    else:
+        for i, chunk in enumerate(chunks):
+            try:
+                chunk_ids[i] = send(chunk)
+            except PlaidAPIError as err:
+                failed[i] = err
+                break
+
+    if not failed:
+        return {'ids': [id_ for i in range(len(chunks)) for id_ in chunk_ids[i]]}
+    committed = sorted(chunk_ids)
+    if not committed:
+        raise failed[min(failed)]
+    results = [None] * len(items)
+    for i in committed:
+        b, e = chunks[i]
+        results[b:e] = chunk_ids[i]
+    first = min(failed)
+    raise PartialBatchError(
+        f'Chunked bulk create at {path} partially committed: {len(committed)} of '
+        f'{len(chunks)} chunks committed; chunk {first} failed: {failed[first]}',
+        chunks=chunks, committed=committed, failed=failed,
+        skipped=[i for i in range(len(chunks)) if i not in chunk_ids and i not in failed],
+        results=results)
 
 
 def make_request(client, method, path, *, body=None, raw_body=None, form_data=False,
                  query_params=None, no_batch=False, skip_response_transform=False,
                  no_auth=False, binary_response=False, audit_message=None,
-                 timeout=_UNSET):
+                 timeout=_UNSET, send_now=False):
     """Generic request method handling all HTTP logic.
 
     Args:
@@ -232,11 +549,19 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
             header.
         query_params: Dict of query param key/values to append.
         no_batch: If True, raise when in batch mode.
+        send_now: Send the request even in batch mode instead of queueing it.
+            For reads the caller's batch has no part in, such as the next
+            page of a paginated iteration (possibly on a prefetch thread).
         skip_response_transform: Return raw parsed JSON (no transform_response).
         no_auth: Skip Authorization header.
         binary_response: Return raw bytes instead of JSON/text.
+
+    When ``client.stream_json`` is set, a list body is encoded incrementally
+    and sent as a chunked upload (see ``iter_json_array``) instead of being
+    transformed and serialized as a whole up front.
     """
     url = f'{client.base_url}{path}'
+    batching = client.is_batching and not send_now
 
     # Append query params
     if query_params:
@@ -252,14 +577,21 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
         if filtered:
             url += '?' + urlencode(filtered)
 
-    # Prepare request body
+    # Prepare request body. A streamed list body is transformed item by item
+    # while it is written (below), so skip the up-front whole-body copy —
+    # except when batching, where the queued op must hold the wire form.
     request_body = None
+    stream_body = (getattr(client, 'stream_json', False) and not form_data
+                   and isinstance(raw_body if raw_body is not None else body, list))
     if form_data:
         request_body = body
     elif raw_body is not None:
         request_body = raw_body
     elif body is not None:
-        request_body = transform_request(body)
+        if stream_body and not batching:
+            request_body = body
+        else:
+            request_body = transform_request(body)
 
     # Strict mode: append document-version for non-GET requests.
     # Inside a batch, stamp ONLY the first write: batches run atomically
@@ -268,13 +600,13 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
     # version bump the first op itself caused (every queued op captures the
     # same pre-batch version).
     if (client.strict_mode_document_id and method != 'GET'
-            and not (client.is_batching and getattr(client, 'batch_version_stamped', False))):
+            and not (batching and getattr(client, 'batch_version_stamped', False))):
         doc_id = client.strict_mode_document_id
         doc_version = client.document_versions.get(doc_id)
         if doc_version:
             separator = '&' if '?' in url else '?'
             url += f'{separator}document-version={quote(str(doc_version), safe="")}'
-            if client.is_batching:
+            if batching:
                 client.batch_version_stamped = True
 
     # Custom audit-log message (overrides the auto-generated description).
@@ -290,7 +622,7 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
         url += f'{separator}audit-message={quote(str(effective_audit_message), safe="")}'
 
     # Batch mode
-    if client.is_batching:
+    if batching:
         if no_batch:
             raise PlaidAPIError(f'This endpoint cannot be used in batch mode: {path}')
         operation = {
@@ -302,6 +634,22 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
         client.batch_operations.append(operation)
         return {'batched': True}
 
+    # Historical (as_of) reads are immutable: answer them from the on-disk
+    # snapshot cache when possible (see cache.AsOfCache).
+    snapshots = getattr(client, 'as_of_cache', None) if method == 'GET' else None
+    snapshot_key = None
+    if snapshots is not None and query_params and snapshots.cacheable(query_params.get('as-of')):
+        snapshot_key = snapshots.key(url, client.token)
+        stored = snapshots.get(snapshot_key)
+        if stored is not None:
+            content_type, content = stored
+            if binary_response:
+                return content
+            if 'application/json' in content_type:
+                data = loads(content)
+                return data if skip_response_transform else transform_response(data)
+            return content.decode('utf-8')
+
     # Build request kwargs
     headers = {}
     if not no_auth:
@@ -309,6 +657,13 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
     if not form_data:
         headers['Content-Type'] = 'application/json'
 
+    # Conditional GET: revalidate a stored response instead of re-downloading
+    # it (see cache.ConditionalCache). Only plain GETs outside a batch get here.
+    conditional = getattr(client, 'conditional_cache', None) if method == 'GET' else None
+    cached = conditional.lookup(url) if conditional is not None else None
+    if cached is not None:
+        headers.update(cached.conditional_headers())
+
     kwargs = {'method': method, 'url': url, 'headers': headers,
               'timeout': (timeout if timeout is not _UNSET
                           else getattr(client, 'timeout', DEFAULT_TIMEOUT_S))}
@@ -319,8 +674,11 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
             kwargs.pop('headers', None)
             kwargs['headers'] = {k: v for k, v in headers.items() if k != 'Content-Type'}
             kwargs['files'] = request_body
+        elif stream_body:
+            kwargs['data'] = iter_json_array(
+                request_body, transform_request if raw_body is None else None)
         else:
-            kwargs['data'] = json.dumps(request_body)
+            kwargs['data'] = dumps(request_body)
 
     try:
         response = client.session.request(**kwargs)
@@ -334,19 +692,29 @@ def make_request(client, method, path, *, body=None, raw_body=None, form_data=Fa
     if not response.ok:
         raise build_api_error(response, url, method)
 
+    # A 304 answers from the stored body; any other success refreshes it.
+    response_headers, content = response.headers, None
+    if cached is not None and response.status_code == 304:
+        response_headers, content = conditional.replay(cached)
+    elif conditional is not None:
+        conditional.record(url, response)
+    if snapshot_key is not None and response.status_code == 200:
+        snapshots.put(snapshot_key, response_headers.get('content-type', ''),
+                      response.content if content is None else content)
+
     # Binary response
     if binary_response:
-        extract_document_versions(client, response.headers)
-        return response.content
+        extract_document_versions(client, response_headers)
+        return response.content if content is None else content
 
     # JSON or text response
-    content_type = response.headers.get('content-type', '')
+    content_type = response_headers.get('content-type', '')
     if 'application/json' in content_type:
-        data = response.json()
-        extract_document_versions(client, response.headers, data)
+        data = decode_response(response) if content is None else loads(content)
+        extract_document_versions(client, response_headers, data)
         if skip_response_transform:
             return data
         return transform_response(data)
     else:
-        extract_document_versions(client, response.headers)
-        return response.text
+        extract_document_versions(client, response_headers)
+        return response.text if content is None else content.decode('utf-8')
@@ -0,0 +1,317 @@
+"""Per-project index of the layer structure (roles, UD config, relation layers).
+
+Services resolve the same handful of layers on every request — the baseline
+text layer, the sentence/word token layers by role, the UD span layers by their
+``config.ud`` flags, the dependency relation layer under the lemma layer — and
+used to do it by walking a full ``documents.get`` tree each time. The layer
+structure is a property of the *project*, not the document, and changes rarely,
+so :class:`LayerIndex` builds those lookups once from ``projects.get`` (which
+nests text → token → span → relation layers, configs included, but no document
+content) and answers them in constant time::
+
+    index = get_layer_index(client, project_id)
+    word = index.by_role(ROLES.WORD)
+    lemma = index.span_layer_by_ud_config(morpheme['id'], 'lemma', 'Lemma')
+    deps = index.relation_layer_by_ud_config(lemma['id'], 'dependency')
+
+:func:`get_layer_index` shares one index per (server, credentials, project)
+across every service and thread in the process. Any layer create / update /
+shift / delete or editor-config change drops the index and the next lookup
+refetches it — reported either by the caller, which passes the events of a
+stream it already reads to :meth:`LayerIndexRegistry.note_event`, or by the
+registry itself when ``watch`` is on: it then listens to each project's audit
+stream, on ``mux`` if one is set, so every watched project costs an open
+connection (and, without a multiplexer, a reader thread). While a watched
+stream is not connected nothing can vouch for the cached copy, so it is
+refetched on every lookup until the stream is back. Unwatched, an entry is
+also refetched after :data:`LAYER_INDEX_TTL_S`.
+
+A :class:`~plaid_client.service.BaseService` run with ``multiplex`` turns
+watching on for the shared registry, on the multiplexer its request channels
+already use (:meth:`LayerIndexRegistry.watch_on`), and off again when it
+stops.
+
+Layer dicts are returned as the server sent them (snake_case keys). They carry
+no tokens, spans or text — fetch the document for content.
+"""
+
+import threading
+import time
+
+from plaid_client.roles import read_role
+from plaid_client.sse import ResumePoint
+
+#: Age (seconds) after which the shared registry refetches an index it is
+#: not watching the audit stream for.
+LAYER_INDEX_TTL_S = 60.0
+
+#: Prefixes of audit op types (``"<kind>:<op>"``) that change layer structure.
+LAYER_OP_KINDS = frozenset({'text_layer', 'token_layer', 'span_layer', 'relation_layer', 'layer'})
+
+# Child-list key of each level of the layer tree, outermost first.
+_CHILD_KEYS = ('token_layers', 'span_layers', 'relation_layers')
+
+
+def _ud_flags(layer):
+    return (layer.get('config') or {}).get('ud') or {}
+
+
+class LayerIndex:
+    """Constant-time lookups over one project's layer tree.
+
+    Args:
+        text_layers: The project's (or a document's) nested ``text_layers``.
+        project_id: The project the tree belongs to, if known.
+    """
+
+    def __init__(self, text_layers, project_id=None):
+        self.project_id = project_id
+        self.text_layers = list(text_layers or [])
+        self._by_id = {}
+        self._parent = {}
+        self._by_role = {}
+        self._children = {}
+        self._ud = {}
+        self._by_name = {}
+
+        stack = [(layer, None, 0) for layer in reversed(self.text_layers)]
+        while stack:
+            layer, parent_id, depth = stack.pop()
+            layer_id = layer.get('id')
+            self._by_id[layer_id] = layer
+            self._parent[layer_id] = parent_id
+            role = read_role(layer.get('config'))
+            if role is not None:
+                # First match wins, in tree order — same as find_by_role.
+                self._by_role.setdefault((role, None), layer)
+                self._by_role.setdefault((role, parent_id), layer)
+            if parent_id is not None:
+                for key, flag in _ud_flags(layer).items():
+                    if flag is True:
+                        self._ud.setdefault((parent_id, key), layer)
+                name = layer.get('name')
+                if name is not None:
+                    self._by_name.setdefault((parent_id, name), layer)
+            if depth < len(_CHILD_KEYS):
+                children = layer.get(_CHILD_KEYS[depth]) or []
+                self._children[layer_id] = children
+                stack.extend((child, layer_id, depth + 1) for child in reversed(children))
+
+    @classmethod
+    def from_project(cls, project):
+        """Build the index from a ``projects.get`` response."""
+        return cls(project.get('text_layers'), project_id=project.get('id'))
+
+    def __contains__(self, layer_id):
+        return layer_id in self._by_id
+
+    def layer(self, layer_id):
+        """The layer with ``layer_id`` (at any level), or ``None``."""
+        return self._by_id.get(layer_id)
+
+    def parent_id(self, layer_id):
+        """Id of the layer directly above ``layer_id`` (``None`` for text layers)."""
+        return self._parent.get(layer_id)
+
+    def children(self, layer_id):
+        """The layers directly below ``layer_id`` (token layers of a text layer,
+        and so on)."""
+        return self._children.get(layer_id, [])
+
+    def by_role(self, role, parent_id=None):
+        """The first layer tagged with ``role``, or ``None``.
+
+        Args:
+            role: A :class:`~plaid_client.roles.ROLES` value.
+            parent_id: Only consider layers directly under this layer (e.g. the
+                token layers of one text layer). ``None`` searches the whole tree.
+        """
+        return self._by_role.get((role, parent_id))
+
+    def span_layer_by_ud_config(self, token_layer_id, key, fallback_name=None):
+        """The span layer under ``token_layer_id`` whose ``config.ud[key]`` is
+        true, else the one named ``fallback_name``, else ``None``."""
+        layer = self._ud.get((token_layer_id, key))
+        if layer is None and fallback_name:
+            layer = self._by_name.get((token_layer_id, fallback_name))
+        return layer
+
+    def relation_layers(self, span_layer_id):
+        """The relation layers under ``span_layer_id``."""
+        return self.children(span_layer_id)
+
+    def relation_layer_by_ud_config(self, span_layer_id, key, fallback_index=0):
+        """The relation layer under ``span_layer_id`` whose ``config.ud[key]`` is
+        true, else the one at ``fallback_index`` (the first if out of range),
+        else ``None``."""
+        layer = self._ud.get((span_layer_id, key))
+        if layer is not None:
+            return layer
+        relation_layers = self.relation_layers(span_layer_id)
+        if not relation_layers:
+            return None
+        try:
+            return relation_layers[fallback_index]
+        except IndexError:
+            return relation_layers[0]
+
+
+def is_layer_change(event_type, data):
+    """Whether an event from ``messages.listen`` reports a layer-structure change."""
+    if event_type != 'audit-log' or not isinstance(data, dict):
+        return False
+    for op in data.get('ops') or []:
+        op_type = op.get('type') if isinstance(op, dict) else None
+        if op_type and op_type.split(':', 1)[0] in LAYER_OP_KINDS:
+            return True
+    return False
+
+
+class _Entry:
+    __slots__ = ('index', 'watcher', 'resume', 'fetched_at', 'trusted', 'generation')
+
+    def __init__(self):
+        self.generation = 0
+        self.index = None
+        self.watcher = None
+        self.resume = ResumePoint()
+        self.fetched_at = 0.0
+        self.trusted = False
+
+
+class LayerIndexRegistry:
+    """Process-wide cache of :class:`LayerIndex` objects.
+
+    Entries are keyed by server URL, token and project id, so clients with
+    different credentials never share one. Thread-safe.
+
+    Args:
+        watch: Keep each cached index fresh by listening to the project's audit
+            stream (one SSE connection per project, closed by :meth:`close`).
+            Without it, entries live until :meth:`invalidate`,
+            :meth:`note_event` or ``ttl``.
+        ttl: Seconds an entry may be served before it is refetched regardless
+            (``None``: no age limit).
+        mux: An :class:`~plaid_client.sse_mux.SSEMultiplexer` to read the
+            audit streams on instead of one thread per stream.
+    """
+
+    def __init__(self, *, watch=False, ttl=None, mux=None):
+        self.watch = watch
+        self.ttl = ttl
+        self.mux = mux
+        self.fetches = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(client, project_id):
+        return (client.base_url, client.token, project_id)
+
+    def get(self, client, project_id, *, refresh=False):
+        """Return ``project_id``'s index, fetching it if missing or stale."""
+        key = self._key(client, project_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            if self.watch and (entry.watcher is None or entry.watcher.ready_state == 2):
+                # (Re)open the stream before fetching, so no change made after
+                # the fetch can slip past it. A dropped stream resumes where it
+                # stopped: the changes missed meanwhile arrive as events, so
+                # the cached index survives unless one of them is a layer
+                # change. It is served again once they are in (the stream is
+                # OPEN); if they can't be read back, the stream closes and
+                # the next call starts afresh.
+                if entry.watcher is None or not entry.resume.resumable:
+                    entry.index = None
+                entry.watcher = client.messages.listen(
+                    project_id, lambda event_type, data: self._on_event(key, event_type, data),
+                    mux=self.mux, resume=entry.resume)
+            if (entry.index is not None and not refresh
+                    and (not self.watch or (entry.trusted and entry.watcher.ready_state == 1))
+                    and (self.ttl is None or time.monotonic() - entry.fetched_at <= self.ttl)):
+                return entry.index
+            # Trusted only if the stream was already delivering when we fetched.
+            trusted = not self.watch or entry.watcher.ready_state == 1
+            generation = entry.generation
+        project = client.projects.get(project_id, raw=False)
+        index = LayerIndex.from_project(project)
+        with self._lock:
+            self.fetches += 1
+            # A change reported while we were fetching makes this copy stale
+            # already: hand it to this caller, but don't cache it. Nor does an
+            # unvouched copy displace a trusted one awaiting its catch-up.
+            if (self._entries.get(key) is entry and entry.generation == generation
+                    and (trusted or not entry.trusted or entry.index is None)):
+                entry.index = index
+                entry.fetched_at = time.monotonic()
+                entry.trusted = trusted
+        return index
+
+    def _on_event(self, key, event_type, data):
+        if is_layer_change(event_type, data):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.generation += 1
+                    entry.index = None
+
+    def note_event(self, project_id, event_type, data):
+        """Feed an event from a caller's own ``messages.listen`` stream; a
+        layer change drops every cached index of ``project_id``."""
+        if is_layer_change(event_type, data):
+            self.invalidate(project_id)
+
+    def invalidate(self, project_id=None):
+        """Drop the cached index of ``project_id`` (or of every project)."""
+        with self._lock:
+            for key, entry in self._entries.items():
+                if project_id is None or key[2] == project_id:
+                    entry.generation += 1
+                    entry.index = None
+
+    def watch_on(self, mux):
+        """Watch from now on, reading the audit streams on ``mux``. Returns
+        ``False`` (and changes nothing) if the registry already watches."""
+        with self._lock:
+            if self.watch:
+                return False
+            self.watch, self.mux = True, mux
+            return True
+
+    def stop_watching(self):
+        """Stop watching and close the audit streams. Cached indexes stay,
+        subject to ``ttl`` like any unwatched entry."""
+        with self._lock:
+            self.watch, self.mux = False, None
+            watchers = [entry.watcher for entry in self._entries.values()
+                        if entry.watcher is not None]
+            for entry in self._entries.values():
+                entry.watcher = None
+        for watcher in watchers:
+            watcher.close()
+
+    def close(self):
+        """Close every audit stream and drop every entry."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            if entry.watcher is not None:
+                entry.watcher.close()
+
+
+#: The registry shared by every service in the process.
+layer_indexes = LayerIndexRegistry(ttl=LAYER_INDEX_TTL_S)
+
+
+def get_layer_index(client, project_id, *, refresh=False):
+    """Return the shared :class:`LayerIndex` for ``project_id``.
+
+    Args:
+        client: A :class:`~plaid_client.PlaidClient`.
+        project_id: The project whose layers to index.
+        refresh: Refetch even if a fresh copy is cached.
+    """
+    return layer_indexes.get(client, project_id, refresh=refresh)
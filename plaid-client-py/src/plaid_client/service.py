@@ -1,7 +1,7 @@
 """Base class for Plaid NLP services.
 
 Generic scaffolding shared by all Plaid services: client/token bootstrap,
-service registration, the single-request processing lock, and the CLI run loop.
+service registration, the worker pool requests run on, and the CLI run loop.
 A concrete service subclasses :class:`BaseService`, declares the tasks it serves
 plus a summary and a parameter schema (assembled into ``extras`` automatically),
 and implements :meth:`process_request`.
@@ -24,7 +24,15 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 from plaid_client.client import PlaidClient
+from plaid_client.layer_index import layer_indexes
+from plaid_client.service_pool import ServiceMetrics, WorkerPool
 from plaid_client.service_schema import build_extras
+from plaid_client.sse_mux import SSEMultiplexer
+
+# Client settings a worker's own client copies from the service's client.
+_WORKER_CLIENT_SETTINGS = ('bulk_chunk_ops', 'bulk_chunk_bytes', 'bulk_max_workers',
+                           'stream_json', 'raw_responses', 'prefetch_pages',
+                           'document_cache', 'conditional_cache', 'as_of_cache')
 
 
 class BaseService(ABC):
@@ -39,26 +47,119 @@ class BaseService(ABC):
         parameters: Optional list of per-request parameter descriptors
             (use ``plaid_client.Param``).
         extras: Optional dict of additional service-specific extras to merge in.
+        workers: Requests processed at once, across every served project
+            (default 1). Operators can override it with ``--workers``.
+        queue_size: Requests that may wait for a free worker before new ones
+            are turned away as busy (default 0: refuse while all workers are
+            busy). Operators can override it with ``--queue-size``. Waiting
+            requests are served fairly: projects take turns, so one busy
+            project can't starve the others (see :meth:`request_priority`).
+        project_queue_size: Of the queued requests, how many one project may
+            hold (default ``None``: no per-project limit). Operators can
+            override it with ``--project-queue-size``.
+        multiplex: Read every project's request channel on one shared
+            event-loop thread (:class:`~plaid_client.sse_mux.SSEMultiplexer`)
+            instead of two threads per project. Worth it when serving many
+            projects; operators can turn it on with ``--multiplex``. The
+            shared layer indexes (:func:`~plaid_client.layer_index.get_layer_index`)
+            then also follow each indexed project's audit stream on it,
+            rather than expiring after a fixed time.
+        thread_safe: Whether the model from :meth:`create_worker_model` may be
+            shared by all workers. Declare ``False`` for models that must not
+            be driven from two threads at once; each worker then builds its own.
     """
 
     def __init__(self, service_id: str, service_name: str, description: str, *,
                  tasks: Optional[List[str]] = None,
                  summary: Optional[str] = None,
                  parameters: Optional[List[Dict[str, Any]]] = None,
-                 extras: Optional[Dict[str, Any]] = None):
+                 extras: Optional[Dict[str, Any]] = None,
+                 workers: int = 1,
+                 queue_size: int = 0,
+                 project_queue_size: Optional[int] = None,
+                 multiplex: bool = False,
+                 thread_safe: bool = True):
         self.service_id = service_id
         self.service_name = service_name
         self.description = description
         self.extras = build_extras(tasks=tasks or [], summary=summary,
                                    parameters=parameters, extra=extras)
-        self.client: Optional[PlaidClient] = None
+        self.client = None
         # One registration per served project (a service can serve many at once;
-        # see :meth:`run`). The lock makes the instance single-flight ACROSS all
-        # of them — each project has its own SSE reader thread, so without it two
-        # projects' requests could enter :meth:`process_request` (and the shared
-        # client's batch state) concurrently.
+        # see :meth:`run`). Each project has its own SSE reader thread; they all
+        # hand requests to ONE worker pool, so ``workers`` bounds the requests in
+        # :meth:`process_request` across every project.
         self.service_registrations: List[Any] = []
-        self._processing_lock = threading.Lock()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.project_queue_size = project_queue_size
+        self.multiplex = multiplex
+        self._mux: Optional[SSEMultiplexer] = None
+        self.thread_safe = thread_safe
+        self._pool: Optional[WorkerPool] = None
+        self._pool_lock = threading.Lock()
+        # Per-worker client / model (see the ``client`` and ``worker_model``
+        # properties), and the one shared model when ``thread_safe``.
+        self._local = threading.local()
+        self._shared_model: Any = None
+        self._shared_model_lock = threading.Lock()
+
+    # --- per-worker state ---------------------------------------------------
+
+    @property
+    def client(self) -> Optional[PlaidClient]:
+        """The client to talk to Plaid with. On a worker thread of a service
+        with several workers this is the worker's own client (see
+        :meth:`create_worker_client`), so ambient client state — batches,
+        strict mode, audit messages — never leaks between concurrent requests."""
+        return getattr(self._local, 'client', None) or self._client
+
+    @client.setter
+    def client(self, client: Optional[PlaidClient]) -> None:
+        self._client = client
+
+    def create_worker_client(self) -> PlaidClient:
+        """Build the client for one worker thread (only when ``workers > 1``).
+
+        The default shares the service client's connection pool, token and
+        settings, and its ``document_versions``: the workers share its
+        ``document_cache``, so a version one worker's write bumps must retire
+        the copy every other worker would serve. (The map is only read and
+        updated key by key, which the GIL keeps atomic.) Override if
+        :meth:`get_client` builds something more special.
+        """
+        base = self._client
+        client = PlaidClient(base.base_url, base.token, timeout=base.timeout,
+                             session=base.session)
+        for name in _WORKER_CLIENT_SETTINGS:
+            setattr(client, name, getattr(base, name))
+        client.document_versions = base.document_versions
+        return client
+
+    def create_worker_model(self) -> Any:
+        """Override to build the model :meth:`process_request` drives, read
+        back through :attr:`worker_model`. Built once if ``thread_safe``,
+        else once per worker thread. The default builds nothing."""
+        return None
+
+    @property
+    def worker_model(self) -> Any:
+        """This worker's model from :meth:`create_worker_model`, built on first
+        use (workers build theirs when they start)."""
+        if self.thread_safe:
+            with self._shared_model_lock:
+                if self._shared_model is None:
+                    self._shared_model = self.create_worker_model()
+                return self._shared_model
+        if not hasattr(self._local, 'model'):
+            self._local.model = self.create_worker_model()
+        return self._local.model
+
+    def _start_worker(self) -> None:
+        """Runs on each worker thread before it takes work."""
+        if self.workers > 1:
+            self._local.client = self.create_worker_client()
+        self.worker_model  # build (or share) the model up front
 
     # --- client bootstrap ---------------------------------------------------
 
@@ -84,7 +185,7 @@ class BaseService(ABC):
                 # Any failure validating the token (bad token -> PlaidAPIError,
                 # or a network error) just means "try again".
                 try:
-                    _ = client.projects.list()
+                    _ = client.projects.list(raw=False)
                 except Exception as e:
                     print(f"Error when attempting to connect to Plaid API: {e}")
                     continue
@@ -109,20 +210,48 @@ class BaseService(ABC):
         raise NotImplementedError
 
     def handle_service_request(self, request_data: Dict[str, Any], response_helper) -> None:
-        """Wrap :meth:`process_request` with a single-flight lock + error reporting.
+        """Hand a request to the worker pool, or refuse it if the pool is full.
 
-        When serving several projects each has its own SSE reader thread, so a
-        cross-project race is real. We REJECT (don't block) a second concurrent
-        request: blocking could outlast the requester's response timeout, badly
-        so for slow models. The work is CPU/GPU-bound anyway — one at a time is
-        the right model.
+        Called on a project's SSE reader thread, which goes straight back to
+        reading. We REJECT (don't block) once every worker is busy and the
+        queue is full: blocking could outlast the requester's response
+        timeout, badly so for slow models. Requests that do wait are told
+        their queue position through ``response_helper.progress``.
         """
-        if not self._processing_lock.acquire(blocking=False):
-            response_helper.error(
-                f"{self.service_name} is currently processing another request. "
-                f"Please try again later."
-            )
-            return
+        project_id = getattr(response_helper, 'project_id', None)
+        pool = self._get_pool()
+        priority = self.request_priority(request_data, project_id)
+        if not pool.submit(request_data, response_helper, priority=priority):
+            if self.project_queue_size is not None and pool.pending < self.queue_size:
+                response_helper.error(
+                    f"{self.service_name} is busy ({self.project_queue_size} requests from "
+                    f"this project already queued). Please try again later."
+                )
+            elif self.queue_size:
+                response_helper.error(
+                    f"{self.service_name} is busy ({self.queue_size} requests already "
+                    f"queued). Please try again later."
+                )
+            else:
+                response_helper.error(
+                    f"{self.service_name} is currently processing another request. "
+                    f"Please try again later."
+                )
+
+    def request_priority(self, request_data: Dict[str, Any], project_id: Optional[str]) -> int:
+        """Override to rank queued requests: higher runs first, equal ranks
+        take turns by project. The default ranks everything 0."""
+        return 0
+
+    @property
+    def metrics(self) -> Optional[ServiceMetrics]:
+        """:class:`~plaid_client.service_pool.ServiceMetrics` over every
+        request this instance received (``None`` before the first one). Each
+        registration's ``metrics`` covers its own project."""
+        return self._pool.metrics if self._pool is not None else None
+
+    def _process(self, request_data: Dict[str, Any], response_helper) -> None:
+        """Run :meth:`process_request` on a worker, reporting any exception."""
         try:
             self.process_request(request_data, response_helper)
         except Exception as e:
@@ -130,8 +259,16 @@ class BaseService(ABC):
             print(f"Error during {self.service_name} processing: {str(e)}")
             traceback.print_exc()
             response_helper.error(f"{self.service_name} processing error: {str(e)}")
-        finally:
-            self._processing_lock.release()
+
+    def _get_pool(self) -> WorkerPool:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = WorkerPool(self._process, workers=self.workers,
+                                        queue_size=self.queue_size,
+                                        project_queue_size=self.project_queue_size,
+                                        name=self.service_name,
+                                        on_worker_start=self._start_worker)
+            return self._pool
 
     # --- registration + lifecycle ------------------------------------------
 
@@ -145,8 +282,12 @@ class BaseService(ABC):
             'service_name': self.service_name,
             'description': self.description,
         }
+        if self.multiplex and self._mux is None:
+            self._mux = SSEMultiplexer()
+            layer_indexes.watch_on(self._mux)
+        kwargs = {'mux': self._mux} if self._mux is not None else {}
         registration = self.client.messages.serve(
-            project_id, service_info, self.handle_service_request, self.extras
+            project_id, service_info, self.handle_service_request, self.extras, **kwargs
         )
         self.service_registrations.append(registration)
         return registration
@@ -164,6 +305,12 @@ class BaseService(ABC):
                     reg.stop()
                 except Exception:
                     pass
+            if self._mux is not None:
+                if layer_indexes.mux is self._mux:
+                    layer_indexes.stop_watching()
+                self._mux.close()
+            if self._pool is not None:
+                self._pool.shutdown()
             print("Service stopped.")
 
     # --- CLI ----------------------------------------------------------------
@@ -183,6 +330,18 @@ class BaseService(ABC):
                                  'default when no project ID is given).')
         parser.add_argument('--url', default='http://localhost:8080',
                             help='Plaid API URL (default: http://localhost:8080)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help=f'Requests to process at once across all served '
+                                 f'projects (default: {self.workers})')
+        parser.add_argument('--queue-size', type=int, default=None,
+                            help=f'Requests that may wait for a free worker before '
+                                 f'new ones are refused (default: {self.queue_size})')
+        parser.add_argument('--project-queue-size', type=int, default=None,
+                            help='Of those, how many one project may hold '
+                                 '(default: no per-project limit)')
+        parser.add_argument('--multiplex', action='store_true', default=None,
+                            help='Read all request channels on one event-loop thread '
+                                 'instead of two threads per served project')
 
     def add_arguments(self, parser: argparse.ArgumentParser) -> None:
         """Override to add service-specific CLI (operator) arguments."""
@@ -212,18 +371,27 @@ class BaseService(ABC):
         per project the token can access. That gives universal coverage: server
         side, registration is project-scoped (one SSE channel per project), so
         being discoverable everywhere means registering everywhere. Every
-        registration shares this instance's client and single-flight lock, so
-        requests are still handled one at a time across all served projects.
+        registration feeds this instance's worker pool, so at most ``workers``
+        requests run at once across all served projects. With ``--multiplex``
+        the channels all share one event-loop thread.
         """
         parser = self.create_argument_parser()
         parsed_args = parser.parse_args(args)
+        if getattr(parsed_args, 'workers', None) is not None:
+            self.workers = parsed_args.workers
+        if getattr(parsed_args, 'queue_size', None) is not None:
+            self.queue_size = parsed_args.queue_size
+        if getattr(parsed_args, 'project_queue_size', None) is not None:
+            self.project_queue_size = parsed_args.project_queue_size
+        if getattr(parsed_args, 'multiplex', None):
+            self.multiplex = True
         self.client = self.get_client(parsed_args.url)
 
         # Resolve the target project set (fail fast before any expensive setup()).
         serve_all = getattr(parsed_args, 'all', False) or not parsed_args.project_id
         if serve_all:
             try:
-                projects = self.client.projects.list()
+                projects = self.client.projects.list(raw=False)
             except Exception as e:
                 print(f"Failed to list projects: {e}")
                 raise SystemExit(1)
@@ -235,6 +403,8 @@ class BaseService(ABC):
             targets = [(parsed_args.project_id, parsed_args.project_id)]
 
         self.setup(parsed_args)
+        # Load the workers' models before requests can arrive.
+        self._get_pool().start()
 
         print(f"Registering {self.service_name} (service_id={self.service_id}, "
               f"tasks={self.extras.get('tasks')}) on {len(targets)} project(s)…")
@@ -0,0 +1,383 @@
+"""Worker pool that runs a service's requests off the channel reader threads.
+
+Requests reach a service on one SSE reader thread per served project. Handling
+them inline on that thread leaves two choices when a second project's request
+arrives mid-run: run both at once on shared state, or turn the newcomer away.
+:class:`WorkerPool` decouples the two: the reader thread only
+:meth:`~WorkerPool.submit`\\ s the request and returns, and a fixed set of
+worker threads drains a bounded queue. A request is refused only when every
+worker is busy and the queue is full; while it waits, its requester gets
+``progress`` messages with its queue position. Those are sent by a reporter
+thread of the pool's own, so neither the reader thread submitting a request
+nor a worker taking one waits on a round trip per waiting request; a position
+that changes again before it is sent is reported once, at its latest value,
+and not at all once the request has started.
+
+The queue is fair across projects. Waiting requests run highest priority
+first; within a priority the projects take turns (round-robin), and each
+project's own requests run in arrival order. A project that submits fifty
+requests therefore delays another project's single request by at most one
+turn, not fifty — and ``project_queue_size`` can cap how much of the queue one
+project may hold.
+
+Each request's queue wait and service time are recorded in
+:class:`ServiceMetrics`: the pool's own ``metrics`` for all requests, plus the
+``metrics`` of the response helper's registration (see
+:attr:`plaid_client.services.ServiceRegistration.metrics`) for one project.
+
+:class:`~plaid_client.service.BaseService` builds one pool per instance (see
+its ``workers`` / ``queue_size`` options); it is usable on its own with any
+``handler(request_data, response_helper)``.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class _Timing:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self):
+        return {'count': self.count, 'total': self.total, 'max': self.max,
+                'mean': self.total / self.count if self.count else 0.0}
+
+
+class ServiceMetrics:
+    """Request counters and timings, safe to read from any thread.
+
+    Attributes:
+        accepted: Requests admitted (run at once or queued).
+        rejected: Requests refused as busy, or dropped from the queue at
+            shutdown.
+        completed: Requests whose handler has returned.
+        queued: Requests waiting right now.
+        active: Requests being handled right now.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.queued = 0
+        self.active = 0
+        self._queue_wait = _Timing()
+        self._service_time = _Timing()
+
+    def snapshot(self):
+        """The counters, plus ``queue_wait`` and ``service_time`` as
+        ``{'count', 'total', 'max', 'mean'}`` in seconds."""
+        with self._lock:
+            return {'accepted': self.accepted, 'rejected': self.rejected,
+                    'completed': self.completed, 'queued': self.queued,
+                    'active': self.active, 'queue_wait': self._queue_wait.snapshot(),
+                    'service_time': self._service_time.snapshot()}
+
+    def _accept(self):
+        with self._lock:
+            self.accepted += 1
+            self.queued += 1
+
+    def _reject(self, queued=False):
+        with self._lock:
+            self.rejected += 1
+            if queued:
+                self.queued -= 1
+
+    def _start(self, waited):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self._queue_wait.add(waited)
+
+    def _finish(self, took):
+        with self._lock:
+            self.active -= 1
+            self.completed += 1
+            self._service_time.add(took)
+
+
+class _Entry:
+    __slots__ = ('request_data', 'response_helper', 'project', 'priority', 'metrics',
+                 'enqueued', 'position')
+
+    def __init__(self, request_data, response_helper, priority):
+        self.request_data = request_data
+        self.response_helper = response_helper
+        self.project = getattr(response_helper, 'project_id', None)
+        self.metrics = getattr(response_helper, 'metrics', None)
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.position = 0  # last queue position reported to the requester
+
+
+class _FairQueue:
+    """Waiting entries: highest priority first, then round-robin over
+    projects, then FIFO within a project."""
+
+    def __init__(self):
+        self._levels = {}  # priority -> OrderedDict(project -> deque of entries)
+        self._per_project = Counter()
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def count(self, project):
+        return self._per_project[project]
+
+    def push(self, entry):
+        projects = self._levels.setdefault(entry.priority, OrderedDict())
+        projects.setdefault(entry.project, deque()).append(entry)
+        self._per_project[entry.project] += 1
+        self._len += 1
+
+    def pop(self):
+        priority = max(self._levels)
+        projects = self._levels[priority]
+        project, entries = next(iter(projects.items()))
+        entry = entries.popleft()
+        if entries:
+            projects.move_to_end(project)  # its next request waits a turn
+        else:
+            del projects[project]
+            if not projects:
+                del self._levels[priority]
+        self._per_project[project] -= 1
+        self._len -= 1
+        return entry
+
+    def clear(self):
+        entries = list(self)
+        self._levels.clear()
+        self._per_project.clear()
+        self._len = 0
+        return entries
+
+    def __iter__(self):
+        """Entries in the order :meth:`pop` would return them."""
+        for priority in sorted(self._levels, reverse=True):
+            queues = list(self._levels[priority].values())
+            for turn in range(max(map(len, queues))):
+                for entries in queues:
+                    if turn < len(entries):
+                        yield entries[turn]
+
+
+class WorkerPool:
+    """``workers`` threads running ``handler`` over a bounded, fair queue.
+
+    Args:
+        handler: ``handler(request_data, response_helper)``; runs on a worker
+            thread. Exceptions are logged; reporting them to the requester is
+            the handler's job.
+        workers: Number of worker threads (started by :meth:`start` or the
+            first :meth:`submit`).
+        queue_size: Requests that may wait for a free worker. ``0`` refuses
+            any request arriving while every worker is busy.
+        project_queue_size: Of those, how many one project may hold
+            (``None``: no per-project limit). The project is read from the
+            response helper's ``project_id``.
+        name: Used for thread names and log messages.
+        on_worker_start: Optional callable run once on each worker thread
+            before it takes work (e.g. to load per-worker models).
+
+    Attributes:
+        metrics: :class:`ServiceMetrics` over every request submitted.
+    """
+
+    def __init__(self, handler, *, workers=1, queue_size=0, project_queue_size=None,
+                 name='service', on_worker_start=None):
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        if queue_size < 0:
+            raise ValueError('queue_size must not be negative')
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.project_queue_size = project_queue_size
+        self.name = name
+        self.on_worker_start = on_worker_start
+        self.metrics = ServiceMetrics()
+        self._queue = _FairQueue()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._threads = []
+        self._closed = False
+        self._reports = {}  # entry -> queue position still to send (latest wins)
+        self._reporting = threading.Condition()
+        self._reporter = None
+        self._sending = False
+
+    @property
+    def active(self):
+        """Requests being handled right now."""
+        return self._active
+
+    @property
+    def pending(self):
+        """Requests waiting for a worker."""
+        return len(self._queue)
+
+    def submit(self, request_data, response_helper, *, priority=0):
+        """Queue a request; higher ``priority`` runs first. Returns ``False``
+        (and queues nothing) when every worker is busy and the queue — or the
+        project's share of it — is full, or the pool is shut down."""
+        entry = _Entry(request_data, response_helper, priority)
+        metrics = [m for m in (self.metrics, entry.metrics) if m is not None]
+        with self._cond:
+            idle = self.workers - self._active - len(self._queue)
+            full = (self._closed or idle + self.queue_size <= 0
+                    or (idle <= 0 and self.project_queue_size is not None
+                        and self._queue.count(entry.project) >= self.project_queue_size))
+            if full:
+                for m in metrics:
+                    m._reject()
+                return False
+            self._start_locked()
+            self._queue.push(entry)
+            for m in metrics:
+                m._accept()
+            moved = self._positions_locked()
+            self._cond.notify()
+        self._report(moved)
+        return True
+
+    def start(self):
+        """Start the worker threads now rather than on the first
+        :meth:`submit`, so ``on_worker_start`` runs before work arrives."""
+        with self._cond:
+            self._start_locked()
+
+    def shutdown(self, wait=False):
+        """Stop taking requests and let the workers exit once idle. Requests
+        still queued are answered with an error."""
+        with self._cond:
+            self._closed = True
+            dropped = self._queue.clear()
+            for entry in dropped:
+                entry.position = 0
+            self._cond.notify_all()
+        with self._reporting:
+            self._reports.clear()
+            self._reporting.notify_all()
+        for entry in dropped:
+            for m in (self.metrics, entry.metrics):
+                if m is not None:
+                    m._reject(queued=True)
+            try:
+                entry.response_helper.error(
+                    f'{self.name} is shutting down. Please try again later.')
+            except Exception:
+                logger.warning('Failed to reject a queued %s request', self.name)
+        if wait:
+            for thread in self._threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _start_locked(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'{self.name}-worker-{i}',
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _positions_locked(self):
+        """``(entry, position)`` for each waiting entry whose queue position
+        changed. Entries idle workers are about to take have none."""
+        idle = self.workers - self._active
+        moved = []
+        for index, entry in enumerate(self._queue):
+            position = index + 1 - idle
+            if position > 0 and position != entry.position:
+                entry.position = position
+                moved.append((entry, position))
+        return moved
+
+    def _work(self):
+        if self.on_worker_start is not None:
+            try:
+                self.on_worker_start()
+            except Exception:
+                logger.exception('%s worker failed to start up', self.name)
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._queue:
+                    return
+                entry = self._queue.pop()
+                entry.position = 0  # no longer waiting: drop unsent reports
+                self._active += 1
+                metrics = [m for m in (self.metrics, entry.metrics) if m is not None]
+                started = time.monotonic()
+                for m in metrics:
+                    m._start(started - entry.enqueued)
+                moved = self._positions_locked()
+            self._report(moved)
+            try:
+                self.handler(entry.request_data, entry.response_helper)
+            except Exception:
+                logger.exception('Unhandled error in %s worker', self.name)
+            finally:
+                took = time.monotonic() - started
+                for m in metrics:
+                    m._finish(took)
+                with self._cond:
+                    self._active -= 1
+
+    def _report(self, moved):
+        """Hand queue positions to the reporter thread; never blocks on I/O."""
+        if not moved:
+            return
+        with self._reporting:
+            if self._closed:
+                return
+            self._reports.update(moved)
+            if self._reporter is None:
+                self._reporter = threading.Thread(target=self._send_reports,
+                                                  name=f'{self.name}-positions', daemon=True)
+                self._reporter.start()
+            self._reporting.notify()
+
+    def _send_reports(self):
+        while True:
+            with self._reporting:
+                self._sending = False
+                self._reporting.notify_all()
+                while not self._reports and not self._closed:
+                    self._reporting.wait()
+                if not self._reports:
+                    return
+                reports, self._reports = self._reports, {}
+                self._sending = True
+            for entry, position in reports.items():
+                if entry.position != position:
+                    continue  # moved again since, started, or shut down
+                try:
+                    entry.response_helper.progress(
+                        0, f'Waiting in queue (position {position})')
+                except Exception:
+                    logger.warning('Failed to report a queue position for %s', self.name)
+
+    def _flush_reports(self, timeout=None):
+        """Wait until every queue position handed to the reporter is sent."""
+        with self._reporting:
+            return self._reporting.wait_for(
+                lambda: not self._reports and not self._sending, timeout)
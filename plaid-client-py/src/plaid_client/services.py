@@ -7,14 +7,15 @@ synchronous GET. Work requests are addressed: a service receives them on its
 channel and reports back via plain POSTs that the server relays to the one
 waiting requester.
 """
-import json
 import logging
 import threading
 import urllib.parse
 
 import requests
 
-from plaid_client.sse import abort_response
+from plaid_client.codec import dumps, loads
+from plaid_client.service_pool import ServiceMetrics
+from plaid_client.sse import SSE_CONNECT_TIMEOUT_S, ResumePoint, abort_response
 from plaid_client.transforms import transform_request, transform_response
 
 logger = logging.getLogger(__name__)
@@ -55,11 +56,18 @@ class ServiceRegistration:
     Holds the inbound request channel (SSE) the service receives work on.
     Holding that channel open IS the registration — there is no separate
     registry entry or heartbeat. A supervisor thread reopens the channel if it
-    drops (e.g. the server restarted), so the service self-heals.
+    drops (e.g. the server restarted), so the service self-heals. Channels of an
+    :class:`~plaid_client.sse_mux.SSEMultiplexer` reopen themselves, without a
+    supervisor thread.
 
     Attributes:
         service_info: The registered metadata
             (service_id, service_name, description, extras).
+        metrics: :class:`~plaid_client.service_pool.ServiceMetrics` for the
+            requests received on this project: how many were accepted or
+            turned away as busy, and their queue-wait and service times.
+            Recorded by the worker pool of a
+            :class:`~plaid_client.service.BaseService`.
     """
 
     def __init__(self, service_info, connection, client=None, project_id=None,
@@ -73,6 +81,7 @@ class ServiceRegistration:
         self._running = True
         self._stop_event = threading.Event()
         self._supervisor_thread = None
+        self.metrics = ServiceMetrics()
 
     def _start_supervisor(self, check_interval_s=3.0):
         """Spawn a daemon thread that reopens the request channel if it drops
@@ -118,16 +127,18 @@ class ServiceRegistration:
         return self._running
 
 
-def serve(client, project_id, service_info, on_service_request, extras=None):
+def serve(client, project_id, service_info, on_service_request, extras=None, mux=None):
     """Register a service and handle incoming work requests.
 
     Opens the service's dedicated request channel — which registers it for
     discovery (presence = open channel) — and handles work on it. For each
     request, runs
     ``on_service_request(data, response_helper)`` where ``response_helper`` has
-    ``progress(percent, msg)`` / ``complete(data)`` / ``error(err)``. The
-    handler runs synchronously on the channel's reader thread (one request at a
-    time), matching the previous behavior.
+    ``progress(percent, msg)`` / ``complete(data)`` / ``error(err)``, and
+    ``project_id`` / ``request_id`` / ``metrics`` (the registration's)
+    attributes. The handler runs synchronously on the channel's reader thread
+    (one request at a time); :class:`~plaid_client.service.BaseService` hands
+    requests on to its worker pool from there.
 
     Args:
         client: PlaidClient instance.
@@ -135,6 +146,11 @@ def serve(client, project_id, service_info, on_service_request, extras=None):
         service_info: Dict with service_id, service_name, description.
         on_service_request: Handler callback (data, response_helper).
         extras: Optional additional metadata.
+        mux: An :class:`~plaid_client.sse_mux.SSEMultiplexer` to read the
+            channel on, instead of a reader thread and a supervisor thread of
+            its own. The handler then runs on the multiplexer's callback pool.
+            The first connect is awaited (up to ``SSE_CONNECT_TIMEOUT_S``),
+            and its failure raises as it does without a multiplexer.
 
     Returns:
         A ServiceRegistration with stop() and is_running().
@@ -155,14 +171,21 @@ def serve(client, project_id, service_info, on_service_request, extras=None):
     # they round-trip like the rest of the API.
     params = {'service-name': service_name, 'description': description}
     if extras:
-        params['extras'] = json.dumps(transform_request(extras))
+        params['extras'] = dumps(transform_request(extras)).decode('utf-8')
     query = urllib.parse.urlencode({k: v for k, v in params.items() if v})
     channel_path = f'/api/v1/projects/{project_id}/services/{service_id}/requests'
     if query:
         channel_path = f'{channel_path}?{query}'
 
+    # Carried across reopened channels, so a server that numbers its events
+    # can replay what was sent while the channel was down.
+    resume = ResumePoint()
+
     def open_channel():
-        return client.messages.listen(project_id, on_event, path=channel_path)
+        if mux is not None:
+            return mux.open(client, project_id, on_event, path=channel_path, name=service_id,
+                            resume=resume)
+        return client.messages.listen(project_id, on_event, path=channel_path, resume=resume)
 
     def on_event(event_type, event_data):
         if not registration._running:
@@ -204,6 +227,11 @@ def serve(client, project_id, service_info, on_service_request, extras=None):
                     logger.warning('Failed to send error message')
 
         helper = ResponseHelper()
+        # Where the request came from (BaseService's worker pool queues fairly
+        # per project and records timings in the registration's metrics).
+        helper.project_id = project_id
+        helper.request_id = req_id
+        helper.metrics = registration.metrics
         try:
             on_service_request(req_data, helper)
         except Exception as e:
@@ -216,9 +244,21 @@ def serve(client, project_id, service_info, on_service_request, extras=None):
     except Exception as e:
         raise RuntimeError(f'Failed to open service channel: {e}')
 
+    # A multiplexed channel connects on the multiplexer's loop and retries
+    # there, so a rejected registration (e.g. a 409) would otherwise only be
+    # logged. Wait for its first attempt and fail the way a direct open does;
+    # one still pending after the connect timeout carries on in the
+    # background (see ``MuxChannel.last_error``).
+    if mux is not None and not connection.wait_open(SSE_CONNECT_TIMEOUT_S):
+        error = connection.last_error
+        if error is not None:
+            connection.close()
+            raise RuntimeError(f'Failed to open service channel: {error}')
+
     registration._connection = connection
-    registration._open_channel = open_channel
-    registration._start_supervisor()
+    if mux is None:
+        registration._open_channel = open_channel
+        registration._start_supervisor()
     return registration
 
 
@@ -240,7 +280,13 @@ def request_service(client, project_id, service_id, data, timeout=10.0, on_progr
     }
     body = transform_request(data) if data is not None else None
     try:
-        resp = requests.post(url, headers=headers, json=body, stream=True, timeout=(10, None))
+        # Like the SSE streams, this response is held open for the whole
+        # service run, so it bypasses the client's pooled session: holding a
+        # pool slot that long would starve ordinary API calls (and block them
+        # outright under ``pool_block``).
+        resp = requests.post(url, headers=headers,
+                             data=dumps(body) if body is not None else None, stream=True,
+                             timeout=(10, None))
     except Exception as e:
         raise RuntimeError(f'Failed to submit service request: {e}')
 
@@ -273,7 +319,7 @@ def request_service(client, project_id, service_id, data, timeout=10.0, on_progr
                 elif line.startswith('data: '):
                     data_buf = line[6:]
                 elif line == '' and event_type and data_buf:
-                    payload = transform_response(json.loads(data_buf))
+                    payload = transform_response(loads(data_buf))
                     if event_type == 'progress':
                         if on_progress:
                             try:
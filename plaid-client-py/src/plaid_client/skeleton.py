@@ -0,0 +1,141 @@
+"""Skeleton document reads: texts and bare token offsets, without annotations.
+
+``documents.get(include_body=True)`` returns everything in a document — every
+span, relation and vocab link on every layer — which on an annotated document is
+most of the payload. Tokenizers and parsers often need only the text and the
+token offsets of two or three layers. :func:`fetch_skeleton` reads exactly that
+through the query endpoint:
+
+* the texts, as one ``text`` entity query;
+* the tokens of the requested layers, as one aggregate query grouped by the
+  token fields. Aggregate results are flat rows (no entity hydration), so the
+  response is just a list of short arrays.
+
+A query returns at most :data:`QUERY_ROW_LIMIT` rows. When a layer holds more,
+the token query is split by ``begin`` offset ranges until every range fits.
+
+With ``tables=True`` each layer is returned as a
+:class:`~plaid_client.tables.TokenTable` built straight from the rows, so no
+per-token dicts are kept at all.
+"""
+
+from plaid_client.tables import TokenTable
+
+#: Row cap of a single query response (the server's hard cap).
+QUERY_ROW_LIMIT = 100000
+
+# Token fields every skeleton row carries, in row order (after the layer id).
+_TOKEN_FIELDS = ('id', 'begin', 'end', 'precedence')
+
+
+def _token_query(document_id, layer_ids, metadata_keys, lo, hi):
+    where = [['token', '?t', {'doc': document_id}],
+             ['in', '?t.layer', list(layer_ids)]]
+    if lo is not None:
+        where.append(['>=', '?t.begin', lo])
+    if hi is not None:
+        where.append(['<', '?t.begin', hi])
+    body = {'where': where, 'limit': QUERY_ROW_LIMIT}
+    if metadata_keys is True:
+        body['find'] = ['?t']
+        body['return'] = 'entities'
+    else:
+        group = ['?t.layer'] + [f'?t.{f}' for f in _TOKEN_FIELDS]
+        group += [f'?t.metadata.{key}' for key in metadata_keys]
+        body['return'] = {'group': group, 'aggregates': [['count']]}
+    return body
+
+
+def _rows_to_tokens(rows, metadata_keys):
+    if metadata_keys is True:
+        for (entity,) in rows:
+            token = {f: entity.get(f) for f in _TOKEN_FIELDS}
+            token['metadata'] = entity.get('metadata') or {}
+            yield entity.get('layer'), token
+        return
+    width = len(_TOKEN_FIELDS)
+    for row in rows:
+        token = dict(zip(_TOKEN_FIELDS, row[1:1 + width]))
+        if metadata_keys:
+            values = row[1 + width:1 + width + len(metadata_keys)]
+            token['metadata'] = {k: v for k, v in zip(metadata_keys, values) if v is not None}
+        yield row[0], token
+
+
+def _split(rows, metadata_keys, lo, hi):
+    """Offset ranges covering ``[lo, hi)`` split around the median ``begin`` of
+    a truncated result (a sample of the range's tokens)."""
+    if metadata_keys is True:
+        begins = sorted(entity.get('begin') for (entity,) in rows)
+    else:
+        begins = sorted(row[2] for row in rows)
+    mid = begins[len(begins) // 2]
+    if begins[0] < mid:
+        return [(lo, mid), (mid, hi)]
+    # At least half the sample begins at one offset: isolate it.
+    if lo == mid and hi == mid + 1:
+        raise RuntimeError(
+            f'More than {QUERY_ROW_LIMIT} tokens begin at offset {mid}; '
+            'fetch this document with documents.get(include_body=True)')
+    ranges = [(mid, mid + 1)]
+    if lo is None or lo < mid:
+        ranges.append((lo, mid))
+    if hi is None or hi > mid + 1:
+        ranges.append((mid + 1, hi))
+    return ranges
+
+
+def fetch_skeleton(client, document_id, token_layer_ids, *, text_layer_ids=None,
+                   metadata=None, tables=False):
+    """Read a document's texts and the bare tokens of some token layers.
+
+    See :meth:`DocumentsResource.get_skeleton`.
+    """
+    if client.is_batching:
+        raise RuntimeError('Cannot fetch a document skeleton inside a batch: it runs '
+                           'queries whose results are needed to build the answer.')
+    if metadata is True:
+        metadata_keys = True
+    else:
+        metadata_keys = list(metadata or ())
+        for key in metadata_keys:
+            if not key or '.' in key:
+                raise ValueError(f'Invalid metadata key {key!r} (keys may not contain ".")')
+
+    texts = {}
+    if text_layer_ids is None or text_layer_ids:
+        wanted = None if text_layer_ids is None else set(text_layer_ids)
+        result = client.query({'find': ['?x'],
+                               'where': [['text', '?x', {'doc': document_id}]],
+                               'return': 'entities'}, raw=False)
+        for (text,) in result.get('results') or []:
+            if wanted is None or text.get('layer') in wanted:
+                texts[text.get('layer')] = text
+
+    if tables:
+        # One column list per token field (plus metadata), per layer.
+        layers = {layer_id: ([], [], [], [], []) for layer_id in token_layer_ids}
+    else:
+        layers = {layer_id: [] for layer_id in token_layer_ids}
+    ranges = [(None, None)] if layers else []
+    while ranges:
+        lo, hi = ranges.pop()
+        result = client.query(_token_query(document_id, layers, metadata_keys, lo, hi), raw=False)
+        rows = result.get('results') or []
+        if result.get('truncated'):
+            ranges.extend(_split(rows, metadata_keys, lo, hi))
+            continue
+        for layer_id, token in _rows_to_tokens(rows, metadata_keys):
+            if tables:
+                for column, field in zip(layers[layer_id], _TOKEN_FIELDS):
+                    column.append(token[field])
+                layers[layer_id][4].append(token.get('metadata'))
+            else:
+                layers[layer_id].append(token)
+    if tables:
+        layers = {layer_id: TokenTable.from_columns(*columns, layer=layer_id)
+                  for layer_id, columns in layers.items()}
+    else:
+        for tokens in layers.values():
+            tokens.sort(key=lambda t: (t['begin'], t['end']))
+    return {'texts': texts, 'token_layers': layers}
@@ -1,11 +1,16 @@
-import json
 import logging
 import socket
 import threading
 import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+from urllib.parse import urlencode
 
 import requests
 
+from plaid_client.codec import dumps, loads
+from plaid_client.http import DEFAULT_TIMEOUT_S
 from plaid_client.transforms import transform_response
 
 logger = logging.getLogger(__name__)
@@ -25,6 +30,307 @@ logger = logging.getLogger(__name__)
 SSE_READ_TIMEOUT_S = 60.0
 SSE_CONNECT_TIMEOUT_S = 10.0
 
+# Bytes read per step of a streamed response (what ``iter_lines`` reads).
+SSE_CHUNK_SIZE = 512
+
+_BOM = b'\xef\xbb\xbf'
+
+
+class SSEEvent(NamedTuple):
+    """One dispatched server-sent event."""
+
+    #: The ``event:`` field, ``'message'`` when the event has none.
+    event: str
+    #: The ``data:`` lines, joined with newlines.
+    data: str
+    #: The stream's last event id when the event was dispatched (the latest
+    #: ``id:`` field so far; ``''`` before any).
+    id: str
+
+
+class SSEParser:
+    """Incremental ``text/event-stream`` parser.
+
+    Feed it the response body in whatever pieces it arrives in; :meth:`feed`
+    returns the events completed by each piece. Follows the WHATWG rules:
+    lines end in CRLF, LF or CR (also when split across pieces), ``:`` starts
+    a comment, several ``data:`` lines make one multi-line value, ``id:`` sets
+    the last event id (which persists across events) and ``retry:`` the
+    reconnection delay the server asks for. An event is dispatched at a blank
+    line, and only if it has data.
+
+    The pending bytes live in one ``bytearray``: lines are located with
+    ``find`` and decoded straight from a ``memoryview`` of it, so no piece is
+    copied into per-line ``bytes`` objects, and the bytes already scanned of a
+    long, unfinished line are not scanned again.
+
+    Attributes:
+        last_event_id: The latest ``id:`` value (``''`` before any); what a
+            reconnecting client sends as ``Last-Event-ID``.
+        retry: The latest ``retry:`` value in milliseconds, or ``None``.
+    """
+
+    def __init__(self, last_event_id=''):
+        self.last_event_id = last_event_id
+        self.retry: Optional[int] = None
+        self._buf = bytearray()
+        self._scanned = 0     # bytes at the start of _buf known to hold no line end
+        self._skip_lf = False  # the previous piece ended in CR: drop a leading LF
+        self._started = False
+        self._event = ''
+        self._data = []
+
+    def feed(self, data) -> list:
+        """Parse the next piece of the body; returns the completed
+        :class:`SSEEvent` s."""
+        buf = self._buf
+        buf += data
+        end = len(buf)
+        pos = 0
+        if not self._started:
+            if end < len(_BOM) and _BOM.startswith(bytes(buf)):
+                return []
+            self._started = True
+            if buf.startswith(_BOM):
+                pos = len(_BOM)
+        if self._skip_lf and pos < end:
+            self._skip_lf = False
+            if buf[pos] == 0x0A:
+                pos += 1
+        events = []
+        with memoryview(buf) as view:
+            while pos < end:
+                search = max(pos, self._scanned)
+                lf = buf.find(b'\n', search)
+                cr = buf.find(b'\r', search, end if lf == -1 else lf)
+                if cr != -1:
+                    line_end, pos_next = cr, cr + 1
+                    if pos_next == end:
+                        self._skip_lf = True
+                    elif buf[pos_next] == 0x0A:
+                        pos_next += 1
+                elif lf != -1:
+                    line_end, pos_next = lf, lf + 1
+                else:
+                    self._scanned = end - pos
+                    break
+                self._scanned = 0
+                self._line(buf, view, pos, line_end, events)
+                pos = pos_next
+            else:
+                self._scanned = 0
+        del buf[:pos]
+        return events
+
+    def _line(self, buf, view, start, end, events):
+        if start == end:
+            if self._data:
+                events.append(SSEEvent(self._event or 'message', '\n'.join(self._data),
+                                       self.last_event_id))
+            self._event = ''
+            self._data = []
+            return
+        if buf[start] == 0x3A:  # ':' comment, e.g. a keepalive
+            return
+        colon = buf.find(b':', start, end)
+        if colon == -1:
+            field, value = str(view[start:end], 'utf-8', 'replace'), ''
+        else:
+            field = str(view[start:colon], 'utf-8', 'replace')
+            value_start = colon + 1
+            if value_start < end and buf[value_start] == 0x20:
+                value_start += 1
+            value = str(view[value_start:end], 'utf-8', 'replace')
+        if field == 'data':
+            self._data.append(value)
+        elif field == 'event':
+            self._event = value
+        elif field == 'id':
+            if '\0' not in value:
+                self.last_event_id = value
+        elif field == 'retry':
+            if value.isascii() and value.isdigit():
+                self.retry = int(value)
+
+
+# How far before the last audit event seen a catch-up read starts. An event's
+# ``time`` is stamped when it is published, a little after the operation's
+# own audit-log timestamp, so concurrent writes can be logged slightly out of
+# publish order; the overlap is re-read and dropped as duplicates.
+CATCH_UP_OVERLAP_S = 5.0
+
+
+def _format_time(when):
+    return when.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _shift_time(stamp, seconds):
+    try:
+        when = datetime.fromisoformat(str(stamp).replace('Z', '+00:00'))
+    except ValueError:
+        return stamp
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return _format_time(when + timedelta(seconds=seconds))
+
+
+def _audit_since(client, project_id, start_time):
+    """The project's audit entries from ``start_time`` on, oldest first, in
+    the server's keys. Read page by page straight off ``client.session``, like
+    heartbeats: the resource methods queue (or refuse) requests while the
+    client is in batch mode, and a catch-up must not wait for the batch."""
+    base = f'{client.base_url}/api/v1/projects/{project_id}/audit'
+    headers = {'Authorization': f'Bearer {client.token}'}
+    entries, cursor = [], None
+    while True:
+        query = {'start-time': start_time, 'limit': 1000}
+        if cursor is not None:
+            query['cursor'] = cursor
+        resp = client.session.get(f'{base}?{urlencode(query)}', headers=headers,
+                                  timeout=getattr(client, 'timeout', DEFAULT_TIMEOUT_S))
+        resp.raise_for_status()
+        page = loads(resp.content)
+        if not isinstance(page, dict):  # unpaginated server
+            return entries + list(page)
+        entries += page.get('entries') or []
+        prev_cursor, cursor = cursor, page.get('next-cursor')
+        if cursor is None:
+            return entries
+        if cursor == prev_cursor:
+            raise RuntimeError('Pagination cursor did not advance; aborting to avoid an '
+                               'infinite loop.')
+
+
+def _record_id(value):
+    """The id of an enriched ``{id, name}`` record; other values unchanged."""
+    return value.get('id') if isinstance(value, dict) else value
+
+
+def _live_op_type(op_type):
+    """A stored op type (``token-layer/create``) as live events spell it
+    (``token_layer:create``; the server's ``op-type-to-string``)."""
+    if not isinstance(op_type, str) or '/' not in op_type:
+        return op_type
+    ns_part, _, name = op_type.lstrip(':').partition('/')
+    return f"{ns_part.replace('-', '_')}:{name.replace('-', '_')}"
+
+
+def _live_audit_entry(entry):
+    """A transformed audit-endpoint entry in the shape of a live ``audit-log``
+    event: op types as ``ns_part:name`` and the enriched user, project and
+    document records replaced by their ids."""
+    entry = dict(entry)
+    for key in ('projects', 'documents'):
+        if isinstance(entry.get(key), list):
+            entry[key] = [_record_id(record) for record in entry[key]]
+    if 'user' in entry:
+        entry['user'] = _record_id(entry['user'])
+    if isinstance(entry.get('ops'), list):
+        ops = []
+        for op in entry['ops']:
+            if isinstance(op, dict):
+                op = {key: _record_id(value) if key in ('project', 'document') else value
+                      for key, value in op.items()}
+                op['type'] = _live_op_type(op.get('type'))
+            ops.append(op)
+        entry['ops'] = ops
+    return entry
+
+
+class ResumePoint:
+    """Where a project stream left off, carried from one connection to the next.
+
+    Pass the same instance to each (re)opened stream — ``listen(...,
+    resume=point)``; service registrations and multiplexer channels keep one
+    of their own. Each connection then picks up where the last one stopped:
+
+    * If the server numbers its events (``id:``), the last id is sent as
+      ``Last-Event-ID`` and the server replays what was missed.
+    * Otherwise, on the ``/listen`` bus, the connection first reads the
+      project audit log from the last audit event's ``time`` (less
+      :data:`CATCH_UP_OVERLAP_S`) and delivers the entries missed as
+      ``audit-log`` events, oldest first, before any live event.
+      Audit ids already delivered are dropped, so overlap and races with the
+      live stream produce no duplicates. The read goes straight to the
+      session, so it also runs while the client is in batch mode.
+
+    Catch-up entries are brought into the live events' shape (op types such
+    as ``token_layer:create``; ``user``, ``projects``, ``documents`` and each
+    op's ``project`` / ``document`` as ids), but the audit log stores one
+    document per op: the other documents whose version an operation bumped,
+    which a live event lists in ``documents``, cannot be recovered. Code that
+    tracks document versions should re-read a document named by an op rather
+    than rely on ``documents`` being complete after a catch-up.
+
+    If the catch-up read fails, the point is :meth:`reset` and the connection
+    closes, exactly like a drop with nothing to resume from.
+
+    Attributes:
+        last_event_id: The last ``id:`` the server sent (``''`` if none).
+        last_event_time: The ``time`` of the last audit event delivered, or
+            when the first connection opened (client clock) before any.
+        catch_ups: How many catch-up reads have run.
+    """
+
+    def __init__(self, *, history=1000):
+        self._history = deque(maxlen=history)
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the position; the next connection starts afresh."""
+        with self._lock:
+            self.last_event_id = ''
+            self.last_event_time = None
+            self.catch_ups = 0
+            self._history.clear()
+            self._seen.clear()
+
+    @property
+    def resumable(self):
+        """Whether a connection opened now would resume rather than start afresh."""
+        return bool(self.last_event_id) or self.last_event_time is not None
+
+    def _opened(self):
+        """A connection is opening. Returns the ``start_time`` to catch up
+        from, or ``None`` when there is nothing to catch up on (the first
+        connection, or a server that replays by id)."""
+        with self._lock:
+            if self.last_event_id:
+                return None
+            if self.last_event_time is None:
+                self.last_event_time = _format_time(datetime.now(timezone.utc))
+                return None
+            return _shift_time(self.last_event_time, -CATCH_UP_OVERLAP_S)
+
+    def _catch_up(self, client, project_id, start_time):
+        """The audit entries since ``start_time`` not yet delivered."""
+        entries = [_live_audit_entry(transform_response(entry))
+                   for entry in _audit_since(client, project_id, start_time)]
+        with self._lock:
+            self.catch_ups += 1
+        return [entry for entry in entries if self._record('audit-log', entry)]
+
+    def _record(self, event_type, data, event_id=None):
+        """Note a delivered event; ``False`` if it is a duplicate audit event."""
+        with self._lock:
+            if event_id:
+                self.last_event_id = event_id
+            if event_type != 'audit-log' or not isinstance(data, dict):
+                return True
+            audit_id = data.get('id')
+            if audit_id is not None:
+                if audit_id in self._seen:
+                    return False
+                if len(self._history) == self._history.maxlen:
+                    self._seen.discard(self._history[0])
+                self._history.append(audit_id)
+                self._seen.add(audit_id)
+            if data.get('time') is not None:
+                self.last_event_time = data['time']
+            return True
+
 
 def abort_response(resp):
     """Shut down the TCP socket under a streaming `requests` response so a
@@ -36,7 +342,13 @@ def abort_response(resp):
     The socket's location inside urllib3 varies by version, so probe the known
     shapes (``raw._connection.sock`` then ``raw._fp.fp.raw._sock``) and fall
     back silently. Used by both SSEConnection.close() and the streaming
-    request_service() reader."""
+    request_service() reader. A response of the httpx transport has no
+    urllib3 ``raw``; its own ``abort()`` is called instead (see
+    :meth:`~plaid_client.transport.HTTPXResponse.abort`)."""
+    abort = getattr(resp, 'abort', None)
+    if abort is not None:
+        abort()
+        return
     raw = getattr(resp, 'raw', None)
     if raw is None:
         return
@@ -53,6 +365,23 @@ def abort_response(resp):
         pass
 
 
+def send_heartbeat(client, project_id, client_id):
+    """Confirm a /listen heartbeat for ``client_id`` (best effort). The server
+    drops a /listen client that stops confirming."""
+    try:
+        client.session.post(
+            f'{client.base_url}/api/v1/projects/{project_id}/heartbeat',
+            headers={
+                'Authorization': f'Bearer {client.token}',
+                'Content-Type': 'application/json',
+            },
+            data=dumps({'client-id': client_id}),
+            timeout=10,
+        )
+    except Exception:
+        pass
+
+
 class SSEConnection:
     """SSE connection to the listen endpoint using streaming requests.
 
@@ -63,12 +392,16 @@ class SSEConnection:
         client: PlaidClient instance.
         project_id: Project UUID.
         on_event: Callback (event_type, data). Return True to stop.
+        path: Stream path (default: the project ``/listen`` bus).
+        resume: Optional :class:`ResumePoint` to continue from, updated as
+            events arrive. ``ready_state`` turns OPEN only once any catch-up
+            has been delivered.
 
     The ``ready_state`` property mirrors the JS readyState values:
     0 (CONNECTING), 1 (OPEN), 2 (CLOSED).
     """
 
-    def __init__(self, client, project_id, on_event, path=None):
+    def __init__(self, client, project_id, on_event, path=None, resume=None):
         self._start_time = time.time()
         self._is_connected = False
         self._is_closed = False
@@ -86,6 +419,7 @@ class SSEConnection:
         # /listen stream emits `heartbeat` events needing a POST confirmation —
         # other streams keep themselves alive with ignored SSE comments.
         self._path = path or f'/api/v1/projects/{project_id}/listen'
+        self._resume = resume
 
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
@@ -132,18 +466,54 @@ class SSEConnection:
     def _send_heartbeat(self):
         if not self._client_id or self._is_closed:
             return
+        send_heartbeat(self._client, self._project_id, self._client_id)
+
+    def _handle(self, event):
+        """Act on one event; returns True once the callback asked to stop."""
+        event_type = event.event
         try:
-            requests.post(
-                f'{self._client.base_url}/api/v1/projects/{self._project_id}/heartbeat',
-                headers={
-                    'Authorization': f'Bearer {self._client.token}',
-                    'Content-Type': 'application/json',
-                },
-                json={'client-id': self._client_id},
-                timeout=10,
-            )
-        except Exception:
-            pass
+            self._event_stats[event_type] = self._event_stats.get(event_type, 0) + 1
+
+            if event_type == 'connected':
+                parsed = loads(event.data)
+                self._client_id = parsed.get('client-id') or parsed.get('clientId')
+            elif event_type == 'heartbeat':
+                threading.Thread(target=self._send_heartbeat, daemon=True).start()
+            else:
+                data = transform_response(loads(event.data))
+                if self._resume is not None and not self._resume._record(
+                        event_type, data, event.id):
+                    return False
+                return self._deliver(event_type, data)
+        except Exception as e:
+            logger.warning('Failed to parse SSE event data: %s', e)
+        return False
+
+    def _deliver(self, event_type, data):
+        if self._on_event(event_type, data) is True:
+            self.close()
+            return True
+        return False
+
+    def _catch_up(self):
+        """Deliver what the server can't replay; returns True once the
+        callback asked to stop. See :class:`ResumePoint`."""
+        start_time = self._resume._opened()
+        if start_time is None or self._path != f'/api/v1/projects/{self._project_id}/listen':
+            return False
+        try:
+            entries = self._resume._catch_up(self._client, self._project_id, start_time)
+        except Exception as e:
+            logger.warning('SSE catch-up from %s failed: %s; starting afresh', start_time, e)
+            self._resume.reset()
+            self.close()
+            return True
+        if entries:
+            logger.info('SSE catch-up delivered %d missed audit events', len(entries))
+        for entry in entries:
+            if self._deliver('audit-log', entry):
+                return True
+        return False
 
     def _run(self):
         try:
@@ -153,53 +523,36 @@ class SSEConnection:
                 'Accept': 'text/event-stream',
                 'Cache-Control': 'no-cache',
             }
+            if self._resume is not None and self._resume.last_event_id:
+                headers['Last-Event-ID'] = self._resume.last_event_id
 
             # Finite read timeout so a silently-dropped stream is detected (see
             # SSE_READ_TIMEOUT_S) instead of blocking forever; finite connect
             # timeout so a reconnect to a not-yet-ready server fails fast and
-            # retries rather than wedging.
+            # retries rather than wedging. The stream deliberately bypasses
+            # the client's pooled session: it holds its connection for the
+            # life of the channel, which would permanently pin a pool slot
+            # (and starve a ``pool_block`` pool). Heartbeat POSTs do reuse it.
             self._response = requests.get(
                 url, headers=headers, stream=True,
                 timeout=(SSE_CONNECT_TIMEOUT_S, SSE_READ_TIMEOUT_S))
             self._response.raise_for_status()
 
+            # Events arriving meanwhile wait in the socket, so a catch-up
+            # read is delivered in order ahead of them.
+            if self._resume is not None and self._catch_up():
+                return
+
             self._is_connected = True
             self._ready_state = 1  # OPEN
 
-            event_type = ''
-            data = ''
-
-            for line in self._response.iter_lines(decode_unicode=True):
+            parser = SSEParser(self._resume.last_event_id if self._resume is not None else '')
+            for chunk in self._response.iter_content(chunk_size=SSE_CHUNK_SIZE):
                 if self._stop_event.is_set():
                     break
-
-                if line is None:
-                    continue
-
-                if line.startswith('event: '):
-                    event_type = line[7:].strip()
-                elif line.startswith('data: '):
-                    data = line[6:]
-                elif line == '' and event_type and data:
-                    try:
-                        self._event_stats[event_type] = self._event_stats.get(event_type, 0) + 1
-
-                        if event_type == 'connected':
-                            parsed = json.loads(data)
-                            self._client_id = parsed.get('client-id') or parsed.get('clientId')
-                        elif event_type == 'heartbeat':
-                            threading.Thread(target=self._send_heartbeat, daemon=True).start()
-                        else:
-                            parsed = json.loads(data)
-                            should_stop = self._on_event(event_type, transform_response(parsed))
-                            if should_stop is True:
-                                self.close()
-                                return
-                    except Exception as e:
-                        logger.warning('Failed to parse SSE event data: %s', e)
-
-                    event_type = ''
-                    data = ''
+                for event in parser.feed(chunk):
+                    if self._handle(event):
+                        return
 
         except Exception as e:
             if not self._is_closed:
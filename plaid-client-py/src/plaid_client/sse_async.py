@@ -0,0 +1,242 @@
+"""Asyncio SSE client.
+
+:class:`AsyncSSEStream` reads one ``text/event-stream`` response on the running
+event loop and yields :class:`~plaid_client.sse.SSEEvent` s as they complete,
+parsed by the incremental :class:`~plaid_client.sse.SSEParser` (multi-line
+data, event ids, retry hints)::
+
+    async with AsyncSSEStream(url, headers) as stream:
+        async for event in stream:
+            print(event.event, event.data, event.id)
+
+:func:`listen` builds on it for the Plaid streams — the project ``/listen``
+bus by default, or a service channel by ``path`` — with the same handling as
+:class:`~plaid_client.sse.SSEConnection`: the ``connected`` client id is
+recorded, ``heartbeat`` events are confirmed, and every other event comes out
+as ``(event_type, data)`` with ``data`` decoded and transformed. It reconnects
+when the stream drops, after the server's ``retry:`` hint if it sent one, and
+resumes where it left off (see :class:`~plaid_client.sse.ResumePoint`)::
+
+    async for event_type, data in listen(client, project_id):
+        ...
+
+Any number of these share one event loop; that is what
+:class:`~plaid_client.sse_mux.SSEMultiplexer` runs its channels on.
+
+Responses are read over asyncio's own HTTP/1.1 connection (TLS for
+``https://`` URLs, chunked or read-to-EOF bodies); proxies configured for
+``requests`` are not used.
+"""
+
+import asyncio
+import logging
+import ssl
+import urllib.parse
+from types import SimpleNamespace
+
+import requests
+
+from plaid_client.codec import loads
+from plaid_client.sse import (SSE_CONNECT_TIMEOUT_S, SSE_READ_TIMEOUT_S, ResumePoint,
+                              SSEParser, send_heartbeat)
+from plaid_client.transforms import transform_response
+
+logger = logging.getLogger(__name__)
+
+#: Delay before reconnecting a dropped stream when the server sent no
+#: ``retry:`` hint; the registration supervisor's check interval.
+RECONNECT_INTERVAL_S = 3.0
+
+# Most bytes taken from the socket per read.
+_READ_SIZE = 65536
+
+
+async def open_stream(url, headers, *, read_timeout=SSE_READ_TIMEOUT_S):
+    """Send ``GET url`` and read the response head.
+
+    Returns ``(reader, writer, chunked)``. Raises ``requests.HTTPError`` (with
+    ``response.status_code``) for a non-2xx status, like
+    ``raise_for_status`` on the sync path.
+    """
+    parts = urllib.parse.urlsplit(url)
+    secure = parts.scheme == 'https'
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, parts.port or (443 if secure else 80),
+                                ssl=ssl.create_default_context() if secure else None),
+        SSE_CONNECT_TIMEOUT_S)
+    try:
+        target = parts.path + (f'?{parts.query}' if parts.query else '')
+        head = [f'GET {target} HTTP/1.1', f'Host: {parts.netloc.rpartition("@")[2]}',
+                'Accept-Encoding: identity']
+        head += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+        status_line = await asyncio.wait_for(reader.readline(), read_timeout)
+        _version, status, reason = (status_line.decode('latin-1').strip().split(' ', 2)
+                                    + ['', ''])[:3]
+        response_headers = {}
+        while True:
+            line = (await asyncio.wait_for(reader.readline(), read_timeout)).strip()
+            if not line:
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+        if not status.isdigit() or not 200 <= int(status) < 300:
+            code = int(status) if status.isdigit() else 0
+            raise requests.HTTPError(f'{status} {reason} for url: {url}',
+                                     response=SimpleNamespace(status_code=code, reason=reason))
+        chunked = 'chunked' in response_headers.get('transfer-encoding', '').lower()
+        return reader, writer, chunked
+    except BaseException:
+        writer.close()
+        raise
+
+
+async def iter_body(reader, chunked, *, read_timeout=SSE_READ_TIMEOUT_S):
+    """The response body as it arrives, chunked or read to EOF. Raises
+    ``asyncio.TimeoutError`` when nothing arrives for ``read_timeout``."""
+    if not chunked:
+        while True:
+            data = await asyncio.wait_for(reader.read(_READ_SIZE), read_timeout)
+            if not data:
+                return
+            yield data
+    while True:
+        size_line = await asyncio.wait_for(reader.readline(), read_timeout)
+        if not size_line:
+            return
+        size = int(size_line.split(b';', 1)[0], 16)
+        if size == 0:
+            return
+        # Large chunks are passed on as they arrive rather than whole.
+        while size:
+            data = await asyncio.wait_for(reader.read(min(size, _READ_SIZE)), read_timeout)
+            if not data:
+                raise asyncio.IncompleteReadError(b'', size)
+            size -= len(data)
+            yield data
+        await asyncio.wait_for(reader.readexactly(2), read_timeout)  # chunk's CRLF
+
+
+class AsyncSSEStream:
+    """One SSE response as an async iterator of :class:`~plaid_client.sse.SSEEvent`.
+
+    Args:
+        url: The stream URL.
+        headers: Request headers (``Accept: text/event-stream`` is added).
+        read_timeout: Give up (``asyncio.TimeoutError``) when nothing, not
+            even a keepalive comment, arrives for this many seconds.
+        last_event_id: Resume after this event id: sent as ``Last-Event-ID``
+            and kept as the parser's last id until the server sends another.
+
+    Attributes:
+        parser: The stream's :class:`~plaid_client.sse.SSEParser`; its
+            ``last_event_id`` and ``retry`` carry over to a reconnect.
+    """
+
+    def __init__(self, url, headers=None, *, read_timeout=SSE_READ_TIMEOUT_S,
+                 last_event_id=None):
+        self.url = url
+        self.headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache',
+                        **(headers or {})}
+        if last_event_id:
+            self.headers['Last-Event-ID'] = last_event_id
+        self.read_timeout = read_timeout
+        self.parser = SSEParser(last_event_id or '')
+        self._reader = self._writer = None
+        self._chunked = False
+
+    async def open(self):
+        """Connect and read the response head (``async with`` does this)."""
+        self._reader, self._writer, self._chunked = await open_stream(
+            self.url, self.headers, read_timeout=self.read_timeout)
+        return self
+
+    async def aclose(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def __aiter__(self):
+        if self._reader is None:
+            await self.open()
+        async for data in iter_body(self._reader, self._chunked,
+                                    read_timeout=self.read_timeout):
+            for event in self.parser.feed(data):
+                yield event
+
+
+async def listen(client, project_id, *, path=None, reconnect=True, resume=None):
+    """Async iterator of ``(event_type, data)`` from a project stream.
+
+    Args:
+        client: PlaidClient instance (its ``base_url`` and ``token``).
+        project_id: Project UUID.
+        path: Stream path under the base URL; defaults to the project
+            ``/listen`` bus. Service channels pass their own path.
+        reconnect: Reopen the stream when it drops (after the server's
+            ``retry:`` hint, else :data:`RECONNECT_INTERVAL_S`) instead of
+            ending. Non-2xx answers are retried too.
+        resume: The :class:`~plaid_client.sse.ResumePoint` to continue from
+            and keep up to date. Each reconnect resumes from it (by
+            ``Last-Event-ID``, or by an audit-log catch-up on the ``/listen``
+            bus); by default the iterator keeps one of its own. If a
+            catch-up read fails, the point is reset and the iterator ends.
+    """
+    listen_path = f'/api/v1/projects/{project_id}/listen'
+    url = f'{client.base_url}{path or listen_path}'
+    headers = {'Authorization': f'Bearer {client.token}'}
+    resume = resume if resume is not None else ResumePoint()
+    retry = None
+    loop = asyncio.get_running_loop()
+    while True:
+        stream = AsyncSSEStream(url, headers, last_event_id=resume.last_event_id)
+        if retry is not None:
+            stream.parser.retry = retry
+        client_id = None
+        try:
+            async with stream:
+                start_time = resume._opened()
+                if start_time is not None and (path or listen_path) == listen_path:
+                    try:
+                        entries = await loop.run_in_executor(
+                            None, resume._catch_up, client, project_id, start_time)
+                    except Exception as e:
+                        logger.warning('SSE catch-up from %s failed: %s; starting afresh',
+                                       start_time, e)
+                        resume.reset()
+                        return
+                    for entry in entries:
+                        yield 'audit-log', entry
+                async for event in stream:
+                    if event.event == 'connected':
+                        parsed = loads(event.data)
+                        client_id = parsed.get('client-id') or parsed.get('clientId')
+                    elif event.event == 'heartbeat':
+                        if client_id:
+                            loop.run_in_executor(None, send_heartbeat, client, project_id,
+                                                 client_id)
+                    else:
+                        try:
+                            data = transform_response(loads(event.data))
+                        except Exception as e:
+                            logger.warning('Failed to parse SSE event data: %s', e)
+                            continue
+                        if resume._record(event.event, data, event.id):
+                            yield event.event, data
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                requests.HTTPError) as e:
+            if not reconnect:
+                raise
+            logger.warning('SSE connection error: %s; will retry', e)
+        if not reconnect:
+            return
+        retry = stream.parser.retry
+        await asyncio.sleep(RECONNECT_INTERVAL_S if retry is None else retry / 1000)
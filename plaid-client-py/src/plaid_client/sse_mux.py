@@ -0,0 +1,335 @@
+"""Many SSE channels driven from one event-loop thread.
+
+Each :class:`~plaid_client.sse.SSEConnection` reads its stream on a thread of
+its own, and each :class:`~plaid_client.services.ServiceRegistration` adds a
+supervisor thread to reopen it. A service serving every project of a large
+deployment (``--all``) therefore runs two threads per project.
+:class:`SSEMultiplexer` runs all of its channels as asyncio tasks on a single
+event-loop thread instead, so a channel costs one socket and a small
+:class:`MuxChannel` object::
+
+    mux = SSEMultiplexer()
+    registrations = [client.messages.serve(pid, info, handler, mux=mux)
+                     for pid in project_ids]
+    ...
+    mux.close()
+
+A :class:`MuxChannel` behaves like an ``SSEConnection`` (``ready_state``,
+``close``, ``get_stats``) and heals itself the way the registration supervisor
+heals a connection: when the stream drops it is reopened
+``reconnect_interval`` seconds later (or after the server's ``retry:`` hint),
+again and again until it is closed, with a 409 (another live instance holds
+the service id) logged and retried like any other failure. The latest failure
+is kept as ``last_error`` (also in ``get_stats``), and :meth:`MuxChannel.wait_open`
+waits out the first attempt, so a caller can still tell a registration that
+never got through from one that did. A reopened channel
+resumes where it left off (see :class:`~plaid_client.sse.ResumePoint`). Event
+callbacks run on a small shared thread pool, one at a time and in arrival
+order per channel, so a slow handler never stalls the loop that reads
+everyone else's streams. Heartbeat confirmations and catch-up reads have a
+pool of their own: handlers that keep every callback thread busy must not
+hold them up, or the server drops the listener and the catch-up it then
+needs waits behind the same handlers.
+
+The streams are read by :class:`~plaid_client.sse_async.AsyncSSEStream`, over
+asyncio's own HTTP/1.1 connection (TLS for ``https://`` URLs); proxies
+configured for ``requests`` are not used.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from plaid_client.codec import loads
+from plaid_client.sse import ResumePoint, send_heartbeat
+from plaid_client.sse_async import RECONNECT_INTERVAL_S, AsyncSSEStream
+from plaid_client.transforms import transform_response
+
+logger = logging.getLogger(__name__)
+
+class MuxChannel:
+    """One SSE stream of an :class:`SSEMultiplexer`; create with
+    :meth:`SSEMultiplexer.open`.
+
+    ``ready_state`` is 0 (CONNECTING) while connecting or waiting to reconnect,
+    1 (OPEN) while streaming and 2 (CLOSED) only once :meth:`close` was called
+    — a dropped stream is reopened, not given up. ``last_error`` is the
+    exception that ended the latest attempt to open or read the stream
+    (``None`` while it is open).
+    """
+
+    def __init__(self, mux, client, project_id, on_event, path=None, name=None, resume=None):
+        self._mux = mux
+        self._client = client
+        self._project_id = project_id
+        self._on_event = on_event
+        self._path = path or f'/api/v1/projects/{project_id}/listen'
+        self._name = name or self._path
+        self._resume = resume if resume is not None else ResumePoint()
+        self._start_time = time.time()
+        self._ready_state = 0  # CONNECTING
+        self._is_closed = False
+        self._client_id = None
+        self._connects = 0
+        self.last_error = None
+        # Set once the first attempt has either opened the stream or failed.
+        self._attempted = threading.Event()
+        self._event_stats = {'audit-log': 0, 'message': 0, 'heartbeat': 0, 'connected': 0, 'other': 0}
+        self._task = None
+        self._retry = None  # the server's ``retry:`` hint, in seconds
+        # Events waiting for the callback pool; drained in order by one task.
+        self._pending = deque()
+        self._dispatching = False
+        self._lock = threading.Lock()
+
+    @property
+    def ready_state(self):
+        """Current connection state: 0 CONNECTING, 1 OPEN, 2 CLOSED."""
+        return self._ready_state
+
+    def close(self):
+        """Close the channel for good and drop its stream. Safe from any thread."""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._ready_state = 2  # CLOSED
+        self._attempted.set()
+        self._mux._discard(self)
+
+    def wait_open(self, timeout=None):
+        """Wait until the first attempt to open the stream has succeeded or
+        failed (or ``timeout`` seconds passed); return whether it is open.
+        After a failure, ``last_error`` says why; the channel keeps retrying
+        until it is closed."""
+        self._attempted.wait(timeout)
+        return self._ready_state == 1
+
+    def get_stats(self):
+        """Return connection statistics, as ``SSEConnection.get_stats`` does,
+        plus ``reconnects``: how often the stream was reopened, and
+        ``last_error``: why the latest attempt failed (``None`` while open)."""
+        return {
+            'duration_seconds': time.time() - self._start_time,
+            'is_connected': self._ready_state == 1,
+            'is_closed': self._is_closed,
+            'client_id': self._client_id,
+            'events': dict(self._event_stats),
+            'ready_state': self._ready_state,
+            'reconnects': max(0, self._connects - 1),
+            'last_error': None if self.last_error is None else str(self.last_error),
+        }
+
+    # --- event loop side ----------------------------------------------------
+
+    async def _run(self):
+        attempt = 0
+        while not self._is_closed:
+            if attempt:
+                await asyncio.sleep(self._mux.reconnect_interval if self._retry is None
+                                    else self._retry)
+                if self._is_closed:
+                    break
+            attempt += 1
+            try:
+                await self._stream(reconnect=attempt > 1)
+            except asyncio.CancelledError:
+                raise
+            except requests.HTTPError as e:
+                self._failed(e)
+                if e.response.status_code == 409:
+                    logger.warning('Service registration rejected (409): another instance '
+                                   'of %s is already connected; will retry', self._name)
+                else:
+                    logger.warning('SSE channel %s failed: %s; will retry', self._name, e)
+            except Exception as e:
+                self._failed(e)
+                if not self._is_closed:
+                    logger.warning('SSE connection error on %s: %s; will retry', self._name, e)
+
+    def _failed(self, error):
+        self.last_error = error
+        self._attempted.set()
+
+    async def _stream(self, reconnect):
+        stream = AsyncSSEStream(f'{self._client.base_url}{self._path}',
+                                {'Authorization': f'Bearer {self._client.token}'},
+                                last_event_id=self._resume.last_event_id)
+        async with stream:
+            try:
+                self._connects += 1
+                if not await self._catch_up():
+                    return
+                self._ready_state = 1  # OPEN
+                self.last_error = None
+                self._attempted.set()
+                if reconnect:
+                    logger.info('Service channel reconnected for %s', self._name)
+                async for event in stream:
+                    self._handle(event)
+                    if self._is_closed:
+                        return
+            finally:
+                if stream.parser.retry is not None:
+                    self._retry = stream.parser.retry / 1000
+                if not self._is_closed:
+                    self._ready_state = 0  # CONNECTING again
+
+    async def _catch_up(self):
+        """Queue what the server can't replay ahead of the live events (see
+        :class:`~plaid_client.sse.ResumePoint`); ``False`` if it failed and
+        the channel was closed."""
+        start_time = self._resume._opened()
+        if start_time is None or self._path != f'/api/v1/projects/{self._project_id}/listen':
+            return True
+        try:
+            entries = await asyncio.get_running_loop().run_in_executor(
+                self._mux._control, self._resume._catch_up, self._client,
+                self._project_id, start_time)
+        except Exception as e:
+            logger.warning('SSE catch-up on %s from %s failed: %s; starting afresh',
+                           self._name, start_time, e)
+            self._resume.reset()
+            self.close()
+            return False
+        for entry in entries:
+            self._dispatch('audit-log', entry)
+        return True
+
+    def _handle(self, event):
+        event_type = event.event
+        self._event_stats[event_type] = self._event_stats.get(event_type, 0) + 1
+        try:
+            if event_type == 'connected':
+                parsed = loads(event.data)
+                self._client_id = parsed.get('client-id') or parsed.get('clientId')
+            elif event_type == 'heartbeat':
+                if self._client_id:
+                    self._mux._control.submit(send_heartbeat, self._client,
+                                              self._project_id, self._client_id)
+            else:
+                data = transform_response(loads(event.data))
+                if self._resume._record(event_type, data, event.id):
+                    self._dispatch(event_type, data)
+        except Exception as e:
+            logger.warning('Failed to parse SSE event data: %s', e)
+
+    def _dispatch(self, event_type, data):
+        with self._lock:
+            self._pending.append((event_type, data))
+            if self._dispatching:
+                return
+            self._dispatching = True
+        self._mux._executor.submit(self._drain)
+
+    # --- callback pool side -------------------------------------------------
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending or self._is_closed:
+                    self._pending.clear()
+                    self._dispatching = False
+                    return
+                event_type, data = self._pending.popleft()
+            try:
+                if self._on_event(event_type, data) is True:
+                    self.close()
+            except Exception:
+                logger.exception('SSE event handler failed on %s', self._name)
+
+
+class SSEMultiplexer:
+    """Event-loop thread reading any number of SSE channels.
+
+    Args:
+        reconnect_interval: Seconds between a channel dropping and each
+            attempt to reopen it, unless its server sent a ``retry:`` hint.
+        callback_workers: Threads running event callbacks (per channel one at
+            a time, in order).
+        control_workers: Threads sending heartbeat confirmations and reading
+            catch-ups, apart from the callbacks.
+    """
+
+    def __init__(self, *, reconnect_interval=RECONNECT_INTERVAL_S, callback_workers=4,
+                 control_workers=2):
+        self.reconnect_interval = reconnect_interval
+        self._channels = set()
+        self._executor = ThreadPoolExecutor(callback_workers,
+                                            thread_name_prefix='sse-mux-callback')
+        self._control = ThreadPoolExecutor(control_workers,
+                                           thread_name_prefix='sse-mux-control')
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='sse-mux',
+                                        daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    @property
+    def channels(self):
+        """The channels currently open."""
+        return list(self._channels)
+
+    def open(self, client, project_id, on_event, path=None, name=None, resume=None):
+        """Start reading a stream; the :meth:`MessagesResource.listen
+        <plaid_client.client.MessagesResource.listen>` arguments, plus ``name``
+        for log messages. Without a ``resume`` point the channel keeps one of
+        its own. Returns its :class:`MuxChannel`."""
+        if self._closed:
+            raise RuntimeError('SSEMultiplexer is closed')
+        channel = MuxChannel(self, client, project_id, on_event, path=path, name=name,
+                             resume=resume)
+        self._channels.add(channel)
+        self._loop.call_soon_threadsafe(self._start, channel)
+        return channel
+
+    def close(self):
+        """Close every channel and stop the loop thread."""
+        if self._closed:
+            return
+        self._closed = True
+        for channel in list(self._channels):
+            channel.close()
+        try:
+            asyncio.run_coroutine_threadsafe(self._drain_tasks(), self._loop).result(timeout=10)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=10)
+            if not self._thread.is_alive():
+                self._loop.close()
+        self._executor.shutdown(wait=False)
+        self._control.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _start(self, channel):
+        if not channel._is_closed:
+            channel._task = self._loop.create_task(channel._run())
+
+    def _discard(self, channel):
+        self._channels.discard(channel)
+        try:
+            self._loop.call_soon_threadsafe(self._cancel, channel)
+        except RuntimeError:  # loop already closed
+            pass
+
+    @staticmethod
+    def _cancel(channel):
+        if channel._task is not None:
+            channel._task.cancel()
+
+    async def _drain_tasks(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
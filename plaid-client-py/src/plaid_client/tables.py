@@ -0,0 +1,415 @@
+"""Columnar token and span tables for large documents.
+
+Tokens come back from the API as one dict per token (``id``, ``begin``, ``end``,
+``text``, ``precedence``, ``metadata``), and spans as one dict per span. On a
+document with a few hundred thousand tokens those dicts cost hundreds of MB,
+and every workflow sorts and scans them again. :class:`TokenTable` holds one
+token layer as parallel columns instead:
+
+* ``begin``, ``end`` and ``precedence`` are ``array('q')`` columns, 8 bytes per
+  value (a missing precedence is stored as :data:`NO_PRECEDENCE`);
+* ``ids`` is a list of interned id strings, so a span's token references and
+  the table share one string object per token;
+* metadata stays encoded — every token's JSON back to back in one shared
+  buffer — and is decoded only when a row's metadata is read.
+
+Rows are kept sorted by ``(begin, end)``. Range questions ("which tokens lie
+inside this sentence", "does anything overlap this interval") are then binary
+searches, and relating two tables ("which sentence contains each word") is a
+single merge sweep over both::
+
+    words = TokenTable.from_tokens(word_layer['tokens'])
+    sentences = TokenTable.from_tokens(sentence_layer['tokens'])
+    for sentence_row, word_rows in enumerate(sentences.group(words)):
+        ...
+
+:class:`SpanTable` does the same for a span layer, storing each span's tokens
+as row numbers into a :class:`TokenTable`.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from plaid_client.codec import dumps, loads
+
+#: Array typecode of the offset columns (signed 64-bit on every platform).
+OFFSET_TYPECODE = 'q'
+
+#: Stand-in for a token without a precedence in :attr:`TokenTable.precedence`.
+NO_PRECEDENCE = -(2 ** 63)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _encode_metadata(metadata):
+    if not metadata:
+        return None
+    if isinstance(metadata, (bytes, bytearray)):
+        return metadata
+    return dumps(metadata)
+
+
+class _Blobs:
+    """Per-row encoded values stored back to back in one buffer (a separate
+    ``bytes`` object per row would cost more in object overhead, and orjson's
+    output buffers are over-allocated). An empty entry means no value."""
+
+    __slots__ = ('data', 'offsets')
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array(OFFSET_TYPECODE, [0])
+
+    def append(self, encoded):
+        if encoded:
+            self.data += encoded
+        self.offsets.append(len(self.data))
+
+    def get(self, i):
+        """Row ``i``'s encoded value, or ``None``."""
+        begin, end = self.offsets[i], self.offsets[i + 1]
+        return bytes(self.data[begin:end]) if end > begin else None
+
+    def __contains__(self, i):
+        return self.offsets[i + 1] > self.offsets[i]
+
+
+def _no_blobs(n):
+    blobs = _Blobs()
+    blobs.offsets *= n + 1
+    return blobs
+
+
+class TokenTable:
+    """One token layer as sorted, parallel columns.
+
+    Build one with :meth:`from_tokens` or :meth:`from_columns`; the constructor
+    expects columns that are already sorted by ``(begin, end)``.
+
+    Attributes:
+        ids: Token ids (interned strings), in row order.
+        begin: ``array('q')`` of begin offsets, ascending.
+        end: ``array('q')`` of end offsets (ascending within equal ``begin``).
+        precedence: ``array('q')`` of precedences, :data:`NO_PRECEDENCE` where
+            a token has none.
+        layer: The token layer id, if known.
+        text: The text id the tokens belong to, if known.
+    """
+
+    __slots__ = ('ids', 'begin', 'end', 'precedence', 'layer', 'text',
+                 '_metadata', '_row_of', '_max_end')
+
+    def __init__(self, ids, begin, end, precedence=None, metadata=None, *, layer=None, text=None):
+        self.ids = ids
+        self.begin = begin
+        self.end = end
+        self.precedence = precedence if precedence is not None else (
+            array(OFFSET_TYPECODE, [NO_PRECEDENCE]) * len(ids))
+        self.layer = layer
+        self.text = text
+        self._metadata = metadata if metadata is not None else _no_blobs(len(ids))
+        self._row_of = None
+        self._max_end = None
+
+    @classmethod
+    def from_columns(cls, ids, begin, end, precedence=None, metadata=None, *, layer=None,
+                     text=None):
+        """Build a table from per-token columns in any order.
+
+        Args:
+            ids: Token ids.
+            begin: Begin offsets.
+            end: End offsets.
+            precedence: Precedences (``None`` entries allowed), or ``None``.
+            metadata: Per-token metadata — dicts, already-encoded JSON bytes,
+                or ``None`` — or ``None`` for no metadata at all.
+            layer: The token layer id.
+            text: The text id.
+        """
+        n = len(ids)
+        keys = list(zip(begin, end))
+        order = sorted(range(n), key=keys.__getitem__)
+        table_ids = [_intern(ids[i]) for i in order]
+        table_begin = array(OFFSET_TYPECODE, (keys[i][0] for i in order))
+        table_end = array(OFFSET_TYPECODE, (keys[i][1] for i in order))
+        table_precedence = None
+        if precedence is not None:
+            table_precedence = array(OFFSET_TYPECODE, (
+                NO_PRECEDENCE if precedence[i] is None else precedence[i] for i in order))
+        encoded = None
+        if metadata is not None:
+            encoded = _Blobs()
+            for i in order:
+                encoded.append(_encode_metadata(metadata[i]))
+        return cls(table_ids, table_begin, table_end, table_precedence, encoded,
+                   layer=layer, text=text)
+
+    @classmethod
+    def from_tokens(cls, tokens, *, layer=None):
+        """Build a table from token dicts (as returned by ``documents.get`` or
+        ``documents.get_skeleton``)."""
+        tokens = list(tokens)
+        text = tokens[0].get('text') if tokens else None
+        return cls.from_columns(
+            [t['id'] for t in tokens],
+            [t['begin'] for t in tokens],
+            [t['end'] for t in tokens],
+            [t.get('precedence') for t in tokens],
+            [t.get('metadata') for t in tokens],
+            layer=layer, text=text)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f'TokenTable(layer={self.layer!r}, rows={len(self)})'
+
+    # --- rows ---------------------------------------------------------------
+
+    def row(self, i):
+        """Row ``i`` as a token dict (``metadata`` only if the token has some)."""
+        token = {'id': self.ids[i], 'begin': self.begin[i], 'end': self.end[i]}
+        if self.text is not None:
+            token['text'] = self.text
+        precedence = self.precedence[i]
+        token['precedence'] = None if precedence == NO_PRECEDENCE else precedence
+        if i in self._metadata:
+            token['metadata'] = self.metadata(i)
+        return token
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def to_tokens(self):
+        """Every row as a token dict, in ``(begin, end)`` order."""
+        return list(self)
+
+    def metadata(self, i):
+        """Row ``i``'s metadata, decoded (``{}`` if it has none)."""
+        encoded = self._metadata.get(i)
+        return loads(encoded) if encoded is not None else {}
+
+    def metadata_column(self, key, default=None):
+        """The value of metadata ``key`` for every row, in row order."""
+        column = [default] * len(self)
+        for i in range(len(self)):
+            encoded = self._metadata.get(i)
+            if encoded is not None:
+                column[i] = loads(encoded).get(key, default)
+        return column
+
+    def row_of(self, token_id):
+        """Row number of ``token_id``. Raises :class:`KeyError` if absent."""
+        if self._row_of is None:
+            self._row_of = {token_id: i for i, token_id in enumerate(self.ids)}
+        return self._row_of[token_id]
+
+    def take(self, rows):
+        """A new table holding only ``rows`` (any iterable of row numbers)."""
+        rows = sorted(set(rows))
+        metadata = _Blobs()
+        for i in rows:
+            metadata.append(self._metadata.get(i))
+        return TokenTable(
+            [self.ids[i] for i in rows],
+            array(OFFSET_TYPECODE, (self.begin[i] for i in rows)),
+            array(OFFSET_TYPECODE, (self.end[i] for i in rows)),
+            array(OFFSET_TYPECODE, (self.precedence[i] for i in rows)),
+            metadata,
+            layer=self.layer, text=self.text)
+
+    def argsort(self, key):
+        """Row numbers ordered by ``key``: a column name (``'begin'``, ``'end'``,
+        ``'precedence'``) or a sequence with one sort key per row. Ties keep
+        ``(begin, end)`` order."""
+        values = getattr(self, key) if isinstance(key, str) else key
+        if len(values) != len(self):
+            raise ValueError(f'Sort key has {len(values)} values for {len(self)} rows')
+        return sorted(range(len(self)), key=values.__getitem__)
+
+    # --- interval queries ---------------------------------------------------
+
+    def _running_max_end(self):
+        # _max_end[i] = max(end[:i + 1]); non-decreasing, so it can be bisected.
+        if self._max_end is None:
+            self._max_end = array(OFFSET_TYPECODE, accumulate(self.end, max))
+        return self._max_end
+
+    def within(self, begin, end):
+        """Rows lying entirely inside ``[begin, end]``, in row order."""
+        lo = bisect_left(self.begin, begin)
+        hi = bisect_right(self.begin, end)
+        ends = self.end
+        return [i for i in range(lo, hi) if ends[i] <= end]
+
+    def overlapping(self, begin, end):
+        """Rows overlapping ``[begin, end)`` — those with ``row.begin < end``
+        and ``row.end > begin`` (so zero-width rows strictly inside count) —
+        in row order."""
+        hi = bisect_left(self.begin, end)
+        lo = bisect_right(self._running_max_end(), begin, 0, hi)
+        ends = self.end
+        return [i for i in range(lo, hi) if ends[i] > begin]
+
+    def overlaps_any(self, begins, ends):
+        """For each interval ``[begins[k], ends[k])``, whether any row overlaps
+        it (as in :meth:`overlapping`). One binary search per interval."""
+        max_end = self._running_max_end()
+        starts = self.begin
+        result = []
+        for begin, end in zip(begins, ends):
+            hi = bisect_left(starts, end)
+            result.append(hi > 0 and max_end[hi - 1] > begin)
+        return result
+
+    def containers(self, other):
+        """For each row of ``other``, the row of this table containing it, or
+        -1 — one merge sweep over both tables.
+
+        This table's rows should not overlap each other (sentences, for
+        instance): each row of ``other`` is checked against the last row here
+        that begins at or before it.
+        """
+        starts, stops = self.begin, self.end
+        n = len(self)
+        result = array(OFFSET_TYPECODE, [-1]) * len(other)
+        j = -1
+        for k, (begin, end) in enumerate(zip(other.begin, other.end)):
+            while j + 1 < n and starts[j + 1] <= begin:
+                j += 1
+            if j >= 0 and end <= stops[j]:
+                result[k] = j
+        return result
+
+    def group(self, other):
+        """The rows of ``other`` contained in each row of this table (see
+        :meth:`containers`), as one list per row; rows of ``other`` contained
+        in no row are left out."""
+        groups = [[] for _ in range(len(self))]
+        for k, row in enumerate(self.containers(other)):
+            if row >= 0:
+                groups[row].append(k)
+        return groups
+
+
+class SpanTable:
+    """One span layer as columns, with its tokens as rows of a
+    :class:`TokenTable`.
+
+    Spans are ordered by the position of their first and last token. Each
+    span's token rows are stored back to back in one ``array('q')``.
+
+    Attributes:
+        tokens: The :class:`TokenTable` the spans' token rows point into.
+        ids: Span ids (interned strings), in row order.
+        values: Span values (strings interned), in row order.
+        layer: The span layer id, if known.
+    """
+
+    __slots__ = ('tokens', 'ids', 'values', 'layer', '_starts', '_token_rows', '_metadata',
+                 '_row_of', '_spans_of')
+
+    def __init__(self, tokens, ids, values, starts, token_rows, metadata=None, *, layer=None):
+        self.tokens = tokens
+        self.ids = ids
+        self.values = values
+        self.layer = layer
+        self._starts = starts
+        self._token_rows = token_rows
+        self._metadata = metadata if metadata is not None else _no_blobs(len(ids))
+        self._row_of = None
+        self._spans_of = None
+
+    @classmethod
+    def from_spans(cls, spans, tokens, *, layer=None):
+        """Build a table from span dicts whose ``tokens`` are ids of rows in
+        ``tokens`` (a :class:`TokenTable`). Raises :class:`ValueError` if a
+        span references a token the table does not hold."""
+        entries = []
+        for span in spans:
+            try:
+                rows = sorted(tokens.row_of(token_id) for token_id in span.get('tokens') or [])
+            except KeyError as e:
+                raise ValueError(f'Span {span.get("id")!r} references token {e.args[0]!r}, '
+                                 'which is not in the token table') from None
+            entries.append(((rows[0], rows[-1]) if rows else (-1, -1), rows, span))
+        entries.sort(key=lambda entry: entry[0])
+
+        starts = array(OFFSET_TYPECODE, [0])
+        token_rows = array(OFFSET_TYPECODE)
+        ids, values, metadata = [], [], _Blobs()
+        for _, rows, span in entries:
+            ids.append(_intern(span['id']))
+            values.append(_intern(span.get('value')))
+            token_rows.extend(rows)
+            starts.append(len(token_rows))
+            metadata.append(_encode_metadata(span.get('metadata')))
+        return cls(tokens, ids, values, starts, token_rows, metadata, layer=layer)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f'SpanTable(layer={self.layer!r}, rows={len(self)})'
+
+    def row(self, i):
+        """Row ``i`` as a span dict (``metadata`` only if the span has some)."""
+        token_ids = self.tokens.ids
+        span = {'id': self.ids[i], 'value': self.values[i],
+                'tokens': [token_ids[t] for t in self.token_rows(i)]}
+        if i in self._metadata:
+            span['metadata'] = self.metadata(i)
+        return span
+
+    def __iter__(self):
+        return (self.row(i) for i in range(len(self)))
+
+    def to_spans(self):
+        """Every row as a span dict."""
+        return list(self)
+
+    def metadata(self, i):
+        """Row ``i``'s metadata, decoded (``{}`` if it has none)."""
+        encoded = self._metadata.get(i)
+        return loads(encoded) if encoded is not None else {}
+
+    def row_of(self, span_id):
+        """Row number of ``span_id``. Raises :class:`KeyError` if absent."""
+        if self._row_of is None:
+            self._row_of = {span_id: i for i, span_id in enumerate(self.ids)}
+        return self._row_of[span_id]
+
+    def token_rows(self, i):
+        """Token-table rows of span ``i``, ascending."""
+        return self._token_rows[self._starts[i]:self._starts[i + 1]]
+
+    def extent(self, i):
+        """``(begin, end)`` character extent of span ``i`` (``None`` if it has
+        no tokens)."""
+        rows = self.token_rows(i)
+        if not rows:
+            return None
+        stops = self.tokens.end
+        return self.tokens.begin[rows[0]], max(stops[t] for t in rows)
+
+    def spans_of(self, token_row):
+        """Rows of the spans that include token row ``token_row``."""
+        if self._spans_of is None:
+            spans_of = [[] for _ in range(len(self.tokens))]
+            for i in range(len(self)):
+                for t in self.token_rows(i):
+                    spans_of[t].append(i)
+            self._spans_of = spans_of
+        return self._spans_of[token_row]
+
+    def overlapping(self, begin, end):
+        """Rows of the spans with a token overlapping ``[begin, end)``,
+        ascending."""
+        rows = set()
+        for t in self.tokens.overlapping(begin, end):
+            rows.update(self.spans_of(t))
+        return sorted(rows)
@@ -1,6 +1,17 @@
 import re
 
 
+# Key translations are memoized: a response carries the same few dozen keys
+# over and over (``token/begin``, ``span-layers``, …), so after warm-up every
+# key costs a dict lookup instead of a regex pass. The tables are plain dicts
+# capped at _KEY_CACHE_MAX entries and simply reset when full — cheaper than
+# LRU bookkeeping, and a working set that large means keys aren't repeating.
+_KEY_CACHE_MAX = 4096
+_to_snake_cache = {}
+_from_snake_cache = {}
+_NAMESPACE_RE = re.compile(r'^[^/]+/')
+
+
 def key_to_snake(key):
     """Convert kebab-case/namespaced key to snake_case.
     'layer-id' -> 'layer_id'
@@ -10,15 +21,30 @@ def key_to_snake(key):
     The JS client uses camelCase, where the analogous key is 'layer2' -- the
     local spelling differs by convention, but neither leaves a stray separator.
     """
-    key = re.sub(r'^[^/]+/', '', key)
-    return key.replace('-', '_')
+    try:
+        return _to_snake_cache[key]
+    except KeyError:
+        pass
+    converted = _NAMESPACE_RE.sub('', key).replace('-', '_')
+    if len(_to_snake_cache) >= _KEY_CACHE_MAX:
+        _to_snake_cache.clear()
+    _to_snake_cache[key] = converted
+    return converted
 
 
 def key_from_snake(key):
     """Convert snake_case key to kebab-case.
     'layer_id' -> 'layer-id'
     """
-    return key.replace('_', '-')
+    try:
+        return _from_snake_cache[key]
+    except KeyError:
+        pass
+    converted = key.replace('_', '-')
+    if len(_from_snake_cache) >= _KEY_CACHE_MAX:
+        _from_snake_cache.clear()
+    _from_snake_cache[key] = converted
+    return converted
 
 
 # ``metadata`` and ``config`` are opaque, client-agnostic buckets: their
@@ -28,45 +54,73 @@ def key_from_snake(key):
 # ``case-marker`` used as a map key survives intact. Everything else is API
 # envelope and gets the usual case conversion.
 OPAQUE_KEYS = ('metadata', 'config', 'bindings')
+_OPAQUE = frozenset(OPAQUE_KEYS)
 
 
-def transform_request(obj):
-    """Recursively transform request object keys from snake_case to kebab-case.
-    Preserves ``metadata`` and ``config`` contents without transformation.
+def _transform_tree(obj, convert, opaque_on_new_key):
+    """Copy ``obj`` with every envelope dict key run through ``convert``.
+
+    Iterative (an explicit work stack instead of recursion), so deep payloads
+    can't hit the recursion limit and no Python frame is spent per node. Each
+    output container is allocated when its parent is visited and filled when it
+    is popped; dict insertion order is preserved. A dict value under an opaque
+    key (checked against the converted key when ``opaque_on_new_key``, else the
+    original) is shared, not copied.
     """
-    if obj is None:
+    if isinstance(obj, dict):
+        out = {}
+    elif isinstance(obj, list):
+        out = [None] * len(obj)
+    else:
         return obj
-    if isinstance(obj, list):
-        return [transform_request(item) for item in obj]
-    if not isinstance(obj, dict):
-        return obj
-
-    transformed = {}
-    for key, value in obj.items():
-        new_key = key_from_snake(key)
-        if key in OPAQUE_KEYS and isinstance(value, dict):
-            transformed[new_key] = value
+    stack = [(obj, out)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        src, dst = pop()
+        if isinstance(src, list):
+            for i, value in enumerate(src):
+                if isinstance(value, dict):
+                    child = {}
+                    push((value, child))
+                    dst[i] = child
+                elif isinstance(value, list):
+                    child = [None] * len(value)
+                    push((value, child))
+                    dst[i] = child
+                else:
+                    dst[i] = value
         else:
-            transformed[new_key] = transform_request(value)
-    return transformed
+            for key, value in src.items():
+                new_key = convert(key)
+                if isinstance(value, dict):
+                    if (new_key if opaque_on_new_key else key) in _OPAQUE:
+                        dst[new_key] = value
+                        continue
+                    child = {}
+                    push((value, child))
+                    dst[new_key] = child
+                elif isinstance(value, list):
+                    child = [None] * len(value)
+                    push((value, child))
+                    dst[new_key] = child
+                else:
+                    dst[new_key] = value
+    return out
 
 
-def transform_response(obj):
-    """Recursively transform response object keys from kebab-case/namespaced to snake_case.
-    Preserves ``metadata`` and ``config`` contents without transformation.
+def transform_request(obj):
+    """Transform request object keys, at every depth, from snake_case to kebab-case.
+    Walks the tree iteratively (see ``_transform_tree``); the contents of the
+    opaque keys (``OPAQUE_KEYS``) pass through without transformation.
     """
-    if obj is None:
-        return obj
-    if isinstance(obj, list):
-        return [transform_response(item) for item in obj]
-    if not isinstance(obj, dict):
-        return obj
+    return _transform_tree(obj, key_from_snake, False)
 
-    transformed = {}
-    for key, value in obj.items():
-        new_key = key_to_snake(key)
-        if new_key in OPAQUE_KEYS and isinstance(value, dict):
-            transformed[new_key] = value
-        else:
-            transformed[new_key] = transform_response(value)
-    return transformed
+
+def transform_response(obj):
+    """Transform response object keys, at every depth, from kebab-case/namespaced
+    to snake_case. Walks the tree iteratively (see ``_transform_tree``); the
+    contents of the opaque keys (``OPAQUE_KEYS``) pass through without
+    transformation.
+    """
+    return _transform_tree(obj, key_to_snake, True)
@@ -0,0 +1,233 @@
+"""Optional httpx transport with HTTP/2 multiplexing.
+
+By default a :class:`~plaid_client.PlaidClient` sends every request through a
+``requests.Session``: HTTP/1.1, one request in flight per pooled connection, so
+every concurrent call (threads, ``bulk_max_workers``, the async client's pool)
+holds a connection of its own — and opens one, TLS handshake included, when
+the pool has none idle. With `httpx <https://www.python-httpx.org/>`_ installed
+(with its ``http2`` extra), :class:`HTTPXSession` multiplexes them as streams
+on one HTTP/2 connection per host, with compressed headers (the bearer token
+and content type repeat on every call). Sequential calls still cost one round
+trip each on either transport. Select it at construction::
+
+    client = PlaidClient(url, token, transport='httpx')
+
+or build one and share it between clients, as with
+:func:`~plaid_client.http.make_session`::
+
+    session = HTTPXSession(max_connections=20)
+    a = PlaidClient(url, token_a, session=session)
+
+:class:`HTTPXSession` implements the subset of the ``requests.Session`` API the
+client uses (``request`` / ``get`` / ``post`` / ``close``, streaming included),
+and its responses behave like ``requests`` responses (``ok``, ``reason``,
+``content``, ``text``, ``iter_lines`` …), plus :meth:`HTTPXResponse.abort` to
+end a streamed body another thread is blocked reading (what
+:func:`~plaid_client.sse.abort_response` does to a ``requests`` response's
+socket). Transport failures are re-raised as
+the matching ``requests`` exceptions, so :class:`~plaid_client.PlaidAPIError`
+messages, timeouts, strict-mode stamping and binary downloads are identical on
+both transports.
+
+httpx is an optional dependency (``pip install 'larc-plaid-client[http2]'``);
+nothing changes when it is absent unless this transport is asked for.
+"""
+
+import socket
+from http import HTTPStatus
+
+import requests
+
+from plaid_client.http import DEFAULT_POOL_MAXSIZE
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+#: ``transport=`` values accepted by :class:`~plaid_client.PlaidClient`.
+TRANSPORTS = ('requests', 'httpx')
+
+
+def _timeout(timeout):
+    """Translate a ``requests``-style timeout (seconds, ``(connect, read)`` or
+    ``None``) into an ``httpx.Timeout``."""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+    return httpx.Timeout(timeout)
+
+
+def _translate(error):
+    """The ``requests`` exception matching an httpx one."""
+    message = str(error) or type(error).__name__
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(message)
+    if isinstance(error, httpx.ReadTimeout):
+        return requests.ReadTimeout(message)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.Timeout(message)
+    if isinstance(error, httpx.TransportError):
+        return requests.ConnectionError(message)
+    return requests.RequestException(message)
+
+
+class HTTPXResponse:
+    """A ``requests.Response``-like view of an ``httpx.Response``."""
+
+    # No urllib3 response underneath; sse.abort_response calls abort().
+    raw = None
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def reason(self):
+        # HTTP/2 has no reason phrase on the wire; use the standard one.
+        if self._response.reason_phrase:
+            return self._response.reason_phrase
+        try:
+            return HTTPStatus(self.status_code).phrase
+        except ValueError:
+            return ''
+
+    @property
+    def http_version(self):
+        """Protocol the response came over, e.g. ``'HTTP/2'``."""
+        return self._response.http_version
+
+    @property
+    def content(self):
+        try:
+            return self._response.read()
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    @property
+    def text(self):
+        self.content  # read (and translate errors) before decoding
+        return self._response.text
+
+    def json(self):
+        return self._response.json()
+
+    def iter_content(self, chunk_size=None):
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    def iter_lines(self, decode_unicode=False):
+        try:
+            for line in self._response.iter_lines():
+                yield line if decode_unicode else line.encode('utf-8')
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f'{self.status_code} {self.reason} for url: {self.url}',
+                                     response=self)
+
+    def close(self):
+        self._response.close()
+
+    def abort(self):
+        """End a streamed body now, even while another thread is blocked in
+        ``iter_lines`` / ``iter_content`` on it.
+
+        Over HTTP/1.1 the connection's socket is shut down, which wakes that
+        read at once (it then raises ``requests.ConnectionError``). An HTTP/2
+        stream shares its socket with every other request in flight on the
+        connection, so it is only closed: a read blocked on it returns when
+        the connection next delivers a frame, or at the read timeout.
+        """
+        stream = self._response.extensions.get('network_stream')
+        if stream is not None and self.http_version == 'HTTP/1.1':
+            try:
+                sock = stream.get_extra_info('socket')
+                if sock is not None:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+        try:
+            self._response.close()
+        except Exception:
+            pass
+
+
+class HTTPXSession:
+    """A ``requests.Session`` stand-in backed by an ``httpx.Client``.
+
+    Thread-safe, like the session it replaces.
+
+    Args:
+        http2: Offer HTTP/2. It is negotiated over TLS (ALPN); plain
+            ``http://`` connections stay on HTTP/1.1 keep-alive.
+        max_connections: Upper bound on open connections. Under HTTP/2 one
+            connection per host usually carries everything.
+        max_keepalive_connections: Idle connections kept for reuse.
+        client: An existing ``httpx.Client`` to wrap instead of building one;
+            the other arguments are then ignored.
+    """
+
+    def __init__(self, *, http2=True, max_connections=None, max_keepalive_connections=None,
+                 client=None):
+        if httpx is None:
+            raise ImportError("The httpx transport needs httpx "
+                              "(pip install 'larc-plaid-client[http2]')")
+        if client is None:
+            limits = httpx.Limits(max_connections=max_connections,
+                                  max_keepalive_connections=max_keepalive_connections)
+            client = httpx.Client(http2=http2, limits=limits)
+        self.client = client
+
+    def request(self, method, url, *, headers=None, data=None, files=None, timeout=None,
+                stream=False):
+        kwargs = {'headers': headers}
+        if files is not None:
+            kwargs['files'] = files
+        elif data is not None:
+            # bytes, or an iterator of byte chunks (sent chunked, like requests)
+            kwargs['content'] = data
+        try:
+            request = self.client.build_request(method, url, timeout=_timeout(timeout), **kwargs)
+            response = self.client.send(request, stream=stream)
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+        return HTTPXResponse(response)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def make_httpx_session(*, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False, http2=True):
+    """Build an :class:`HTTPXSession` sized like :func:`~plaid_client.http.make_session`.
+
+    Args:
+        pool_maxsize: Idle connections kept alive.
+        pool_block: Also cap open connections at ``pool_maxsize``; a request
+            then waits for a free one (up to its timeout).
+        http2: Offer HTTP/2.
+    """
+    return HTTPXSession(http2=http2, max_keepalive_connections=pool_maxsize,
+                        max_connections=pool_maxsize if pool_block else None)
@@ -10,12 +10,15 @@ project whose layers carry the standard roles:
   token spans (collision-safe, batch-friendly).
 - ``plaid_client.workflows.asr`` — speech transcription: an ``ASRModel`` you
   subclass plus an ``AlignmentProcessor`` that writes time-aligned tokens.
+- ``plaid_client.workflows.intervals`` — ``IntervalIndex``, a sorted index
+  for grouping tokens under the tokens that contain them (words under
+  sentences, morphemes into sentences).
 
 Official service files (``igt_tokenize_punkt.py``, ``igt_transcribe_whisper.py``,
 ...) are single standalone scripts that import these frameworks — use them as
 templates for your own services.
 """
 
-from . import asr, tokenization
+from . import asr, intervals, tokenization
 
-__all__ = ['asr', 'tokenization']
+__all__ = ['asr', 'intervals', 'tokenization']
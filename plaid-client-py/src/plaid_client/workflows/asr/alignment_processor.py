@@ -10,13 +10,26 @@ import os
 import requests
 import tempfile
 import re
+from bisect import bisect_right
+from itertools import accumulate
 from typing import List, Dict, Any, Optional, Tuple
 
 from plaid_client.provenance import stamp_inferred, is_protected
+from plaid_client.layer_index import LayerIndex
 
+from ..intervals import IntervalIndex
 from .asr_model import Alignment
 
 
+def _time_begin(token: Dict) -> float:
+    return token.get("metadata", {}).get("timeBegin", 0)
+
+
+def _time_extent(token: Dict) -> Tuple[float, float]:
+    metadata = token.get("metadata", {})
+    return metadata.get("timeBegin", 0), metadata.get("timeEnd", 0)
+
+
 class AlignmentProcessor:
     """
     Core engine for processing ASR alignments and updating Plaid documents.
@@ -132,21 +145,14 @@ class AlignmentProcessor:
         try:
             # Get document with full token information
             response_helper.progress(75, "Analyzing existing tokens and text...")
-            document = client.documents.get(document_id, include_body=True)
+            document = client.documents.get(document_id, include_body=True, raw=False)
             
             # Find text layer and existing tokens
-            text_layer = None
-            alignment_token_layer = None
-            
-            for tl in document["text_layers"]:
-                if tl["id"] == text_layer_id:
-                    text_layer = tl
-                    # Find token layers within this text layer
-                    for token_layer in tl.get("token_layers", []):
-                        if token_layer["id"] == alignment_token_layer_id:
-                            alignment_token_layer = token_layer
-                            break
-                    break
+            layers = LayerIndex(document["text_layers"])
+            text_layer = layers.layer(text_layer_id)
+            alignment_token_layer = (layers.layer(alignment_token_layer_id)
+                                     if layers.parent_id(alignment_token_layer_id) == text_layer_id
+                                     else None)
             
             if not text_layer:
                 raise ValueError("Text layer not found")
@@ -154,8 +160,9 @@ class AlignmentProcessor:
             # Get existing alignment tokens
             existing_alignment_tokens = sorted(
                 alignment_token_layer.get("tokens", []) if alignment_token_layer else [],
-                key=lambda t: t.get("metadata", {}).get("timeBegin", 0)
+                key=_time_begin
             )
+            existing_times = [_time_begin(t) for t in existing_alignment_tokens]
             
             # Get current text content
             current_text = text_layer.get("text", {}).get("body", "")
@@ -170,24 +177,8 @@ class AlignmentProcessor:
             response_helper.progress(78, "Filtering transcriptions to avoid time collisions...")
             
             # Step 1: Filter out transcriptions that have time collisions
-            non_colliding_transcriptions = []
-            for trans in transcriptions:
-                trans_start = trans['start']
-                trans_end = trans['end']
-                
-                # Check for time overlap with existing alignment tokens
-                has_collision = False
-                for existing_token in existing_alignment_tokens:
-                    existing_start = existing_token.get("metadata", {}).get("timeBegin", 0)
-                    existing_end = existing_token.get("metadata", {}).get("timeEnd", 0)
-                    
-                    # Check for overlap: not (trans_end <= existing_start or trans_start >= existing_end)
-                    if not (trans_end <= existing_start or trans_start >= existing_end):
-                        has_collision = True
-                        break
-                
-                if not has_collision:
-                    non_colliding_transcriptions.append(trans)
+            non_colliding_transcriptions = self._filter_time_collisions(
+                transcriptions, existing_alignment_tokens)
             
             response_helper.progress(82, f"Processing {len(non_colliding_transcriptions)} non-colliding transcriptions...")
             
@@ -203,7 +194,8 @@ class AlignmentProcessor:
                     continue
                 
                 # Find insertion point in text based on time
-                insertion_pos = self._find_text_insertion_position(current_text, existing_alignment_tokens, trans['start'])
+                insertion_pos = self._find_text_insertion_position(
+                    current_text, existing_alignment_tokens, trans['start'], times=existing_times)
                 
                 # Add space at the end of all segments except the final one
                 is_final_segment = (i == len(non_colliding_transcriptions) - 1)
@@ -230,22 +222,9 @@ class AlignmentProcessor:
                 
                 # Sort modifications by position (forward order for sequential application)
                 text_modifications.sort(key=lambda m: m['position'])
-                
-                # Apply modifications sequentially and track cumulative offset
-                new_text = current_text
-                cumulative_offset = 0
-                
-                for mod in text_modifications:
-                    # Calculate actual insertion position with cumulative offset
-                    actual_pos = mod['position'] + cumulative_offset
-                    
-                    # Insert the segment text
-                    new_text = new_text[:actual_pos] + mod['new_text'] + new_text[actual_pos:]
-                    
-                    # Calculate token positions in the final text
-                    token_start = actual_pos + mod['segment_start_offset']
-                    token_end = token_start + mod['segment_length']
-                    
+                new_text, token_extents = self._apply_text_modifications(current_text, text_modifications)
+
+                for mod, (token_start, token_end) in zip(text_modifications, token_extents):
                     # Create alignment token with metadata
                     token_metadata = {
                         "timeBegin": mod['time_start'],
@@ -263,10 +242,7 @@ class AlignmentProcessor:
                         "end": token_end,
                         "metadata": token_metadata
                     })
-                    
-                    # Update cumulative offset for next insertion
-                    cumulative_offset += len(mod['new_text'])
-                
+
                 # Begin atomic batch operation
                 response_helper.progress(88, "Committing changes...")
                 with client.batched():
@@ -326,7 +302,7 @@ class AlignmentProcessor:
                 # Validate temporal ordering invariant - need to get updated tokens from database
                 response_helper.progress(98, "Validating temporal ordering...")
                 # Re-fetch the document to get updated token positions for validation
-                updated_document = client.documents.get(document_id, include_body=True)
+                updated_document = client.documents.get(document_id, include_body=True, raw=False)
                 all_updated_tokens = []
                 for tl in updated_document["text_layers"]:
                     for token_layer in tl.get("token_layers", []):
@@ -343,42 +319,79 @@ class AlignmentProcessor:
         except Exception as e:
             raise Exception(f"Failed to create alignment tokens: {str(e)}")
     
-    def _find_text_insertion_position(self, current_text: str, existing_alignment_tokens: List[Dict], target_time: float) -> int:
-        """Find the best position in text to insert a word based on its timestamp"""
+    def _filter_time_collisions(self, transcriptions: List[Dict], existing_alignment_tokens: List[Dict]) -> List[Dict]:
+        """Drop transcriptions whose time range overlaps an existing alignment
+        token's [timeBegin, timeEnd). One binary search per transcription."""
+        if not existing_alignment_tokens:
+            return list(transcriptions)
+        existing = IntervalIndex(existing_alignment_tokens, key=_time_extent)
+        return [trans for trans in transcriptions
+                if not existing.overlaps(trans['start'], trans['end'])]
+
+    def _find_text_insertion_position(self, current_text: str, existing_alignment_tokens: List[Dict], target_time: float,
+                                      times: Optional[List[float]] = None) -> int:
+        """Find the best position in text to insert a word based on its timestamp.
+
+        ``times`` may carry the tokens' ``timeBegin`` values when
+        ``existing_alignment_tokens`` is already sorted by them, so repeated
+        calls skip the sort and cost one binary search each.
+        """
         
         if not existing_alignment_tokens:
             return len(current_text)
 
-        # Sort existing tokens by time to ensure proper temporal ordering
-        tokens_by_time = sorted(existing_alignment_tokens, key=lambda t: t.get("metadata", {}).get("timeBegin", 0))
-        
-        # Find the position based on temporal ordering
-        for i, token in enumerate(tokens_by_time):
-            token_time = token.get("metadata", {}).get("timeBegin", 0)
-            
-            if target_time < token_time:
-                # Insert before this token temporally
-                # We need to find the correct position that maintains temporal ordering
-                if i == 0:
-                    # Insert at the beginning of text if this is the first token temporally
-                    return 0
-                else:
-                    # Insert after the previous token (temporally)
-                    # But we need to ensure we don't violate ordering with the current token
-                    prev_token = tokens_by_time[i - 1]
-                    current_token = token
-                    
-                    # If the current token's position is before the previous token's end,
-                    # we need to insert before the current token instead
-                    if current_token["begin"] < prev_token["end"]:
-                        print(f"WARNING: Temporal ordering conflict detected. Inserting before conflicting token.")
-                        return current_token["begin"]
-                    else:
-                        return prev_token["end"]
-        
-        # If we get here, insert after the last token (temporally)
-        last_token = tokens_by_time[-1]
-        return last_token["end"]
+        if times is None:
+            # Sort existing tokens by time to ensure proper temporal ordering
+            tokens_by_time = sorted(existing_alignment_tokens, key=_time_begin)
+            times = [_time_begin(t) for t in tokens_by_time]
+        else:
+            tokens_by_time = existing_alignment_tokens
+
+        # First token (temporally) that starts after the target time
+        i = bisect_right(times, target_time)
+        if i == len(tokens_by_time):
+            # Insert after the last token (temporally)
+            return tokens_by_time[-1]["end"]
+        if i == 0:
+            # Insert at the beginning of text if this is the first token temporally
+            return 0
+
+        # Insert after the previous token (temporally)
+        # But we need to ensure we don't violate ordering with the current token
+        prev_token = tokens_by_time[i - 1]
+        current_token = tokens_by_time[i]
+
+        # If the current token's position is before the previous token's end,
+        # we need to insert before the current token instead
+        if current_token["begin"] < prev_token["end"]:
+            print(f"WARNING: Temporal ordering conflict detected. Inserting before conflicting token.")
+            return current_token["begin"]
+        return prev_token["end"]
+
+    def _apply_text_modifications(self, current_text: str,
+                                  text_modifications: List[Dict]) -> Tuple[str, List[Tuple[int, int]]]:
+        """Apply position-sorted insertions to ``current_text`` in one pass.
+
+        Returns the new text and, for each modification, the ``(begin, end)``
+        of its segment in the new text. The text is assembled as a list of
+        pieces joined once, rather than re-slicing the whole string per insert.
+        """
+        pieces = []
+        extents = []
+        cursor = 0  # position in current_text copied up to
+        cumulative_offset = 0
+        for mod in text_modifications:
+            position = mod['position']
+            pieces.append(current_text[cursor:position])
+            pieces.append(mod['new_text'])
+            cursor = position
+
+            # Calculate token positions in the final text
+            token_start = position + cumulative_offset + mod['segment_start_offset']
+            extents.append((token_start, token_start + mod['segment_length']))
+            cumulative_offset += len(mod['new_text'])
+        pieces.append(current_text[cursor:])
+        return "".join(pieces), extents
     
     def _validate_temporal_ordering(self, alignment_tokens: List[Dict]):
         """
@@ -530,12 +543,15 @@ class AlignmentProcessor:
                 client.tokens.bulk_delete([s["id"] for s in existing_sentence_tokens if "id" in s])
             return
 
-        # Reindex existing alignment tokens to their post-insertion positions
+        # Reindex existing alignment tokens to their post-insertion positions:
+        # each shifts by the text inserted at or before its begin (a prefix sum
+        # over the position-sorted modifications).
+        mod_positions = [mod['position'] for mod in text_modifications]
+        inserted_before = [0] + list(accumulate(len(mod['new_text']) for mod in text_modifications))
         updated_existing_tokens = []
         for token in existing_alignment_tokens:
             token_begin = token.get("begin", 0)
-            adjustment = sum(len(mod['new_text']) for mod in text_modifications
-                             if mod['position'] <= token_begin)
+            adjustment = inserted_before[bisect_right(mod_positions, token_begin)]
             updated_token = dict(token)
             updated_token["begin"] = token_begin + adjustment
             updated_token["end"] = token.get("end", 0) + adjustment
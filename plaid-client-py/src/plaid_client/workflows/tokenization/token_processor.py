@@ -7,8 +7,10 @@ batch operations.
 """
 
 import logging
+from itertools import accumulate
 from typing import List, Dict, Any, Optional
 
+from plaid_client.layer_index import LayerIndex, get_layer_index
 from plaid_client.provenance import stamp_inferred, is_protected
 
 from .tokenizer_model import TokenSpan
@@ -75,14 +77,37 @@ class TokenProcessor:
             Dictionary with counts of tokens created/deleted
         """
         try:
-            # Get document with layers
+            # Only the text and the two layers' token offsets are needed up
+            # front; the sentence layer's annotations matter only when the
+            # sentence partition is reset, so they are fetched only then (below).
             response_helper.progress(10, "Fetching document...")
-            full_document = client.documents.get(document_id, include_body=True)
-            
-            # Find the text layer and content
-            text_layer = full_document["text_layers"][0]
-            text_id = text_layer["text"]["id"]
-            text_content = text_layer["text"]["body"]
+            document = client.documents.get(document_id, raw=False)
+            layers = get_layer_index(client, document["project"])
+            if any(layer_id and layer_id not in layers
+                   for layer_id in (primary_token_layer_id, sentence_layer_id)):
+                # Possibly created since the shared index was fetched.
+                layers = get_layer_index(client, document["project"], refresh=True)
+            if not layers.text_layers:
+                response_helper.error("Project has no text layer")
+                return {"tokens_created": 0, "tokens_deleted": 0, "sentences_created": 0}
+
+            # The layers must belong to the first text layer.
+            text_layer_id = layers.text_layers[0]["id"]
+            if layers.parent_id(primary_token_layer_id) != text_layer_id:
+                response_helper.error("Primary token layer not found")
+                return {"tokens_created": 0, "tokens_deleted": 0, "sentences_created": 0}
+            if sentence_layer_id and layers.parent_id(sentence_layer_id) != text_layer_id:
+                sentence_layer_id = None
+
+            skeleton = client.documents.get_skeleton(
+                document_id, [primary_token_layer_id] + ([sentence_layer_id] if sentence_layer_id else []),
+                text_layer_ids=[text_layer_id])
+            text = skeleton["texts"].get(text_layer_id)
+            if text is None:
+                response_helper.error(f"Text does not exist for document {document_id}")
+                return {"tokens_created": 0, "tokens_deleted": 0, "sentences_created": 0}
+            text_id = text["id"]
+            text_content = text["body"]
             
             if not text_content.strip():
                 response_helper.error(f"Text content is empty for document {document_id}")
@@ -90,21 +115,9 @@ class TokenProcessor:
             
             # Get existing tokens
             response_helper.progress(20, "Analyzing existing tokens...")
-            primary_layer = None
-            sentence_layer = None
-            
-            for tl in text_layer["token_layers"]:
-                if tl["id"] == primary_token_layer_id:
-                    primary_layer = tl
-                elif sentence_layer_id and tl["id"] == sentence_layer_id:
-                    sentence_layer = tl
-            
-            if not primary_layer:
-                response_helper.error("Primary token layer not found")
-                return {"tokens_created": 0, "tokens_deleted": 0, "sentences_created": 0}
-            
-            existing_tokens = primary_layer.get("tokens", [])
-            existing_sentences = sentence_layer.get("tokens", []) if sentence_layer else []
+            existing_tokens = skeleton["token_layers"][primary_token_layer_id]
+            existing_sentences = skeleton["token_layers"][sentence_layer_id] if sentence_layer_id else []
+            sentence_layer = {"id": sentence_layer_id, "tokens": existing_sentences} if sentence_layer_id else None
             
             # Convert TokenSpan objects to the format expected by existing functions
             response_helper.progress(30, "Processing tokenization results...")
@@ -150,6 +163,10 @@ class TokenProcessor:
                 # every sentence-level annotation. Machine-made UNVERIFIED ones
                 # are replaceable; human-made or human-verified ones are not —
                 # refuse unless the caller explicitly opted into overwriting.
+                # Counting them needs the sentence layer's spans and vocab
+                # links, so fetch the full document for this case only.
+                full_document = client.documents.get(document_id, include_body=True, raw=False)
+                sentence_layer = LayerIndex(full_document["text_layers"]).layer(sentence_layer_id)
                 _, protected = self._sentence_annotation_loss(sentence_layer, sentence_ids_to_delete)
                 if protected and not overwrite:
                     response_helper.error(
@@ -179,20 +196,12 @@ class TokenProcessor:
             split_existing_tokens = []
 
             if split_boundaries:
-                existing_tokens_split = self._split_cross_sentence_tokens(
-                    [{'begin': t['begin'], 'end': t['end'], 'id': t.get('id')} for t in existing_tokens],
-                    split_boundaries
-                )
-
-                # Find tokens that were actually split
-                for orig_token in existing_tokens:
-                    matching_split_tokens = [t for t in existing_tokens_split
-                                           if t['begin'] >= orig_token['begin'] and t['end'] <= orig_token['end']]
-
-                    if len(matching_split_tokens) > 1:  # Token was split
+                pieces_by_token = self._split_pieces(existing_tokens, split_boundaries)
+                for orig_token, pieces in zip(existing_tokens, pieces_by_token):
+                    if pieces is not None:  # Token was split
                         tokens_to_delete.append(orig_token['id'])
-                        split_existing_tokens.extend([{'begin': t['begin'], 'end': t['end']} for t in matching_split_tokens])
-                    elif len(matching_split_tokens) == 1:  # Token unchanged
+                        split_existing_tokens.extend(pieces)
+                    else:  # Token unchanged
                         split_existing_tokens.append({'begin': orig_token['begin'], 'end': orig_token['end']})
             else:
                 split_existing_tokens = [{'begin': t['begin'], 'end': t['end']} for t in existing_tokens]
@@ -281,7 +290,8 @@ class TokenProcessor:
                                 op["metadata"] = dict(prov_fragment)
                             sent_operations.append(op)
 
-                        client.tokens.bulk_create(sent_operations)
+                        # One request: a partitioning layer can't be filled piecewise.
+                        client.tokens.bulk_create(sent_operations, chunked=False)
                         sentences_created = len(sent_operations)
 
                     # Create word tokens
@@ -375,46 +385,54 @@ class TokenProcessor:
     
     def _split_cross_sentence_tokens(self, tokens: List[Dict], sentences: List[Dict]) -> List[Dict]:
         """Split tokens that span multiple sentences into separate tokens for each sentence"""
-        if not sentences or len(sentences) <= 1:
-            return tokens
-        
-        # Create sentence boundary lookup
-        sentence_boundaries = []
-        for sentence in sentences:
-            sentence_boundaries.append((sentence['begin'], sentence['end']))
-        sentence_boundaries.sort()  # Ensure sorted by start position
-        
         split_tokens = []
-        
-        for token in tokens:
-            token_begin = token['begin']
-            token_end = token['end']
-            
-            # Find which sentences this token intersects with
-            intersecting_sentences = []
-            for sent_begin, sent_end in sentence_boundaries:
-                # Check if token overlaps with this sentence
-                if token_begin < sent_end and token_end > sent_begin:
-                    intersecting_sentences.append((sent_begin, sent_end))
-            
-            if len(intersecting_sentences) <= 1:
-                # Token is within a single sentence, keep as is
+        for token, pieces in zip(tokens, self._split_pieces(tokens, sentences)):
+            if pieces is None:
                 split_tokens.append(token)
             else:
-                # Token spans multiple sentences, split it
-                for sent_begin, sent_end in intersecting_sentences:
-                    # Calculate the intersection bounds
-                    split_begin = max(token_begin, sent_begin)
-                    split_end = min(token_end, sent_end)
-                    
-                    # Only create a token if there's actual content in this sentence
-                    if split_begin < split_end:
-                        split_tokens.append({
-                            'begin': split_begin,
-                            'end': split_end
-                        })
-        
+                split_tokens.extend(pieces)
         return split_tokens
+
+    def _split_pieces(self, tokens: List[Dict], sentences: List[Dict]) -> List[Optional[List[Dict]]]:
+        """For each token (in input order), its per-sentence pieces if it
+        overlaps more than one sentence, else None (the token stays whole).
+
+        A single sweep: tokens are visited in begin order while a cursor moves
+        forward over the sentences sorted by begin, so each token only looks at
+        the sentences it actually overlaps. A piece is the token's intersection
+        with one sentence, as a ``{'begin', 'end'}`` dict, in sentence order.
+        """
+        result = [None] * len(tokens)
+        if not sentences or len(sentences) <= 1:
+            return result
+
+        boundaries = sorted((s['begin'], s['end']) for s in sentences)
+        # max_ends[k]: furthest end among boundaries[:k + 1], so the cursor can
+        # skip past sentences even when an earlier one is unusually long.
+        max_ends = list(accumulate((end for _, end in boundaries), max))
+        n = len(boundaries)
+
+        cursor = 0
+        for i in sorted(range(len(tokens)), key=lambda i: tokens[i]['begin']):
+            token_begin = tokens[i]['begin']
+            token_end = tokens[i]['end']
+            # Sentences up to the cursor all end at or before this token (and
+            # every later one, since tokens come in begin order).
+            while cursor < n and max_ends[cursor] <= token_begin:
+                cursor += 1
+            pieces = []
+            k = cursor
+            while k < n and boundaries[k][0] < token_end:
+                sent_begin, sent_end = boundaries[k]
+                # Only create a piece if there's actual content in this sentence
+                split_begin = max(token_begin, sent_begin)
+                split_end = min(token_end, sent_end)
+                if split_begin < split_end:
+                    pieces.append({'begin': split_begin, 'end': split_end})
+                k += 1
+            if len(pieces) > 1:
+                result[i] = pieces
+        return result
     
     def _normalize_sentence_partition(self, sentences: List[Dict], text_length: int) -> List[Dict]:
         """Normalize a list of sentence ranges into a complete partition of [0, text_length).
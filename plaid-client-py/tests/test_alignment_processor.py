@@ -0,0 +1,70 @@
+"""Tests for AlignmentProcessor's collision filter and text assembly.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.asr import AlignmentProcessor
+
+
+def _aligned(begin, end, time_begin, time_end):
+    return {'begin': begin, 'end': end,
+            'metadata': {'timeBegin': time_begin, 'timeEnd': time_end}}
+
+
+def test_time_collisions_match_pairwise_check():
+    rng = random.Random(11)
+    processor = AlignmentProcessor()
+    existing = []
+    for _ in range(60):
+        t = rng.uniform(0, 300)
+        existing.append(_aligned(0, 1, t, t + rng.uniform(0, 8)))
+    existing.append({'begin': 0, 'end': 1, 'metadata': {}})  # untimed: [0, 0)
+    transcriptions = []
+    for _ in range(200):
+        t = rng.uniform(-5, 320)
+        transcriptions.append({'start': t, 'end': t + rng.uniform(0.1, 4), 'text': 'x'})
+
+    def collides(trans):
+        return any(not (trans['end'] <= e['metadata'].get('timeBegin', 0)
+                        or trans['start'] >= e['metadata'].get('timeEnd', 0))
+                   for e in existing)
+
+    assert processor._filter_time_collisions(transcriptions, existing) == [
+        t for t in transcriptions if not collides(t)]
+    assert processor._filter_time_collisions(transcriptions, []) == transcriptions
+
+
+def test_insertion_position_with_and_without_presorted_times():
+    processor = AlignmentProcessor()
+    tokens = [_aligned(20, 25, 5.0, 6.0), _aligned(0, 4, 1.0, 2.0), _aligned(10, 15, 3.0, 4.0)]
+    by_time = sorted(tokens, key=lambda t: t['metadata']['timeBegin'])
+    times = [t['metadata']['timeBegin'] for t in by_time]
+    for target, expected in [(0.5, 0), (1.0, 4), (2.5, 4), (3.5, 15), (9.0, 25)]:
+        assert processor._find_text_insertion_position('x' * 30, tokens, target) == expected
+        assert processor._find_text_insertion_position('x' * 30, by_time, target,
+                                                       times=times) == expected
+    assert processor._find_text_insertion_position('abc', [], 1.0) == 3
+
+
+def test_text_modifications_applied_in_one_pass():
+    processor = AlignmentProcessor()
+    text = 'alpha beta gamma'
+    mods = [{'position': p, 'new_text': s, 'segment_start_offset': 0, 'segment_length': len(s.strip())}
+            for p, s in [(0, 'A '), (6, 'B '), (6, 'C '), (16, 'D')]]
+    new_text, extents = processor._apply_text_modifications(text, mods)
+
+    expected, offset = text, 0
+    for mod in mods:  # the sequential slicing it replaces
+        at = mod['position'] + offset
+        expected = expected[:at] + mod['new_text'] + expected[at:]
+        offset += len(mod['new_text'])
+    assert new_text == expected == 'A alpha B C beta gammaD'
+    assert [new_text[b:e] for b, e in extents] == ['A', 'B', 'C', 'D']
@@ -0,0 +1,102 @@
+"""Tests for the persistent as_of snapshot cache — network-free.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client import AsOfCache, PlaidClient
+
+PAST = '2024-03-01T12:00:00Z'
+
+
+class _Resp:
+    def __init__(self, body):
+        self.status_code = 200
+        self.ok = True
+        self.headers = {'content-type': 'application/json'}
+        self.content = json.dumps(body).encode()
+
+
+class _Sess:
+    def __init__(self):
+        self.urls = []
+
+    def request(self, method, url, **kw):
+        self.urls.append(url)
+        return _Resp({'token/id': 'T', 'token/text-layer': 'TL', 'n': len(self.urls)})
+
+    def close(self):
+        pass
+
+
+def _client(cache, token='tok'):
+    return PlaidClient('http://x', token, session=_Sess(), as_of_cache=cache)
+
+
+def test_snapshot_reads_survive_a_restart(tmp_path):
+    path = tmp_path / 'snapshots.sqlite'
+    client = _client(str(path))
+    first = client.tokens.get('T', as_of=PAST)
+    assert client.tokens.get('T', as_of=PAST) == first == {'id': 'T', 'text_layer': 'TL', 'n': 1}
+    assert len(client.session.urls) == 1
+    client.close()
+
+    restarted = _client(AsOfCache(path))
+    assert restarted.tokens.get('T', as_of=PAST, raw=True) == {
+        'token/id': 'T', 'token/text-layer': 'TL', 'n': 1}
+    assert restarted.session.urls == []
+
+
+def test_only_settled_history_is_cached(tmp_path):
+    client = _client(AsOfCache(tmp_path / 'c.sqlite'))
+    recent = (datetime.now(timezone.utc) - timedelta(seconds=5)).isoformat()
+    for as_of in (recent, 'yesterday', None):
+        client.tokens.get('T', as_of=as_of)
+        client.tokens.get('T', as_of=as_of)
+    assert len(client.session.urls) == 6
+    assert len(client.as_of_cache) == 0
+
+
+def test_entries_are_scoped_to_the_token(tmp_path):
+    cache = AsOfCache(tmp_path / 'c.sqlite')
+    _client(cache, 'alice').tokens.get('T', as_of=PAST)
+    bob = _client(cache, 'bob')
+    bob.tokens.get('T', as_of=PAST)
+    assert len(bob.session.urls) == 1
+
+
+def test_paginated_as_of_reads_are_cached_per_page(tmp_path):
+    cache = AsOfCache(tmp_path / 'c.sqlite')
+    client = PlaidClient('http://x', 'tok', as_of_cache=cache)
+    pages = iter([{'entries': [{'project/id': 'a'}], 'next-cursor': 'c1'},
+                  {'entries': [{'project/id': 'b'}], 'next-cursor': None}])
+
+    class _Pages(_Sess):
+        def request(self, method, url, **kw):
+            self.urls.append(url)
+            resp = _Resp({})
+            resp.content = json.dumps(next(pages)).encode()
+            return resp
+
+    client.session = _Pages()
+    assert [p['id'] for p in client.projects.list(as_of=PAST)] == ['a', 'b']
+    assert [p['id'] for p in client.projects.list(as_of=PAST)] == ['a', 'b']
+    assert len(client.session.urls) == 2
+
+
+def test_max_bytes_evicts_least_recently_used(tmp_path):
+    cache = AsOfCache(tmp_path / 'c.sqlite', max_bytes=25)
+    cache.put('a', 'application/json', b'x' * 10)
+    cache.put('b', 'application/json', b'x' * 10)
+    assert cache.get('a') is not None           # b is now least recently used
+    cache.put('c', 'application/json', b'x' * 10)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
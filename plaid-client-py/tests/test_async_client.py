@@ -0,0 +1,175 @@
+"""Tests for AsyncPlaidClient — network-free, against a stubbed session.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import AsyncPlaidClient, PlaidAPIError, PlaidClient
+
+
+class _Resp:
+    def __init__(self, status=200, body=None, headers=None):
+        self.status_code = status
+        self.ok = status < 400
+        self.reason = 'OK' if self.ok else 'Error'
+        self.headers = {'content-type': 'application/json', **(headers or {})}
+        self._body = body if body is not None else {}
+        self.text = ''
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+
+class _Sess:
+    """Records every request and tracks the peak number in flight."""
+
+    def __init__(self, respond=None, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self.respond = respond or (lambda kw: _Resp(body={'document/id': 'D', 'layer-id': 'L'}))
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def request(self, **kw):
+        with self._lock:
+            self.calls.append(kw)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            return self.respond(kw)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+def _client(sess, **kw):
+    client = AsyncPlaidClient('http://x', 'tok', **kw)
+    client.sync.session = sess
+    return client
+
+
+def test_methods_are_awaitable_and_transform_responses():
+    sess = _Sess()
+    client = _client(sess)
+    result = asyncio.run(client.documents.get('D', include_body=True))
+    assert result == {'id': 'D', 'layer_id': 'L'}
+    assert sess.calls[0]['url'] == 'http://x/api/v1/documents/D?include-body=true'
+
+
+def test_fan_out_is_bounded_by_max_concurrency():
+    sess = _Sess(delay=0.02)
+    client = _client(sess, max_concurrency=4)
+
+    async def main():
+        return await asyncio.gather(*(client.documents.get(f'D{i}') for i in range(20)))
+
+    results = asyncio.run(main())
+    assert len(results) == 20
+    assert len(sess.calls) == 20
+    assert 1 < sess.peak <= 4
+
+
+def test_audit_message_is_scoped_per_task():
+    sess = _Sess(delay=0.01)
+    client = _client(sess)
+
+    async def write(msg, span_id):
+        with client.audit_message(msg):
+            await asyncio.sleep(0)
+            await client.spans.update(span_id, 'NOUN')
+
+    async def main():
+        await asyncio.gather(write('first', 'S1'), write('second', 'S2'))
+        await client.spans.update('S3', 'VERB')  # no ambient message here
+
+    asyncio.run(main())
+    urls = {kw['url'].split('?')[0].rsplit('/', 1)[1]: kw['url'] for kw in sess.calls}
+    assert 'audit-message=first' in urls['S1']
+    assert 'audit-message=second' in urls['S2']
+    assert 'audit-message' not in urls['S3']
+
+
+def test_strict_mode_stamps_tracked_version():
+    sess = _Sess()
+    client = _client(sess)
+    client.enter_strict_mode('D')
+    client.document_versions['D'] = 'v7'
+    asyncio.run(client.documents.update('D', 'renamed'))
+    assert 'document-version=v7' in sess.calls[0]['url']
+
+
+def test_iter_pages_is_an_async_iterator():
+    pages = iter([
+        _Resp(body={'entries': [{'id': 'a'}], 'next-cursor': 'c1'}),
+        _Resp(body={'entries': [{'id': 'b'}], 'next-cursor': None}),
+    ])
+    client = _client(_Sess(respond=lambda kw: next(pages)))
+
+    async def main():
+        return [[e['id'] for e in page] async for page in client.projects.iter_pages()]
+
+    assert asyncio.run(main()) == [['a'], ['b']]
+
+
+def test_errors_surface_as_plaid_api_error():
+    client = _client(_Sess(respond=lambda kw: _Resp(status=404, body={'error': 'nope'})))
+    with pytest.raises(PlaidAPIError) as exc:
+        asyncio.run(client.tokens.get('T'))
+    assert exc.value.status == 404
+
+
+def test_batched_queues_and_aborts_on_error():
+    client = _client(_Sess())
+
+    async def main():
+        with pytest.raises(ValueError):
+            async with client.batched():
+                await client.spans.update('S1', 'X')
+                assert len(client.sync.batch_operations) == 1
+                raise ValueError('boom')
+        async with client.batched() as b:
+            pass
+        return b.results
+
+    assert asyncio.run(main()) == []
+    assert client.sync.is_batch_mode() is False
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncPlaidClient('http://x', 'tok', max_concurrency=0)
+
+
+def test_aclose_leaves_a_wrapped_client_open():
+    closed = []
+    sync = PlaidClient('http://x', 'tok')
+    sync.close = lambda: closed.append('wrapped')
+
+    async def wrapped():
+        async with AsyncPlaidClient.from_client(sync):
+            pass
+
+    asyncio.run(wrapped())
+    assert closed == []
+
+    owned = AsyncPlaidClient('http://x', 'tok')
+    owned.sync.close = lambda: closed.append('owned')
+    asyncio.run(owned.aclose())
+    assert closed == ['owned']
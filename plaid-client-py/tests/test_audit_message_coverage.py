@@ -21,10 +21,7 @@ class _Resp:
     status_code = 200
     headers = {}
     text = ''
-    content = b''
-
-    def json(self):
-        return {}
+    content = b'{}'
 
 
 def test_every_write_method_threads_audit_message():
@@ -1,6 +1,7 @@
 """Tests for the client.batched() context manager — the network-free paths
-(empty submit + abort-on-exception). The happy submit path needs a live server
-and is covered by the services' integration tests.
+(empty submit + abort-on-exception) — and for chunked submission against a
+stubbed session. The happy single-batch path against a real server is covered
+by the services' integration tests.
 
 Run with::
 
@@ -12,8 +13,11 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import json
+
 import pytest
-from plaid_client import PlaidClient
+from plaid_client import PlaidClient, PlaidAPIError, PartialBatchError
+from plaid_client.http import MAX_BATCH_OPS
 
 
 def _client():
@@ -50,6 +54,118 @@ def test_block_opens_batch_mode():
     assert c.is_batch_mode() is False
 
 
+class _BatchResp:
+    def __init__(self, ops, status=200, version=None):
+        self.status_code = status
+        self.ok = status < 400
+        self.reason = 'OK' if self.ok else 'Bad Request'
+        self.headers = {}
+        self.text = ''
+        headers = {'X-Document-Versions': json.dumps({'D': version})} if version else {}
+        self._body = ([{'status': 200, 'headers': headers, 'body': {'token/id': op['path']}}
+                       for op in ops] if self.ok else {'error': 'rolled back'})
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+
+class _BatchSess:
+    """Answers each /batch POST; ``fail_on`` is a set of 0-based call numbers
+    that should come back as a rolled-back 400."""
+
+    def __init__(self, fail_on=()):
+        self.sent = []
+        self.fail_on = set(fail_on)
+
+    def post(self, url, data=None, **kw):
+        ops = json.loads(data)
+        n = len(self.sent)
+        self.sent.append(ops)
+        return _BatchResp(ops, status=400 if n in self.fail_on else 200, version=f'v{n + 2}')
+
+
+def _queue_updates(c, n):
+    for i in range(n):
+        c.tokens.update(f'T{i}', begin=i)
+
+
+def test_oversized_batch_fails_fast_without_sending():
+    c = _client()
+    c.session = _BatchSess()
+    c.begin_batch()
+    _queue_updates(c, MAX_BATCH_OPS + 1)
+    with pytest.raises(PlaidAPIError) as exc:
+        c.submit_batch()
+    assert 'chunk_size' in str(exc.value)
+    assert c.session.sent == []
+    assert c.is_batch_mode() is False
+
+
+def test_chunked_submit_splits_and_keeps_op_order():
+    c = _client()
+    c.session = _BatchSess()
+    with c.batched(chunk_size=4) as b:
+        _queue_updates(c, 10)
+    assert [len(ops) for ops in c.session.sent] == [4, 4, 2]
+    assert [r['body']['id'] for r in b.results] == [f'/api/v1/tokens/T{i}' for i in range(10)]
+
+
+def test_concurrent_chunks_return_results_in_op_order():
+    c = _client()
+    c.session = _BatchSess()
+    with c.batched(chunk_size=3, max_workers=4) as b:
+        _queue_updates(c, 10)
+    assert len(c.session.sent) == 4
+    assert [r['body']['id'] for r in b.results] == [f'/api/v1/tokens/T{i}' for i in range(10)]
+
+
+def test_partial_failure_reports_committed_chunks():
+    c = _client()
+    c.session = _BatchSess(fail_on={1})
+    c.begin_batch()
+    _queue_updates(c, 7)
+    with pytest.raises(PartialBatchError) as exc:
+        c.submit_batch(chunk_size=3)
+    err = exc.value
+    assert err.chunks == [(0, 3), (3, 6), (6, 7)]
+    assert err.committed == [0]
+    assert list(err.failed) == [1] and err.status == 400
+    assert err.skipped == [2]
+    assert [r is not None for r in err.results] == [True] * 3 + [False] * 4
+    assert len(c.session.sent) == 2  # stopped at the failed chunk
+    assert c.is_batch_mode() is False
+
+
+def test_first_chunk_failure_is_a_plain_atomic_error():
+    c = _client()
+    c.session = _BatchSess(fail_on={0})
+    c.begin_batch()
+    _queue_updates(c, 5)
+    with pytest.raises(PlaidAPIError) as exc:
+        c.submit_batch(chunk_size=2)
+    assert not isinstance(exc.value, PartialBatchError)
+
+
+def test_strict_mode_restamps_each_chunk_with_the_previous_version():
+    c = _client()
+    c.session = _BatchSess()
+    c.enter_strict_mode('D')
+    c.document_versions['D'] = 'v1'
+    with c.batched(chunk_size=2):
+        _queue_updates(c, 5)
+    stamps = [[('document-version=' in op['path']) for op in ops] for ops in c.session.sent]
+    assert stamps == [[True, False], [True, False], [True]]
+    assert 'document-version=v1' in c.session.sent[0][0]['path']
+    assert 'document-version=v2' in c.session.sent[1][0]['path']
+    assert 'document-version=v3' in c.session.sent[2][0]['path']
+
+    c.begin_batch()
+    _queue_updates(c, 3)
+    with pytest.raises(ValueError):
+        c.submit_batch(chunk_size=2, max_workers=2)
+
+
 if __name__ == '__main__':
     test_empty_block_submits_nothing_and_leaves_no_batch_open()
     test_exception_in_block_aborts_and_clears_batch()
@@ -0,0 +1,150 @@
+"""Tests for size-aware bulk_create splitting + id stitching — network-free.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import PlaidClient, PartialBatchError, http
+from plaid_client.http import split_bulk_body
+
+
+class _Resp:
+    def __init__(self, body, status=200):
+        self.status_code = status
+        self.ok = status < 400
+        self.reason = 'OK' if self.ok else 'Bad Request'
+        self.headers = {'content-type': 'application/json'}
+        self._body = body
+        self.text = ''
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+
+class _BulkSess:
+    """Answers bulk POSTs with one id per item (``<value>-id``) and batch
+    POSTs with one result per op; ``fail_on`` holds 0-based bulk call numbers
+    that should fail."""
+
+    def __init__(self, fail_on=()):
+        self.bulk_bodies = []
+        self.batches = []
+        self.fail_on = set(fail_on)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, data=None, **kw):
+        items = json.loads(data)
+        with self._lock:
+            n = len(self.bulk_bodies)
+            self.bulk_bodies.append(items)
+        if n in self.fail_on:
+            return _Resp({'error': 'boom'}, status=400)
+        return _Resp({'ids': [f"{item['value']}-id" for item in items]})
+
+    def post(self, url, data=None, **kw):
+        ops = json.loads(data)
+        self.batches.append(ops)
+        return _Resp([{'status': 201, 'headers': {},
+                       'body': {'ids': [f"{item['value']}-id" for item in op['body']]}}
+                      for op in ops])
+
+
+def _spans(n):
+    return [{'span_layer_id': 'L', 'tokens': ['T'], 'value': f'v{i}'} for i in range(n)]
+
+
+def _client(**kw):
+    client = PlaidClient('http://x', 'tok', **kw)
+    client.session = _BulkSess()
+    return client
+
+
+def test_split_respects_op_and_byte_limits():
+    items = [{'value': 'x' * 10}] * 10  # each encodes to 23 bytes + comma
+    assert split_bulk_body(items, max_ops=4, max_bytes=10_000) == [(0, 4), (4, 8), (8, 10)]
+    assert split_bulk_body(items, max_ops=100, max_bytes=2 + 24 * 3) == [
+        (0, 3), (3, 6), (6, 9), (9, 10)]
+    # an item bigger than the byte limit still gets a chunk of its own
+    assert split_bulk_body([{'value': 'x' * 100}], max_ops=10, max_bytes=5) == [(0, 1)]
+
+
+def test_splitting_is_off_by_default():
+    client = _client()
+    client.spans.bulk_create(_spans(50))
+    assert len(client.session.bulk_bodies) == 1
+
+
+def test_split_bulk_create_stitches_ids_in_input_order():
+    client = _client(bulk_chunk_ops=7)
+    result = client.spans.bulk_create(_spans(20))
+    assert [len(b) for b in client.session.bulk_bodies] == [7, 7, 6]
+    assert result == {'ids': [f'v{i}-id' for i in range(20)]}
+    # items went out in wire format
+    assert 'span-layer-id' in client.session.bulk_bodies[0][0]
+
+
+def test_pipelined_chunks_still_stitch_in_order():
+    client = _client(bulk_chunk_ops=3, bulk_max_workers=4)
+    result = client.relations.bulk_create(_spans(10))
+    assert result == {'ids': [f'v{i}-id' for i in range(10)]}
+
+
+def test_chunked_false_sends_one_request():
+    client = _client(bulk_chunk_ops=2)
+    client.tokens.bulk_create(_spans(5), chunked=False)
+    assert len(client.session.bulk_bodies) == 1
+
+
+def test_chunked_true_uses_default_limits():
+    client = _client()
+    client.spans.bulk_create(_spans(2001), chunked=True)
+    assert [len(b) for b in client.session.bulk_bodies] == [2000, 1]
+
+
+def test_partial_failure_reports_committed_chunks():
+    client = _client(bulk_chunk_ops=4)
+    client.session.fail_on = {1}
+    with pytest.raises(PartialBatchError) as exc:
+        client.spans.bulk_create(_spans(10))
+    err = exc.value
+    assert err.committed == [0] and list(err.failed) == [1] and err.skipped == [2]
+    assert err.results[:4] == [f'v{i}-id' for i in range(4)]
+    assert err.results[4:] == [None] * 6
+
+
+def test_split_inside_batch_yields_one_stitched_result_per_call():
+    client = _client(bulk_chunk_ops=3)
+    with client.batched() as b:
+        client.spans.bulk_create(_spans(2))
+        client.spans.bulk_create(_spans(8))   # queued as 3 sub-ops
+        client.spans.bulk_create(_spans(1))
+    assert len(client.session.batches[0]) == 5
+    assert len(b.results) == 3
+    assert b.results[1]['body']['ids'] == [f'v{i}-id' for i in range(8)]
+    assert b.results[2]['body']['ids'] == ['v0-id']
+
+
+def test_chunks_are_transformed_one_at_a_time(monkeypatch):
+    sizes = []
+    transform = http.transform_request
+
+    def counting(body):
+        sizes.append(len(body) if isinstance(body, list) else 1)
+        return transform(body)
+
+    monkeypatch.setattr(http, 'transform_request', counting)
+    client = _client(bulk_chunk_ops=4)
+    assert len(client.spans.bulk_create(_spans(10))['ids']) == 10
+    # Never a transformed copy of the whole body: at most one chunk's worth.
+    assert max(sizes) == 4
+    assert client.session.bulk_bodies[0][0]['span-layer-id'] == 'L'
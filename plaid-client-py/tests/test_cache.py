@@ -0,0 +1,161 @@
+"""Tests for the version-aware DocumentCache — network-free.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import DocumentCache, PlaidClient
+
+
+class _Resp:
+    def __init__(self, body, version=None):
+        self.status_code = 200
+        self.ok = True
+        self.headers = {'content-type': 'application/json'}
+        if version is not None:
+            self.headers['X-Document-Versions'] = json.dumps({'D': version})
+        self.content = json.dumps(body).encode()
+
+
+class _Server:
+    """Serves document D at a version that each write bumps."""
+
+    def __init__(self):
+        self.version = 1
+        self.calls = []
+
+    def request(self, method, url, **kw):
+        self.calls.append((method, url))
+        if method != 'GET':
+            self.version += 1
+            return _Resp({'span/id': 'S'}, self.version)
+        return _Resp({'document/id': 'D', 'document/version': self.version,
+                      'document/text-layers': [{'text-layer/id': 'TL'}]}, self.version)
+
+    def close(self):
+        pass
+
+    def gets(self):
+        return sum(1 for m, _ in self.calls if m == 'GET')
+
+
+def _client(**cache_kw):
+    server = _Server()
+    client = PlaidClient('http://x', 'tok', session=server,
+                         document_cache=DocumentCache(**cache_kw) if cache_kw else True)
+    return client, server
+
+
+def test_repeated_reads_are_served_locally_as_fresh_copies():
+    client, server = _client()
+    first = client.documents.get('D', include_body=True)
+    first['text_layers'].clear()
+    second = client.documents.get('D', include_body=True)
+    assert server.gets() == 1
+    assert second == {'id': 'D', 'version': 1, 'text_layers': [{'id': 'TL'}]}
+    assert client.documents.get('D', include_body=True, raw=True)['document/version'] == 1
+    assert client.document_cache.hits == 2
+
+
+def test_write_through_the_client_invalidates():
+    client, server = _client()
+    client.documents.get('D', include_body=True)
+    client.spans.update('S', 'NOUN')
+    assert client.documents.get('D', include_body=True)['version'] == 2
+    assert server.gets() == 2
+
+
+def test_service_workers_see_each_others_writes():
+    from plaid_client import BaseService
+
+    class Svc(BaseService):
+        def process_request(self, request_data, response_helper):
+            pass
+
+    svc = Svc('t:cache', 'Cache', 'short', workers=2)
+    svc.client, server = _client()
+    a, b = svc.create_worker_client(), svc.create_worker_client()
+    assert b.documents.get('D', include_body=True)['version'] == 1
+    a.spans.update('S', 'NOUN')
+    assert b.documents.get('D', include_body=True)['version'] == 2
+    assert svc.client.document_versions == {'D': 2} and server.gets() == 2
+
+
+def test_include_body_and_as_of_are_not_conflated():
+    client, server = _client()
+    client.documents.get('D', include_body=True)
+    client.documents.get('D')
+    client.documents.get('D', as_of='2024-01-01T00:00:00Z')
+    client.documents.get('D', as_of='2024-01-01T00:00:00Z')
+    assert server.gets() == 4
+
+
+def test_clients_of_other_identities_do_not_share_entries():
+    cache = DocumentCache()
+    server = _Server()
+    for url, token in (('http://x', 'tok'), ('http://x', 'other'), ('http://y', 'tok')):
+        client = PlaidClient(url, token, session=server, document_cache=cache)
+        client.documents.get('D', include_body=True)
+    assert server.gets() == 3 and len(cache) == 3 and cache.hits == 0
+    client = PlaidClient('http://x', 'tok', session=server, document_cache=cache)
+    client.document_versions['D'] = 1
+    client.documents.get('D', include_body=True)
+    assert server.gets() == 3 and cache.hits == 1
+    client.documents.delete('D')
+    assert len(cache) == 0
+
+
+def test_delete_drops_cached_entries():
+    client, server = _client()
+    client.documents.get('D')
+    client.documents.delete('D')
+    assert len(client.document_cache) == 0
+
+
+def test_bypassed_inside_a_batch():
+    client, server = _client()
+    client.begin_batch()
+    assert client.documents.get('D') == {'batched': True}
+    client.abort_batch()
+    assert len(client.document_cache) == 0 and server.calls == []
+
+
+def test_ttl_expires_entries():
+    client, server = _client(ttl=-1)
+    client.documents.get('D')
+    client.documents.get('D')
+    assert server.gets() == 2
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = DocumentCache(max_entries=2, max_bytes=10)
+    cache.put(('a', True), 1, b'1234')
+    cache.put(('b', True), 1, b'1234')
+    assert cache.get(('a', True), 1) == b'1234'   # a is now most recent
+    cache.put(('c', True), 1, b'1234')
+    assert cache.get(('b', True), 1) is None
+    assert cache.get(('a', True), 1) == b'1234'
+    cache.put(('d', True), 1, b'1234567')           # over max_bytes: evicts LRU
+    assert len(cache) == 1 and cache.nbytes == 7
+    cache.put(('e', True), 1, b'x' * 11)            # larger than the cache
+    assert cache.get(('e', True), 1) is None
+    assert cache.evictions == 3
+
+
+def test_version_mismatch_is_a_miss():
+    cache = DocumentCache()
+    cache.put(('D', True), 1, b'{}')
+    assert cache.get(('D', True), 2) is None
+
+
+def test_bounds_must_be_positive():
+    with pytest.raises(ValueError):
+        DocumentCache(max_entries=0)
@@ -0,0 +1,65 @@
+"""Tests for the pluggable JSON codec.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import codec
+from plaid_client.codec import ORJSON, STDLIB, get_json_codec, set_json_codec
+from plaid_client.http import iter_json_array
+
+CODECS = [STDLIB] + ([ORJSON] if ORJSON is not None else [])
+PAYLOAD = {'document/id': 'D', 'text/body': 'Zürich — 東京', 'n': [1, 2.5, None, True],
+           'metadata': {'nested-key': {'deep': []}}}
+
+
+@pytest.fixture(params=CODECS, ids=lambda c: c.name)
+def active(request):
+    previous = set_json_codec(request.param)
+    yield request.param
+    set_json_codec(previous)
+
+
+def test_round_trip_and_bytes_output(active):
+    encoded = codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded) == PAYLOAD
+    assert codec.loads(encoded.decode('utf-8')) == PAYLOAD
+
+
+def test_decode_errors_are_json_decode_errors(active):
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{not json')
+
+
+def test_values_outside_the_fast_path_still_encode(active):
+    big = 2 ** 70
+    assert json.loads(codec.dumps({'big': big, 1: 'int key'})) == {'big': big, '1': 'int key'}
+
+
+def test_streamed_array_matches_codec_output(active):
+    items = [dict(PAYLOAD, i=i) for i in range(50)]
+    streamed = b''.join(iter_json_array(items, chunk_bytes=64))
+    assert json.loads(streamed) == items
+
+
+def test_auto_prefers_orjson_when_installed():
+    previous = set_json_codec('auto')
+    try:
+        assert get_json_codec() is (ORJSON or STDLIB)
+    finally:
+        set_json_codec(previous)
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError):
+        set_json_codec('yaml')
@@ -0,0 +1,134 @@
+"""Tests for conditional GETs (ETag / Last-Modified revalidation).
+
+Runs against a throwaway local HTTP server that emits validators and answers
+``304 Not Modified``, so it needs no Plaid server.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import ConditionalCache, PlaidClient
+
+
+class _VersionedDocs(BaseHTTPRequestHandler):
+    """GET /api/v1/documents/<id> carries ``ETag: "<version>"``; any PATCH bumps
+    the version. /api/v1/projects/<id> uses Last-Modified; /api/v1/users/<id>
+    sends no validator at all."""
+    version = 1
+    log = []
+
+    def _send(self, status, body=None, headers=()):
+        payload = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        cls = type(self)
+        path = self.path.split('?')[0]
+        if path.startswith('/api/v1/documents/'):
+            etag = f'"{cls.version}"'
+            versions = ('X-Document-Versions', json.dumps({'D': cls.version}))
+            if self.headers.get('If-None-Match') == etag:
+                cls.log.append(304)
+                return self._send(304, headers=[('ETag', etag), versions])
+            cls.log.append(200)
+            return self._send(200, {'document/id': 'D', 'document/version': cls.version,
+                                    'document/text-layers': [{'text-layer/id': 'TL'}] * 50},
+                              headers=[('ETag', etag), versions])
+        if path.startswith('/api/v1/projects/'):
+            stamp = 'Wed, 01 Jan 2025 00:00:00 GMT'
+            if self.headers.get('If-Modified-Since') == stamp:
+                cls.log.append(304)
+                return self._send(304)
+            cls.log.append(200)
+            return self._send(200, {'project/id': 'P', 'project/name': 'p'},
+                              headers=[('Last-Modified', stamp)])
+        cls.log.append(200)
+        return self._send(200, {'user/id': 'U'})
+
+    def do_PATCH(self):
+        type(self).version += 1
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self._send(200, {'document/id': 'D'},
+                   headers=[('X-Document-Versions', json.dumps({'D': type(self).version}))])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _VersionedDocs.version = 1
+    _VersionedDocs.log = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _VersionedDocs)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_unchanged_document_is_revalidated_not_redownloaded(server):
+    client = PlaidClient(server, 'tok', conditional_cache=True)
+    first = client.documents.get('D', include_body=True)
+    second = client.documents.get('D', include_body=True)
+    assert _VersionedDocs.log == [200, 304]
+    assert second == first and second is not first
+    assert client.document_versions['D'] == 1
+    assert client.conditional_cache.hits == 1
+
+
+def test_changed_document_is_downloaded_again(server):
+    client = PlaidClient(server, 'tok', conditional_cache=True)
+    client.documents.get('D', include_body=True)
+    client.documents.update('D', 'renamed')
+    assert client.documents.get('D', include_body=True)['version'] == 2
+    assert client.documents.get('D', include_body=True, raw=True)['document/version'] == 2
+    assert _VersionedDocs.log == [200, 200, 304]
+
+
+def test_last_modified_validator(server):
+    client = PlaidClient(server, 'tok', conditional_cache=True)
+    assert client.projects.get('P') == client.projects.get('P') == {'id': 'P', 'name': 'p'}
+    assert _VersionedDocs.log == [200, 304]
+
+
+def test_responses_without_validators_are_not_kept(server):
+    client = PlaidClient(server, 'tok', conditional_cache=True)
+    client.users.get('U')
+    client.users.get('U')
+    assert _VersionedDocs.log == [200, 200]
+    assert len(client.conditional_cache) == 0
+
+
+def test_off_by_default(server):
+    client = PlaidClient(server, 'tok')
+    client.documents.get('D')
+    client.documents.get('D')
+    assert _VersionedDocs.log == [200, 200]
+
+
+def test_cache_is_memory_bounded(server):
+    cache = ConditionalCache(max_entries=8, max_bytes=2048)
+    client = PlaidClient(server, 'tok', conditional_cache=cache)
+    for i in range(5):
+        client.documents.get(f'D{i}', include_body=True)
+    assert cache.nbytes <= 2048
+    assert cache.evictions > 0
@@ -0,0 +1,61 @@
+"""Tests for the workflows IntervalIndex.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.intervals import IntervalIndex
+
+
+def _tok(begin, end, name=None):
+    return {'id': name or f'{begin}-{end}', 'begin': begin, 'end': end}
+
+
+def test_within_matches_a_scan():
+    rng = random.Random(7)
+    tokens = []
+    for _ in range(300):
+        b = rng.randrange(200)
+        tokens.append(_tok(b, b + rng.randrange(15)))
+    index = IntervalIndex(tokens)
+    for _ in range(200):
+        b = rng.randrange(200)
+        e = b + rng.randrange(40)
+        expected = sorted((t for t in tokens if b <= t['begin'] and t['end'] <= e),
+                          key=lambda t: (t['begin'], t['end']))
+        assert index.within(b, e) == expected
+
+
+def test_find_container_partition_and_first_match():
+    sentences = [_tok(0, 12), _tok(12, 20), _tok(20, 20), _tok(20, 31)]
+    index = IntervalIndex(sentences)
+    assert index.find_container(3, 7) == 0
+    assert index.find_container(12, 12) == 0  # on a boundary: the first sentence wins
+    assert index.find_container(20, 25) == 3
+    assert index.find_container(30, 40) is None
+    assert index.find_containers([_tok(0, 1), _tok(25, 31), _tok(40, 41)]) == [0, 3, None]
+
+
+def test_find_container_with_nested_and_unsorted_items():
+    # Positions refer to the input order, and the first containing item wins
+    # even when it is long and begins far to the left.
+    items = [_tok(50, 60), _tok(0, 100), _tok(55, 58)]
+    index = IntervalIndex(items)
+    assert index.find_container(56, 57) == 0
+    assert index.find_container(10, 20) == 1
+    assert index.find_container(90, 101) is None
+
+
+def test_custom_key():
+    spans = [(5, 9), (0, 4)]
+    index = IntervalIndex(spans, key=lambda s: s)
+    assert index.items == [(0, 4), (5, 9)]
+    assert index.within(0, 9) == [(0, 4), (5, 9)]
+    assert index.find_container(6, 7) == 0
@@ -0,0 +1,250 @@
+"""Tests for the per-project layer index and its shared, audit-refreshed registry.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client import ROLES, LayerIndex, find_by_role
+from plaid_client.layer_index import (LAYER_INDEX_TTL_S, LayerIndexRegistry, is_layer_change,
+                                      layer_indexes)
+
+
+def _role(role):
+    return {'plaid': {'role': role}}
+
+
+def _project():
+    deprel = {'id': 'R-dep', 'name': 'Deprel', 'config': {'ud': {'dependency': True}}}
+    other_rel = {'id': 'R-other', 'name': 'Other'}
+    return {
+        'id': 'P',
+        'text_layers': [
+            {'id': 'TXT', 'name': 'Text', 'config': _role('baseline'), 'token_layers': [
+                {'id': 'SENT', 'name': 'Sentences', 'config': _role('sentence')},
+                {'id': 'WORD', 'name': 'Words', 'config': _role('word')},
+                {'id': 'MORPH', 'name': 'Morphemes', 'config': _role('syntactic-word'),
+                 'span_layers': [
+                     {'id': 'S-form', 'name': 'Form', 'config': {'ud': {'form': True}}},
+                     {'id': 'S-lemma', 'name': 'Lemma', 'config': {'ud': {'lemma': True}},
+                      'relation_layers': [other_rel, deprel]},
+                     {'id': 'S-upos', 'name': 'UPOS'},  # untagged: found by name
+                 ]},
+            ]},
+            {'id': 'TXT2', 'name': 'Gloss', 'token_layers': [
+                {'id': 'WORD2', 'config': _role('word')},
+            ]},
+        ],
+    }
+
+
+def test_roles_match_find_by_role():
+    project = _project()
+    index = LayerIndex.from_project(project)
+    baseline = index.by_role(ROLES.BASELINE)
+    assert baseline is find_by_role(project['text_layers'], ROLES.BASELINE)
+    token_layers = baseline['token_layers']
+    for role in (ROLES.SENTENCE, ROLES.WORD, ROLES.SYNTACTIC_WORD, ROLES.MORPHEME):
+        assert index.by_role(role, parent_id='TXT') is find_by_role(token_layers, role)
+    assert index.by_role(ROLES.WORD, parent_id='TXT2')['id'] == 'WORD2'
+    assert index.by_role(ROLES.WORD)['id'] == 'WORD'  # first in tree order
+    assert index.project_id == 'P'
+
+
+def test_ud_config_and_relation_lookups():
+    index = LayerIndex.from_project(_project())
+    assert index.span_layer_by_ud_config('MORPH', 'form', 'Form')['id'] == 'S-form'
+    assert index.span_layer_by_ud_config('MORPH', 'upos', 'UPOS')['id'] == 'S-upos'
+    assert index.span_layer_by_ud_config('MORPH', 'xpos', 'XPOS') is None
+    assert index.span_layer_by_ud_config('WORD', 'form') is None
+    assert index.relation_layer_by_ud_config('S-lemma', 'dependency')['id'] == 'R-dep'
+    # No flag: the fallback index, clamped to the first layer.
+    assert index.relation_layer_by_ud_config('S-lemma', 'missing')['id'] == 'R-other'
+    assert index.relation_layer_by_ud_config('S-lemma', 'missing', 5)['id'] == 'R-other'
+    assert index.relation_layer_by_ud_config('S-form', 'dependency') is None
+    assert [r['id'] for r in index.relation_layers('S-lemma')] == ['R-other', 'R-dep']
+
+
+def test_id_and_parent_lookups():
+    index = LayerIndex(_project()['text_layers'])
+    assert 'R-dep' in index and 'nope' not in index
+    assert index.layer('S-lemma')['name'] == 'Lemma'
+    assert index.parent_id('R-dep') == 'S-lemma'
+    assert index.parent_id('MORPH') == 'TXT'
+    assert index.parent_id('TXT') is None
+    assert [t['id'] for t in index.children('TXT')] == ['SENT', 'WORD', 'MORPH']
+
+
+def test_is_layer_change():
+    def audit(*types):
+        return {'ops': [{'type': t} for t in types]}
+    assert is_layer_change('audit-log', audit('span_layer:update'))
+    assert is_layer_change('audit-log', audit('token:create', 'layer:assoc_editor_config_pair'))
+    assert not is_layer_change('audit-log', audit('token:create', 'span:update'))
+    assert not is_layer_change('message', audit('span_layer:update'))
+    assert not is_layer_change('audit-log', None)
+
+
+# --- registry ---------------------------------------------------------------
+
+class _Watcher:
+    def __init__(self, on_event, state=1):
+        self.on_event = on_event
+        self.ready_state = state
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        self.ready_state = 2
+
+
+class _Client:
+    """Just enough client: projects.get and messages.listen."""
+
+    def __init__(self, token='tok', watcher_state=1):
+        self.base_url = 'http://x'
+        self.token = token
+        self.watcher_state = watcher_state
+        self.gets = 0
+        self.watchers = []
+        self.projects = self
+        self.messages = self
+
+    def get(self, project_id, raw=None):
+        assert raw is False
+        self.gets += 1
+        return _project()
+
+    def listen(self, project_id, on_event, mux=None, resume=None):
+        watcher = _Watcher(on_event, self.watcher_state)
+        watcher.resume, watcher.mux = resume, mux
+        self.watchers.append(watcher)
+        return watcher
+
+
+def test_registry_fetches_once_and_shares():
+    registry = LayerIndexRegistry(watch=True)
+    client = _Client()
+    first = registry.get(client, 'P')
+    assert registry.get(client, 'P') is first
+    assert registry.get(_Client(), 'P') is first  # same server + token: shared
+    assert client.gets == 1 and len(client.watchers) == 1
+    # Different credentials never share an index.
+    registry.get(_Client(token='other'), 'P')
+    assert registry.fetches == 2
+
+
+def test_layer_audit_event_refreshes():
+    registry = LayerIndexRegistry(watch=True)
+    client = _Client()
+    first = registry.get(client, 'P')
+    watcher = client.watchers[0]
+    watcher.on_event('audit-log', {'ops': [{'type': 'token:create'}]})
+    assert registry.get(client, 'P') is first
+    watcher.on_event('audit-log', {'ops': [{'type': 'span_layer:create'}]})
+    assert registry.get(client, 'P') is not first
+    assert client.gets == 2
+
+
+def test_dropped_stream_is_reopened_and_not_trusted_until_open():
+    registry = LayerIndexRegistry(watch=True)
+    client = _Client()
+    registry.get(client, 'P')
+    client.watchers[0].close()
+    client.watcher_state = 0  # reconnecting
+    registry.get(client, 'P')
+    registry.get(client, 'P')
+    assert len(client.watchers) == 2
+    assert client.gets == 3  # nothing vouches for the copy yet
+    client.watchers[1].ready_state = 1
+    registry.get(client, 'P')
+    registry.get(client, 'P')
+    assert client.gets == 4
+
+
+def test_resumed_stream_keeps_the_index_unless_a_missed_event_changes_layers():
+    registry = LayerIndexRegistry(watch=True)
+    client = _Client()
+    first = registry.get(client, 'P')
+    resume = client.watchers[0].resume
+    resume._opened()  # the stream opened: there is a point to resume from
+    client.watchers[0].close()
+    client.watcher_state = 0  # catching up
+    assert registry.get(client, 'P') is not first  # not served meanwhile
+    watcher = client.watchers[1]
+    assert watcher.resume is resume and client.gets == 2
+    watcher.on_event('audit-log', {'ops': [{'type': 'token:create'}]})  # missed
+    watcher.ready_state = 1
+    assert registry.get(client, 'P') is first
+    assert client.gets == 2
+
+    watcher.close()
+    client.watcher_state = 1
+    assert registry.get(client, 'P') is first
+    client.watchers[2].on_event('audit-log', {'ops': [{'type': 'span_layer:create'}]})
+    assert registry.get(client, 'P') is not first and client.gets == 3
+
+
+def test_watchers_open_on_the_registry_multiplexer():
+    mux = object()
+    registry = LayerIndexRegistry(watch=True, mux=mux)
+    client = _Client()
+    registry.get(client, 'P')
+    registry.get(client, 'Q')
+    assert [w.mux for w in client.watchers] == [mux, mux]
+
+
+def test_watch_on_and_stop_watching():
+    registry = LayerIndexRegistry()
+    client = _Client()
+    first = registry.get(client, 'P')
+    mux = object()
+    assert registry.watch_on(mux) and not registry.watch_on(object())
+    assert registry.get(client, 'P') is not first  # nothing vouched for it
+    watcher = client.watchers[0]
+    assert watcher.mux is mux
+    registry.stop_watching()
+    assert watcher.closed and registry.mux is None
+    assert registry.get(client, 'P') is registry.get(client, 'P')
+    assert len(client.watchers) == 1 and client.gets == 2
+
+
+def test_shared_registry_does_not_watch():
+    client = _Client()
+    assert not layer_indexes.watch and layer_indexes.ttl == LAYER_INDEX_TTL_S
+    try:
+        layer_indexes.get(client, 'P')
+        assert client.watchers == []
+    finally:
+        layer_indexes.invalidate('P')
+
+
+def test_unwatched_registry_invalidation_and_ttl():
+    registry = LayerIndexRegistry(watch=False)
+    client = _Client()
+    registry.get(client, 'P')
+    registry.get(client, 'P')
+    assert client.watchers == [] and client.gets == 1
+    registry.note_event('P', 'audit-log', {'ops': [{'type': 'relation_layer:delete'}]})
+    registry.get(client, 'P')
+    registry.invalidate()
+    registry.get(client, 'P')
+    registry.get(client, 'P', refresh=True)
+    assert client.gets == 4
+    expiring = LayerIndexRegistry(watch=False, ttl=0)
+    expiring.get(client, 'P')
+    expiring.get(client, 'P')
+    assert client.gets == 6
+
+
+def test_close_closes_streams():
+    registry = LayerIndexRegistry(watch=True)
+    client = _Client()
+    registry.get(client, 'P')
+    registry.close()
+    assert client.watchers[0].closed
@@ -16,12 +16,13 @@ The tests also run with no dependencies via::
 
 import os
 import sys
+import time
 
 # Make ``plaid_client`` importable when running this file directly.
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from plaid_client import http
-from plaid_client.http import list_all, iter_pages
+from plaid_client.http import list_all, iter_all, iter_pages
 
 
 class _FakeClient:
@@ -177,6 +178,145 @@ def test_list_page_works_when_batching(monkeypatch):
     assert len(calls) == 1
 
 
+def _numbered_pages(n):
+    return [{'entries': [{'id': i}], 'next_cursor': f'c{i}' if i < n - 1 else None}
+            for i in range(n)]
+
+
+def test_prefetch_returns_the_same_pages_in_order(monkeypatch):
+    calls = []
+    _patch(monkeypatch, _three_page_sequence(), calls)
+    assert [x['id'] for x in list_all(_FakeClient(), '/api/v1/things', prefetch=2)] == \
+        ['a', 'b', 'c', 'd', 'e']
+    assert [c['cursor'] for c in calls] == [None, 'c1', 'c2']
+
+
+def test_prefetch_reads_ahead_at_most_depth_pages(monkeypatch):
+    calls = []
+    _patch(monkeypatch, _numbered_pages(10), calls)
+
+    pages = iter_pages(_FakeClient(), '/api/v1/things', prefetch=2)
+    assert next(pages) == [{'id': 0}]
+    time.sleep(0.2)
+    # page 0 consumed, 2 queued, 1 fetched and waiting for room
+    assert len(calls) == 4
+    assert [p[0]['id'] for p in pages] == list(range(1, 10))
+
+
+def test_closing_a_prefetching_iterator_stops_fetching(monkeypatch):
+    calls = []
+    _patch(monkeypatch, _numbered_pages(50), calls)
+
+    pages = iter_pages(_FakeClient(), '/api/v1/things', prefetch=1)
+    next(pages)
+    pages.close()
+    time.sleep(0.2)
+    fetched = len(calls)
+    time.sleep(0.1)
+    assert len(calls) == fetched <= 3
+
+
+def test_prefetch_surfaces_errors_from_the_background_fetch(monkeypatch):
+    calls = []
+    _patch(monkeypatch, [
+        {'entries': [{'id': 'a'}], 'next_cursor': 'stuck'},
+        {'entries': [{'id': 'b'}], 'next_cursor': 'stuck'},
+    ], calls)
+
+    seen = []
+    raised = False
+    try:
+        for page in iter_pages(_FakeClient(), '/api/v1/things', prefetch=2):
+            seen.extend(x['id'] for x in page)
+    except RuntimeError as e:
+        raised = True
+        assert 'did not advance' in str(e)
+    assert raised, 'expected RuntimeError on non-advancing cursor'
+    assert seen == ['a', 'b']
+
+
+def test_iter_all_yields_entries_lazily(monkeypatch):
+    calls = []
+    _patch(monkeypatch, _three_page_sequence(), calls)
+
+    entries = iter_all(_FakeClient(), '/api/v1/things')
+    assert calls == [], 'nothing is fetched before iteration starts'
+    assert next(entries) == {'id': 'a'}
+    assert next(entries) == {'id': 'b'}
+    assert len(calls) == 1, 'the second page is fetched only when needed'
+    assert [x['id'] for x in entries] == ['c', 'd', 'e']
+    assert len(calls) == 3
+
+
+def test_iter_all_accepts_a_bare_list_response(monkeypatch):
+    calls = []
+    _patch(monkeypatch, [[{'id': 'a'}, {'id': 'b'}]], calls)
+
+    assert [x['id'] for x in iter_all(_FakeClient(), '/api/v1/things')] == ['a', 'b']
+    assert len(calls) == 1
+
+
+def test_resource_iter_all_streams_project_documents(monkeypatch):
+    from plaid_client import PlaidClient
+
+    calls = []
+    _patch(monkeypatch, _three_page_sequence(), calls)
+
+    client = PlaidClient('http://x', 'tok')
+    docs = client.projects.iter_all_documents('P', page_size=2)
+    assert next(docs) == {'id': 'a'}
+    assert calls == [{'method': 'GET', 'path': '/api/v1/projects/P/documents', 'cursor': None}]
+    assert [d['id'] for d in docs] == ['b', 'c', 'd', 'e']
+
+
+def test_batch_opened_mid_iteration_does_not_capture_page_reads(monkeypatch):
+    import json
+    import threading
+    from urllib.parse import parse_qs, urlsplit
+
+    from plaid_client import PlaidClient
+
+    class Session:
+        """Four one-project pages; the read of page 2 waits for ``gate``."""
+
+        def __init__(self):
+            self.sent = []
+            self.gate = threading.Event()
+
+        def request(self, method, url, **kwargs):
+            self.sent.append((method, url, kwargs.get('data')))
+            if url.endswith('/batch'):
+                body = [{'status': 200, 'body': {}}]
+            else:
+                n = int((parse_qs(urlsplit(url).query).get('cursor') or ['c0'])[0][1:])
+                if n == 2:
+                    assert self.gate.wait(5)
+                body = {'entries': [{'project/id': f'p{n}'}],
+                        'next-cursor': f'c{n + 1}' if n < 3 else None}
+            return type('R', (), {'ok': True, 'status_code': 200, 'text': '',
+                                  'headers': {'content-type': 'application/json'},
+                                  'content': json.dumps(body).encode()})()
+
+        def post(self, url, **kwargs):
+            return self.request('POST', url, **kwargs)
+
+    for prefetch in (0, 1):
+        session = Session()
+        client = PlaidClient('http://x', 'tok', session=session, prefetch_pages=prefetch)
+        projects = client.projects.iter_all(page_size=1)
+        seen = [next(projects)['id'], next(projects)['id']]
+        with client.batched():
+            client.projects.update('p1', 'renamed')
+            session.gate.set()
+            # The page read happens while the batch is open: here, or on the
+            # prefetch thread meanwhile.
+            seen.append(next(projects)['id'])
+        seen += [p['id'] for p in projects]
+        assert seen == ['p0', 'p1', 'p2', 'p3']
+        batches = [json.loads(data) for _, url, data in session.sent if url.endswith('/batch')]
+        assert [[op['method'] for op in ops] for ops in batches] == [['PATCH']]
+
+
 def _run_standalone():
     """Fallback runner with no pytest dependency."""
     tests = [
@@ -188,6 +328,14 @@ def _run_standalone():
         test_iter_pages_suppresses_trailing_empty_page,
         test_iter_pages_raises_when_batching,
         test_list_page_works_when_batching,
+        test_prefetch_returns_the_same_pages_in_order,
+        test_prefetch_reads_ahead_at_most_depth_pages,
+        test_closing_a_prefetching_iterator_stops_fetching,
+        test_prefetch_surfaces_errors_from_the_background_fetch,
+        test_iter_all_yields_entries_lazily,
+        test_iter_all_accepts_a_bare_list_response,
+        test_resource_iter_all_streams_project_documents,
+        test_batch_opened_mid_iteration_does_not_capture_page_reads,
     ]
     failures = 0
     for t in tests:
@@ -0,0 +1,132 @@
+"""Tests for raw (wire-format) responses on read methods — network-free.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client import PlaidClient
+
+
+class _Resp:
+    def __init__(self, body, headers=None):
+        self.status_code = 200
+        self.ok = True
+        self.headers = {'content-type': 'application/json', **(headers or {})}
+        self._body = body
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+
+class _Sess:
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.urls = []
+
+    def request(self, **kw):
+        self.urls.append(kw['url'])
+        return _Resp(self.bodies.pop(0))
+
+    def post(self, url, **kw):
+        return self.request(url=url, **kw)
+
+    def close(self):
+        pass
+
+
+DOC = {'document/id': 'D', 'document/version': 'v3',
+       'document/text-layers': [{'text-layer/id': 'TL'}]}
+
+
+def _client(*bodies, **kw):
+    return PlaidClient('http://x', 'tok', session=_Sess(*bodies), **kw)
+
+
+def test_get_raw_returns_wire_json_untouched():
+    client = _client(DOC)
+    assert client.documents.get('D', include_body=True, raw=True) == DOC
+    # version tracking still sees the (raw) body
+    assert client.document_versions == {'D': 'v3'}
+
+
+def test_client_wide_default_and_per_call_override():
+    client = _client(DOC, DOC, raw_responses=True)
+    assert client.documents.get('D') == DOC
+    assert client.documents.get('D', raw=False) == {
+        'id': 'D', 'version': 'v3', 'text_layers': [{'id': 'TL'}]}
+
+
+def test_list_raw_follows_kebab_cursor():
+    client = _client({'entries': [{'project/id': 'a'}], 'next-cursor': 'c1'},
+                     {'entries': [{'project/id': 'b'}], 'next-cursor': None})
+    assert client.projects.list(raw=True) == [{'project/id': 'a'}, {'project/id': 'b'}]
+    assert 'cursor=c1' in client.session.urls[1]
+
+
+def test_iter_pages_and_list_page_raw():
+    client = _client({'entries': [{'user/id': 'u'}], 'next-cursor': None},
+                     {'entries': [{'user/id': 'u'}], 'next-cursor': None})
+    assert list(client.users.iter_pages(raw=True)) == [[{'user/id': 'u'}]]
+    assert client.users.list_page(raw=True)['next-cursor'] is None
+
+
+def test_query_raw():
+    body = {'columns': ['?s'], 'results': [[{'span/id': 'S'}]], 'count': 1, 'truncated': False}
+    client = _client(body, body)
+    assert client.query({'find': ['?s'], 'where': []}, raw=True) == body
+    assert client.query({'find': ['?s'], 'where': []})['results'] == [[{'id': 'S'}]]
+
+
+def test_writes_ignore_raw_responses():
+    client = _client({'id': 'S', 'span/value': 'NOUN'}, raw_responses=True)
+    assert client.spans.update('S', 'NOUN') == {'id': 'S', 'value': 'NOUN'}
+
+
+def test_document_listings_and_audit_follow_raw_responses():
+    page = {'entries': [{'document/id': 'D', 'document/name': 'n'}], 'next-cursor': None}
+    audit = {'entries': [{'audit/id': 'A', 'audit/ops': [{'op/type': 'document/create'}]}],
+             'next-cursor': None}
+    client = _client(page, page, page, audit, audit, audit, raw_responses=True)
+    assert client.projects.list_documents('P') == page['entries']
+    assert list(client.projects.iter_all_documents('P')) == page['entries']
+    assert client.projects.list_documents_page('P')['next-cursor'] is None
+    assert client.projects.audit('P') == audit['entries']
+    assert list(client.documents.iter_audit('D')) == audit['entries']
+    assert client.users.audit('U', raw=False) == [{'id': 'A', 'ops': [{'type': 'document/create'}]}]
+
+
+def test_workflows_read_transformed_data_on_a_raw_client():
+    from plaid_client.layer_index import layer_indexes
+    from plaid_client.workflows.tokenization import TokenProcessor
+    from plaid_client.workflows.tokenization.tokenizer_model import TokenSpan
+
+    class Helper:
+        def progress(self, percent, msg=''):
+            pass
+
+        def error(self, error):
+            raise AssertionError(error)
+
+    project = {'project/id': 'P', 'project/text-layers': [
+        {'text-layer/id': 'TL', 'text-layer/token-layers': [{'token-layer/id': 'W'}]}]}
+    texts = {'results': [[{'text/id': 'T', 'text/layer': 'TL', 'text/body': 'Hi there'}]],
+             'truncated': False}
+    client = _client({'document/id': 'D', 'document/project': 'P'}, project, texts,
+                     {'results': [], 'truncated': False},
+                     [{'status': 200, 'body': {'ids': ['a', 'b']}}], raw_responses=True)
+    try:
+        result = TokenProcessor()._process_tokens_locked(
+            client, 'D', [], [TokenSpan('Hi', 0, 2), TokenSpan('there', 3, 8)], 'W', None,
+            Helper())
+    finally:
+        layer_indexes.invalidate('P')
+    assert result['tokens_created'] == 2
+    assert client.session.urls[-1].endswith('/api/v1/batch')
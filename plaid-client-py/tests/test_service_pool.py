@@ -0,0 +1,262 @@
+"""Tests for the service worker pool and BaseService's execution model.
+
+Network-free: requests are handed to ``handle_service_request`` directly with a
+recording response helper. Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from plaid_client import BaseService, PlaidClient
+from plaid_client.service_pool import ServiceMetrics, WorkerPool
+
+
+class Helper:
+    """Records what a handler reports, like ``serve``'s ResponseHelper."""
+
+    def __init__(self, project_id=None, metrics=None):
+        self.project_id = project_id
+        self.metrics = metrics
+        self.progress_msgs = []
+        self.done = threading.Event()
+        self.result = self.error_msg = None
+
+    def progress(self, percent, msg=''):
+        self.progress_msgs.append(msg)
+
+    def complete(self, data=None):
+        self.result = data
+        self.done.set()
+
+    def error(self, error):
+        self.error_msg = str(error)
+        self.done.set()
+
+
+class GatedService(BaseService):
+    """Each request blocks until the test opens the gate."""
+
+    def __init__(self, **kwargs):
+        super().__init__('test:gated', 'Gated', 'short', **kwargs)
+        self.gate = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.seen = []
+
+    def create_worker_model(self):
+        return object()
+
+    def process_request(self, request_data, response_helper):
+        self.seen.append((request_data['n'], threading.current_thread().name,
+                          self.worker_model, self.client))
+        self.started.release()
+        assert self.gate.wait(5)
+        if request_data.get('fail'):
+            raise RuntimeError('boom')
+        response_helper.complete({'n': request_data['n']})
+
+
+def _wait(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def _submit(service, n, project=None, metrics=None, **data):
+    helper = Helper(project, metrics)
+    service.handle_service_request({'n': n, **data}, helper)
+    if service._pool is not None:
+        assert service._pool._flush_reports(5)  # queue positions are sent off-thread
+    return helper
+
+
+def test_default_is_single_flight_reject():
+    svc = GatedService()
+    first = _submit(svc, 1)
+    assert svc.started.acquire(timeout=5)
+    second = _submit(svc, 2)
+    assert second.error_msg == ('Gated is currently processing another request. '
+                                'Please try again later.')
+    svc.gate.set()
+    assert first.done.wait(5) and first.result == {'n': 1}
+    svc._pool.shutdown(wait=True)
+
+
+def test_queue_reports_positions_and_refuses_when_full():
+    svc = GatedService(queue_size=2)
+    running = _submit(svc, 1)
+    assert svc.started.acquire(timeout=5)
+    queued = [_submit(svc, 2), _submit(svc, 3)]
+    assert queued[0].progress_msgs == ['Waiting in queue (position 1)']
+    assert queued[1].progress_msgs == ['Waiting in queue (position 2)']
+    busy = _submit(svc, 4)
+    assert busy.error_msg == 'Gated is busy (2 requests already queued). Please try again later.'
+
+    svc.gate.set()
+    for helper in [running] + queued:
+        assert helper.done.wait(5)
+    assert [h.result['n'] for h in [running] + queued] == [1, 2, 3]
+    assert [n for n, *_ in svc.seen] == [1, 2, 3]  # FIFO
+    # The last one moved up when the second started; unless it started
+    # itself before that was sent, it was told.
+    assert queued[1].progress_msgs[0] == 'Waiting in queue (position 2)'
+    assert set(queued[1].progress_msgs[1:]) <= {'Waiting in queue (position 1)'}
+    svc._pool.shutdown(wait=True)
+
+
+def test_errors_are_reported_and_the_worker_survives():
+    svc = GatedService(queue_size=1)
+    svc.gate.set()
+    failing = _submit(svc, 1, fail=True)
+    assert failing.done.wait(5)
+    assert failing.error_msg == 'Gated processing error: boom'
+    ok = _submit(svc, 2)
+    assert ok.done.wait(5) and ok.result == {'n': 2}
+    svc._pool.shutdown(wait=True)
+
+
+def test_workers_get_their_own_model_and_client_when_not_thread_safe():
+    svc = GatedService(workers=2, thread_safe=False)
+    svc.client = PlaidClient('http://x', 'tok', stream_json=True)
+    helpers = [_submit(svc, 1), _submit(svc, 2)]
+    # Both run at once: neither finishes before the gate opens.
+    assert svc.started.acquire(timeout=5) and svc.started.acquire(timeout=5)
+    svc.gate.set()
+    for helper in helpers:
+        assert helper.done.wait(5) and helper.result is not None
+    (_, thread_a, model_a, client_a), (_, thread_b, model_b, client_b) = svc.seen
+    assert thread_a != thread_b
+    assert model_a is not model_b
+    assert client_a is not client_b and svc.client not in (client_a, client_b)
+    assert client_a.session is svc.client.session and client_a.stream_json
+    svc._pool.shutdown(wait=True)
+
+
+def test_thread_safe_model_is_shared():
+    svc = GatedService(workers=2)
+    svc.client = PlaidClient('http://x', 'tok')
+    svc.gate.set()
+    helpers = [_submit(svc, 1), _submit(svc, 2)]
+    for helper in helpers:
+        assert helper.done.wait(5)
+    assert svc.seen[0][2] is svc.seen[1][2]
+    svc._pool.shutdown(wait=True)
+
+
+def test_projects_take_turns_and_priority_goes_first():
+    class RankedService(GatedService):
+        def request_priority(self, request_data, project_id):
+            return request_data.get('rank', 0)
+
+    svc = RankedService(queue_size=10)
+    _submit(svc, 0, 'noisy')
+    assert svc.started.acquire(timeout=5)
+    noisy = [_submit(svc, n, 'noisy') for n in (1, 2, 3)]
+    quiet = _submit(svc, 4, 'quiet')
+    urgent = _submit(svc, 5, 'other', rank=1)
+    # The quiet project's request jumps the noisy backlog after one turn;
+    # the urgent one goes first, and everyone behind it is told.
+    assert quiet.progress_msgs == ['Waiting in queue (position 2)',
+                                   'Waiting in queue (position 3)']
+    assert noisy[1].progress_msgs == ['Waiting in queue (position 2)',
+                                      'Waiting in queue (position 3)',
+                                      'Waiting in queue (position 4)']
+    assert urgent.progress_msgs == ['Waiting in queue (position 1)']
+    svc.gate.set()
+    assert all(h.done.wait(5) for h in noisy + [quiet, urgent])
+    assert [n for n, *_ in svc.seen] == [0, 5, 1, 4, 2, 3]
+    svc._pool.shutdown(wait=True)
+
+
+def test_queue_positions_are_sent_off_thread_and_coalesced():
+    release = threading.Event()
+
+    class SlowHelper(Helper):
+        def progress(self, percent, msg=''):
+            assert release.wait(5)
+            super().progress(percent, msg)
+
+    gate = threading.Event()
+    pool = WorkerPool(lambda data, helper: gate.wait(5), queue_size=10)
+    assert pool.submit({}, Helper())
+    stuck, waiting = SlowHelper(), Helper()
+    assert pool.submit({}, stuck)
+    _wait(lambda: pool._sending)  # the reporter is blocked on ``stuck``
+    assert pool.submit({}, waiting)
+    for rank in (1, 2, 3):
+        # Each jumps the queue and moves ``waiting`` back; none of these
+        # submits waits for the blocked report.
+        assert pool.submit({}, Helper(), priority=rank)
+    release.set()
+    assert pool._flush_reports(5)
+    assert stuck.progress_msgs == ['Waiting in queue (position 1)',
+                                   'Waiting in queue (position 4)']
+    assert waiting.progress_msgs == ['Waiting in queue (position 5)']
+    gate.set()
+    pool.shutdown(wait=True)
+
+
+def test_project_queue_size_caps_one_projects_share():
+    svc = GatedService(queue_size=4, project_queue_size=2)
+    _submit(svc, 0, 'noisy')
+    assert svc.started.acquire(timeout=5)
+    _submit(svc, 1, 'noisy'), _submit(svc, 2, 'noisy')
+    refused = _submit(svc, 3, 'noisy')
+    assert refused.error_msg == ('Gated is busy (2 requests from this project already '
+                                 'queued). Please try again later.')
+    assert _submit(svc, 4, 'quiet').error_msg is None
+    svc.gate.set()
+    svc._pool.shutdown(wait=True)
+
+
+def test_metrics_per_registration_and_pool():
+    svc = GatedService(queue_size=1)
+    assert svc.metrics is None
+    a, b = ServiceMetrics(), ServiceMetrics()
+    first = _submit(svc, 1, 'a', a)
+    assert svc.started.acquire(timeout=5)
+    second = _submit(svc, 2, 'b', b)
+    _submit(svc, 3, 'b', b)  # queue full
+    assert b.snapshot()['queued'] == 1 and a.snapshot()['active'] == 1
+    time.sleep(0.05)
+    svc.gate.set()
+    assert first.done.wait(5) and second.done.wait(5)
+    svc._pool.shutdown(wait=True)
+
+    snap_a, snap_b, total = a.snapshot(), b.snapshot(), svc.metrics.snapshot()
+    assert (snap_a['accepted'], snap_a['rejected'], snap_a['completed']) == (1, 0, 1)
+    assert (snap_b['accepted'], snap_b['rejected'], snap_b['completed']) == (1, 1, 1)
+    assert (total['accepted'], total['rejected'], total['completed']) == (2, 1, 2)
+    assert total['queued'] == total['active'] == 0
+    assert total['queue_wait']['count'] == total['service_time']['count'] == 2
+    # The second request waited while the first one was held up.
+    assert snap_a['service_time']['max'] >= 0.05 and snap_b['queue_wait']['max'] >= 0.05
+    assert snap_a['queue_wait']['max'] < 0.05
+
+
+def test_shutdown_rejects_queued_requests():
+    gate = threading.Event()
+    pool = WorkerPool(lambda data, helper: gate.wait(5), queue_size=1, name='Svc')
+    pool.submit({}, Helper())
+    queued = Helper()
+    assert pool.submit({}, queued)
+    pool.shutdown()
+    assert queued.error_msg == 'Svc is shutting down. Please try again later.'
+    assert not pool.submit({}, Helper())
+    gate.set()
+    pool.shutdown(wait=True)
+
+
+def test_pool_rejects_bad_sizes():
+    with pytest.raises(ValueError):
+        WorkerPool(print, workers=0)
+    with pytest.raises(ValueError):
+        WorkerPool(print, queue_size=-1)
@@ -0,0 +1,117 @@
+"""Tests for connection-pool configuration and session sharing — network-free.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client import PlaidClient, services
+from plaid_client.http import make_session
+from plaid_client.sse import SSEConnection
+
+
+class _Resp:
+    ok = True
+    status_code = 200
+    headers = {}
+
+    content = b'{"token": "fresh-token"}'
+
+
+def _adapter(session):
+    return session.get_adapter('http://example.org')
+
+
+def test_pool_options_size_the_adapter():
+    client = PlaidClient('http://x', 'tok', pool_connections=3, pool_maxsize=48, pool_block=True)
+    adapter = _adapter(client.session)
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 48
+    assert adapter._pool_block is True
+
+
+def test_shared_session_is_reused_and_not_closed_by_one_client():
+    shared = make_session(pool_maxsize=32)
+    closed = []
+    shared.close = lambda: closed.append(True)
+
+    a = PlaidClient('http://x', 'token-a', session=shared)
+    b = PlaidClient('http://x', 'token-b', session=shared)
+    assert a.session is b.session is shared
+    a.close()
+    assert closed == []
+
+    own = PlaidClient('http://x', 'tok')
+    own_closed = []
+    own.session.close = lambda: own_closed.append(True)
+    own.close()
+    assert own_closed == [True]
+
+
+def test_login_goes_through_the_new_clients_session(monkeypatch):
+    seen = {}
+
+    def fake_post(self, url, **kw):
+        seen['session'] = self
+        seen['url'] = url
+        return _Resp()
+
+    monkeypatch.setattr('requests.Session.post', fake_post)
+    client = PlaidClient.login('http://x/', 'u', 'p', pool_maxsize=20)
+    assert client.token == 'fresh-token'
+    assert seen['session'] is client.session
+    assert seen['url'] == 'http://x/api/v1/login'
+    assert _adapter(client.session)._pool_maxsize == 20
+
+
+def test_heartbeat_uses_the_client_session():
+    posted = []
+
+    class _Sess:
+        def post(self, url, **kw):
+            posted.append((url, json.loads(kw['data'])))
+
+    client = PlaidClient('http://x', 'tok')
+    client.session = _Sess()
+    # Build the connection without starting its reader thread.
+    conn = SSEConnection.__new__(SSEConnection)
+    conn._client = client
+    conn._project_id = 'P'
+    conn._client_id = 'C'
+    conn._is_closed = False
+    conn._send_heartbeat()
+    assert posted == [('http://x/api/v1/projects/P/heartbeat', {'client-id': 'C'})]
+
+
+def test_service_request_stream_stays_off_the_pooled_session(monkeypatch):
+    class _Stream:
+        ok = True
+        status_code = 200
+
+        def iter_lines(self, decode_unicode=False):
+            yield from ['event: result', 'data: {"data": 7}', '']
+
+        def close(self):
+            pass
+
+    posted = []
+
+    def post(url, **kw):
+        posted.append((url, kw['stream']))
+        return _Stream()
+
+    class _Sess:
+        def post(self, url, **kw):
+            raise AssertionError('a long-lived stream must not pin a pool slot')
+
+    monkeypatch.setattr(services.requests, 'post', post)
+    client = PlaidClient('http://x', 'tok')
+    client.session = _Sess()
+    assert client.messages.request_service('P', 'svc', {}) == 7
+    assert posted == [('http://x/api/v1/projects/P/services/svc/requests', True)]
@@ -0,0 +1,175 @@
+"""Tests for documents.get_skeleton — network-free, against a stub query engine.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import PlaidClient
+from plaid_client import skeleton
+
+
+class _Resp:
+    def __init__(self, body):
+        self.status_code = 200
+        self.ok = True
+        self.headers = {'content-type': 'application/json'}
+        self._body = body
+
+    @property
+    def content(self):
+        return json.dumps(self._body).encode()
+
+
+TEXTS = [{'text/id': 'X1', 'text/body': 'Hello world. Bye.', 'text/layer': 'TXT',
+          'text/document': 'D'},
+         {'text/id': 'X2', 'text/body': 'gloss', 'text/layer': 'TXT2', 'text/document': 'D'}]
+
+
+def _token(i, layer, begin, end, metadata=None):
+    token = {'token/id': f'{layer}-{i}', 'token/layer': layer, 'token/text': 'X1',
+             'token/begin': begin, 'token/end': end, 'token/precedence': None}
+    if metadata:
+        token['metadata'] = metadata
+    return token
+
+
+class _QueryServer:
+    """Answers the two query shapes the skeleton sends, from fixtures, honouring
+    the begin-range predicates and the row limit like the real endpoint."""
+
+    def __init__(self, tokens, limit=None):
+        self.tokens = tokens
+        self.limit = limit
+        self.bodies = []
+
+    def request(self, **kw):
+        assert kw['method'] == 'POST' and kw['url'] == 'http://x/api/v1/query'
+        body = json.loads(kw['data'])
+        self.bodies.append(body)
+        clause = body['where'][0]
+        if clause[0] == 'text':
+            assert clause[2] == {'doc': 'D'}
+            return _Resp({'return': 'entities', 'columns': ['?x'],
+                          'results': [[t] for t in TEXTS], 'count': 2, 'truncated': False})
+        assert clause[:2] == ['token', '?t'] and clause[2] == {'doc': 'D'}
+        matches = list(self.tokens)
+        for head, field, arg in body['where'][1:]:
+            if head == 'in':
+                assert field == '?t.layer'
+                matches = [t for t in matches if t['token/layer'] in arg]
+            elif head == '>=':
+                matches = [t for t in matches if t['token/begin'] >= arg]
+            elif head == '<':
+                matches = [t for t in matches if t['token/begin'] < arg]
+        limit = min(body['limit'], self.limit or body['limit'])
+        truncated = len(matches) > limit
+        matches = matches[:limit]
+        if body['return'] == 'entities':
+            rows = [[t] for t in matches]
+        else:
+            rows = []
+            for t in matches:
+                row = []
+                for path in body['return']['group']:
+                    parts = path.split('.')
+                    if parts[1] == 'metadata':
+                        row.append((t.get('metadata') or {}).get(parts[2]))
+                    else:
+                        row.append(t[f'token/{parts[1]}'])
+                rows.append(row + [1])
+        return _Resp({'return': 'aggregate', 'columns': [], 'results': rows,
+                      'count': len(rows), 'truncated': truncated})
+
+    def close(self):
+        pass
+
+
+def _client(server):
+    return PlaidClient('http://x', 'tok', session=server)
+
+
+def test_texts_and_tokens_without_annotations():
+    tokens = [_token(1, 'WORD', 6, 11), _token(0, 'WORD', 0, 5),
+              _token(0, 'SENT', 0, 17), _token(0, 'OTHER', 0, 1)]
+    server = _QueryServer(tokens)
+    result = _client(server).documents.get_skeleton('D', ['SENT', 'WORD', 'EMPTY'])
+
+    assert set(result['texts']) == {'TXT', 'TXT2'}
+    assert result['texts']['TXT']['body'] == 'Hello world. Bye.'
+    assert result['token_layers'] == {
+        'SENT': [{'id': 'SENT-0', 'begin': 0, 'end': 17, 'precedence': None}],
+        'WORD': [{'id': 'WORD-0', 'begin': 0, 'end': 5, 'precedence': None},
+                 {'id': 'WORD-1', 'begin': 6, 'end': 11, 'precedence': None}],
+        'EMPTY': [],
+    }
+    # One aggregate query for every layer: flat rows, no entity hydration.
+    token_query = server.bodies[1]
+    assert token_query['return']['group'][:2] == ['?t.layer', '?t.id']
+    assert token_query['where'][1] == ['in', '?t.layer', ['SENT', 'WORD', 'EMPTY']]
+    assert len(server.bodies) == 2
+
+
+def test_text_layer_selection():
+    server = _QueryServer([])
+    client = _client(server)
+    assert list(client.documents.get_skeleton('D', [], text_layer_ids=['TXT2'])['texts']) == ['TXT2']
+    assert client.documents.get_skeleton('D', [], text_layer_ids=[]) == {'texts': {}, 'token_layers': {}}
+    assert len(server.bodies) == 1
+
+
+def test_metadata_keys_and_full_metadata():
+    tokens = [_token(0, 'ALIGN', 0, 5, {'timeBegin': 1.5, 'timeEnd': 2.0, 'speaker': 'A'}),
+              _token(1, 'ALIGN', 5, 9, {'timeBegin': 2.0})]
+    server = _QueryServer(tokens)
+    client = _client(server)
+
+    picked = client.documents.get_skeleton('D', ['ALIGN'], text_layer_ids=[],
+                                           metadata=['timeBegin', 'timeEnd'])
+    assert [t['metadata'] for t in picked['token_layers']['ALIGN']] == [
+        {'timeBegin': 1.5, 'timeEnd': 2.0}, {'timeBegin': 2.0}]
+    assert server.bodies[-1]['return']['group'][-2:] == ['?t.metadata.timeBegin',
+                                                         '?t.metadata.timeEnd']
+
+    full = client.documents.get_skeleton('D', ['ALIGN'], text_layer_ids=[], metadata=True)
+    assert full['token_layers']['ALIGN'][0] == {
+        'id': 'ALIGN-0', 'begin': 0, 'end': 5, 'precedence': None,
+        'metadata': {'timeBegin': 1.5, 'timeEnd': 2.0, 'speaker': 'A'}}
+    assert server.bodies[-1]['return'] == 'entities'
+
+    with pytest.raises(ValueError):
+        client.documents.get_skeleton('D', ['ALIGN'], metadata=['a.b'])
+
+
+def test_truncated_results_are_split_by_offset():
+    tokens = [_token(i, 'WORD', i * 3, i * 3 + 2) for i in range(50)]
+    tokens += [_token(100 + i, 'WORD', 60, 61) for i in range(6)]  # pile-up at one offset
+    server = _QueryServer(tokens, limit=8)
+    result = _client(server).documents.get_skeleton('D', ['WORD'], text_layer_ids=[])
+    got = result['token_layers']['WORD']
+    assert sorted(t['id'] for t in got) == sorted(t['token/id'] for t in tokens)
+    assert [(t['begin'], t['end']) for t in got] == sorted((t['begin'], t['end']) for t in got)
+
+
+def test_too_many_tokens_at_one_offset_raises(monkeypatch):
+    monkeypatch.setattr(skeleton, 'QUERY_ROW_LIMIT', 4)
+    tokens = [_token(i, 'WORD', 7, 8) for i in range(5)]
+    with pytest.raises(RuntimeError, match='begin at offset 7'):
+        _client(_QueryServer(tokens)).documents.get_skeleton('D', ['WORD'], text_layer_ids=[])
+
+
+def test_refused_inside_a_batch():
+    client = _client(_QueryServer([]))
+    client.begin_batch()
+    try:
+        with pytest.raises(RuntimeError, match='inside a batch'):
+            client.documents.get_skeleton('D', ['WORD'])
+    finally:
+        client.abort_batch()
@@ -0,0 +1,220 @@
+"""Tests for the incremental SSE parser and the asyncio SSE reader.
+
+The parser tests are network-free; the stream tests run against a local SSE
+server. Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+import requests
+
+from plaid_client import AsyncPlaidClient, PlaidClient, sse_async
+from plaid_client.sse import SSEConnection, SSEEvent, SSEParser
+from plaid_client.sse_async import AsyncSSEStream, listen
+from plaid_client.sse_mux import SSEMultiplexer
+
+STREAM = (
+    '\ufeff: keepalive\n'
+    'retry: 50\n'
+    'event: connected\ndata: {"client-id": "c1"}\n\n'
+    'id: 7\nevent: audit-log\ndata: {"ops":\ndata:  [1, 2]}\n\n'
+    'event: message\r\ndata: {"x": "é"}\r\n\r\n'
+)
+
+
+def _parse(pieces):
+    parser = SSEParser()
+    events = [e for piece in pieces for e in parser.feed(piece)]
+    return parser, events
+
+
+def test_parser_multiline_data_ids_and_retry():
+    parser, events = _parse([STREAM.encode()])
+    assert events == [
+        SSEEvent('connected', '{"client-id": "c1"}', ''),
+        SSEEvent('audit-log', '{"ops":\n [1, 2]}', '7'),
+        SSEEvent('message', '{"x": "é"}', '7'),  # the id persists
+    ]
+    assert parser.retry == 50 and parser.last_event_id == '7'
+
+
+def test_parser_is_independent_of_how_the_body_is_split():
+    body = STREAM.encode()
+    _, whole = _parse([body])
+    _, bytewise = _parse([body[i:i + 1] for i in range(len(body))])
+    _, halves = _parse([body[:len(body) // 2], body[len(body) // 2:]])
+    assert bytewise == halves == whole
+
+
+def test_parser_line_ends_and_edge_fields():
+    # CR alone, CRLF split across pieces, a field without a colon, and
+    # values the spec says to ignore.
+    parser, events = _parse([b'data: a\rdata: b\r', b'\nid: x\x00y\nretry: 1s\ndata\n',
+                             b'event: only\n\n', b'id\n\n'])
+    assert events == [SSEEvent('only', 'a\nb\n', '')]
+    assert parser.last_event_id == '' and parser.retry is None
+    # An event without data is not dispatched, and a trailing unfinished
+    # event is not dispatched either.
+    assert _parse([b'event: empty\n\ndata: half'])[1] == []
+
+
+class _Server(BaseHTTPRequestHandler):
+    """Serves ``STREAM`` in small chunks, then holds the stream open until
+    the test ends (``hold``) or ends it."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        state = self.server.state
+        with state['lock']:
+            state['gets'].append(self.path)
+            n = len(state['gets'])
+        if n <= state['fail_first']:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        body = STREAM.encode()
+        for i in range(0, len(body), 7):
+            self._chunk(body[i:i + 7])
+        if state['hold']:
+            state['stop'].wait(10)
+        self._chunk(b'')
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.state['lock']:
+            self.server.state['heartbeats'].append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def _chunk(self, data):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Server)
+    httpd.daemon_threads = True
+    httpd.state = {'lock': threading.Lock(), 'gets': [], 'heartbeats': [], 'hold': True,
+                   'fail_first': 0, 'stop': threading.Event()}
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    yield httpd
+    httpd.state['stop'].set()
+    httpd.shutdown()
+
+
+def _url(server):
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def _wait(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_async_stream_yields_events(server):
+    server.state['hold'] = False
+
+    async def read():
+        async with AsyncSSEStream(f'{_url(server)}/stream') as stream:
+            return [e async for e in stream], stream.parser
+
+    events, parser = asyncio.run(read())
+    assert [(e.event, e.id) for e in events] == [('connected', ''), ('audit-log', '7'),
+                                                 ('message', '7')]
+    assert events[1].data == '{"ops":\n [1, 2]}' and parser.retry == 50
+
+
+def test_async_stream_raises_for_error_status(server):
+    server.state['fail_first'] = 1
+
+    async def read():
+        async with AsyncSSEStream(f'{_url(server)}/stream') as stream:
+            return [e async for e in stream]
+
+    with pytest.raises(requests.HTTPError) as info:
+        asyncio.run(read())
+    assert info.value.response.status_code == 503
+
+
+def test_listen_reconnects_after_the_retry_hint(server, monkeypatch):
+    # First answer is an error (no hint yet: the default delay), then the
+    # stream ends and is reopened after its 50 ms retry hint.
+    server.state.update(hold=False, fail_first=1)
+    client = PlaidClient(_url(server), 'tok')
+
+    async def read():
+        seen = []
+        async for event_type, data in listen(client, 'p'):
+            seen.append((event_type, data))
+            if len(seen) == 4:
+                return seen
+
+    monkeypatch.setattr(sse_async, 'RECONNECT_INTERVAL_S', 0.05)
+    seen = asyncio.run(asyncio.wait_for(read(), 5))
+    assert seen[:2] == [('audit-log', {'ops': [1, 2]}), ('message', {'x': 'é'})]
+    assert seen[2:] == seen[:2]
+    assert server.state['gets'] == ['/api/v1/projects/p/listen'] * 3
+
+
+def test_async_client_events(server):
+    async def read():
+        async with AsyncPlaidClient(_url(server), 'tok') as client:
+            events = client.messages.events('p')
+            try:
+                return [await events.__anext__(), await events.__anext__()]
+            finally:
+                await events.aclose()
+
+    assert [t for t, _ in asyncio.run(read())] == ['audit-log', 'message']
+
+
+def test_sync_connection_parses_multiline_events(server):
+    client = PlaidClient(_url(server), 'tok')
+    events = []
+    conn = SSEConnection(client, 'p', lambda t, d: events.append((t, d)))
+    try:
+        _wait(lambda: len(events) == 2)
+        assert events == [('audit-log', {'ops': [1, 2]}), ('message', {'x': 'é'})]
+        assert conn.get_stats()['client_id'] == 'c1'
+    finally:
+        conn.close()
+
+
+def test_listen_bus_on_a_multiplexer(server):
+    client = PlaidClient(_url(server), 'tok')
+    events = []
+    with SSEMultiplexer() as mux:
+        channels = [client.messages.listen(f'p{i}', lambda t, d: events.append(t), mux=mux)
+                    for i in range(5)]
+        _wait(lambda: len(events) == 10)
+        assert all(c.ready_state == 1 for c in channels)
+        assert sorted(server.state['gets']) == [f'/api/v1/projects/p{i}/listen'
+                                                for i in range(5)]
+    assert all(c.ready_state == 2 for c in channels)
@@ -0,0 +1,224 @@
+"""Tests for the SSE multiplexer — channels against a local SSE server.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from plaid_client import BaseService, PlaidClient
+from plaid_client.layer_index import layer_indexes
+from plaid_client.sse_mux import SSEMultiplexer
+
+
+class _SSEServer(BaseHTTPRequestHandler):
+    """Service channels per project. ``plan[project]`` lists what each
+    successive connection does: ``'hold'`` streams one request and stays
+    open, ``'beat'`` also sends a heartbeat before it holds, ``'drop'``
+    streams one request and ends, an int answers that status."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        project = urlsplit(self.path).path.split('/')[4]
+        state = self.server.state
+        with state['lock']:
+            n = state['connects'].setdefault(project, 0)
+            state['connects'][project] += 1
+            steps = state['plan'].get(project, ['hold'])
+            step = steps[min(n, len(steps) - 1)]
+        if isinstance(step, int):
+            self.send_response(step)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        request = {'request-id': f'{project}-{n}', 'data': {'n': n}}
+        self._chunk('event: connected\ndata: {"client-id": "c1"}\n\n: keepalive\n\n')
+        # One event split across chunks, with CRLF line ends.
+        self._chunk('event: service_request\r\ndata: ')
+        self._chunk(json.dumps(request) + '\r\n\r\n')
+        if step == 'beat':
+            self._chunk('event: heartbeat\ndata: {}\n\n')
+        if step in ('hold', 'beat'):
+            state['stop'].wait(10)
+        self._chunk('')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.state['lock']:
+            self.server.state['events'].append((self.path, json.loads(body)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _SSEServer)
+    httpd.daemon_threads = True
+    httpd.state = {'lock': threading.Lock(), 'connects': {}, 'plan': {}, 'events': [],
+                   'stop': threading.Event()}
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    yield httpd
+    httpd.state['stop'].set()
+    httpd.shutdown()
+
+
+def _wait(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def _client(server):
+    return PlaidClient(f'http://127.0.0.1:{server.server_port}', 'tok')
+
+
+def test_many_registrations_share_one_loop_thread(server):
+    client = _client(server)
+    seen = []
+
+    def handler(data, helper):
+        seen.append((helper.project_id, data, threading.current_thread().name))
+        helper.complete({'echo': data['n']})
+
+    info = {'service_id': 'svc', 'service_name': 'Svc'}
+    threads_before = set(threading.enumerate())
+    with SSEMultiplexer(callback_workers=2) as mux:
+        regs = [client.messages.serve(f'p{i}', info, handler, mux=mux) for i in range(20)]
+        _wait(lambda: len(server.state['events']) == 20)
+        # One loop thread plus the callback pool, however many channels (the
+        # rest are the test server's; no heartbeat or catch-up was needed).
+        ours = [t.name for t in set(threading.enumerate()) - threads_before
+                if 'process_request' not in t.name]
+        assert len(ours) <= 3 and all(name.startswith('sse-mux') for name in ours)
+        assert all(reg._supervisor_thread is None for reg in regs)
+        assert all(reg._connection.ready_state == 1 for reg in regs)
+        assert {p for p, *_ in seen} == {f'p{i}' for i in range(20)}
+        assert all(t.startswith('sse-mux-callback') for *_, t in seen)
+        path, body = server.state['events'][0]
+        assert path.endswith('/events') and body == {'status': 'completed',
+                                                     'data': {'echo': 0}}
+        for reg in regs:
+            reg.stop()
+        assert all(reg._connection.ready_state == 2 for reg in regs)
+    assert not mux._thread.is_alive()
+
+
+def test_dropped_and_rejected_channels_reopen(server):
+    server.state['plan'] = {'p': ['drop', 409, 500, 'hold']}
+    events = []
+    with SSEMultiplexer(reconnect_interval=0.05) as mux:
+        channel = mux.open(_client(server), 'p', lambda t, d: events.append((t, d)),
+                           path='/api/v1/projects/p/services/svc/requests', name='svc')
+        _wait(lambda: len(events) == 2 and channel.ready_state == 1)
+        assert server.state['connects']['p'] == 4
+        assert [d['request_id'] for _t, d in events] == ['p-0', 'p-3']
+        stats = channel.get_stats()
+        assert stats['reconnects'] == 1 and stats['client_id'] == 'c1'
+        assert stats['last_error'] is None
+        channel.close()
+        time.sleep(0.2)
+        assert server.state['connects']['p'] == 4  # closed for good
+        assert channel.ready_state == 2 and mux.channels == []
+
+
+def test_rejected_first_registration_raises_like_a_direct_open(server):
+    server.state['plan'] = {'p': [409, 'hold']}
+    info = {'service_id': 'svc', 'service_name': 'Svc'}
+    with SSEMultiplexer(reconnect_interval=0.05) as mux:
+        with pytest.raises(RuntimeError, match='Failed to open service channel: .*409'):
+            _client(server).messages.serve('p', info, lambda d, h: None, mux=mux)
+        time.sleep(0.2)
+        assert server.state['connects']['p'] == 1 and mux.channels == []
+
+
+def test_heartbeats_do_not_wait_for_busy_callbacks(server):
+    server.state['plan'] = {'p': ['beat']}
+    confirmed = []
+
+    def on_event(event_type, data):
+        # Holds the only callback thread until the heartbeat is confirmed.
+        _wait(lambda: server.state['events'])
+        confirmed.append(server.state['events'][0][0])
+
+    with SSEMultiplexer(callback_workers=1) as mux:
+        mux.open(_client(server), 'p', on_event)
+        _wait(lambda: confirmed)
+    assert confirmed == ['/api/v1/projects/p/heartbeat']
+
+
+def test_callback_returning_true_closes_the_channel(server):
+    calls = []
+
+    def on_event(event_type, data):
+        calls.append(data)
+        return True
+
+    with SSEMultiplexer(reconnect_interval=0.05) as mux:
+        channel = mux.open(_client(server), 'p', on_event,
+                           path='/api/v1/projects/p/services/svc/requests')
+        _wait(lambda: channel.ready_state == 2)
+        time.sleep(0.2)
+        assert len(calls) == 1 and server.state['connects']['p'] == 1
+
+
+def test_closed_multiplexer_refuses_new_channels():
+    mux = SSEMultiplexer()
+    mux.close()
+    with pytest.raises(RuntimeError):
+        mux.open(None, 'p', print)
+
+
+def test_base_service_multiplex_serves_through_one_multiplexer():
+    calls = []
+
+    class FakeMessages:
+        def serve(self, project_id, service_info, handler, extras, **kwargs):
+            calls.append(kwargs)
+            return object()
+
+    class MyService(BaseService):
+        def process_request(self, request_data, response_helper):
+            pass
+
+    svc = MyService('tok:test', 'Test', 'short', multiplex=True)
+    svc.client = type('FakeClient', (), {'messages': FakeMessages()})()
+    svc.register_service('p1')
+    svc.register_service('p2')
+    assert calls[0]['mux'] is calls[1]['mux'] is svc._mux
+    # The shared layer indexes follow audit streams on the same loop ...
+    assert layer_indexes.watch and layer_indexes.mux is svc._mux
+    svc.service_registrations = []
+    svc.run_service_loop()
+    # ... until the service stops.
+    assert not layer_indexes.watch and layer_indexes.mux is None
@@ -0,0 +1,222 @@
+"""Tests for resuming dropped SSE streams (Last-Event-ID and audit catch-up).
+
+Runs against a local server whose ``/listen`` bus drops after each planned
+batch of events and whose audit endpoint serves the project log. Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+from plaid_client import PlaidClient, sse_async
+from plaid_client.sse import ResumePoint, SSEConnection
+from plaid_client.sse_mux import SSEMultiplexer
+
+
+def _audit(n):
+    """Audit event ``n`` as the /listen bus publishes it."""
+    return {'event/type': 'audit-log', 'event/projects': ['p'], 'audit/id': f'op{n}',
+            'audit/projects': ['p'], 'audit/documents': ['d', 'd2'], 'audit/user': 'u',
+            'audit/time': f'2026-01-01T00:00:{n:02d}.000Z',
+            'audit/ops': [{'op/id': f'op{n}', 'op/type': 'token_layer:create',
+                           'op/project': 'p', 'op/document': 'd', 'op/description': 'x'}]}
+
+
+def _stored(n):
+    """Audit entry ``n`` as the audit endpoint returns it: enriched records
+    and the op type's keyword, one document per op."""
+    project = {'project/id': 'p', 'project/name': 'P'}
+    document = {'document/id': 'd', 'document/name': 'D'}
+    return {'audit/id': f'op{n}', 'audit/time': f'2026-01-01T00:00:{n:02d}.000Z',
+            'audit/user': {'user/id': 'u', 'user/username': 'U'},
+            'audit/projects': [project], 'audit/documents': [document],
+            'audit/ops': [{'op/id': f'op{n}', 'op/type': 'token-layer/create',
+                           'op/description': 'x', 'op/project': project,
+                           'op/document': document}]}
+
+
+class _Server(BaseHTTPRequestHandler):
+    """``state['streams']`` lists, per successive /listen connection, the
+    ``(id, n)`` audit events to send (``id`` ``None`` for none) before the
+    stream ends; past the list the stream stays open, empty."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        state = self.server.state
+        parts = urlsplit(self.path)
+        if parts.path.endswith('/audit'):
+            with state['lock']:
+                state['audits'].append(parse_qs(parts.query).get('start-time', [None])[0])
+            if state['audit_status'] != 200:
+                return self._json(state['audit_status'], {'error': 'nope'})
+            return self._json(200, {'entries': [_stored(n) for n in state['log']],
+                                    'next-cursor': None})
+        with state['lock']:
+            n = len(state['connects'])
+            state['connects'].append(self.headers.get('Last-Event-ID'))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self._chunk('retry: 10\nevent: connected\ndata: {"client-id": "c1"}\n\n')
+        if n >= len(state['streams']):
+            state['stop'].wait(10)
+        else:
+            for event_id, number in state['streams'][n]:
+                head = f'id: {event_id}\n' if event_id else ''
+                self._chunk(f'{head}event: audit-log\ndata: {json.dumps(_audit(number))}\n\n')
+        self._chunk('')
+
+    def _json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Server)
+    httpd.daemon_threads = True
+    httpd.state = {'lock': threading.Lock(), 'connects': [], 'audits': [], 'streams': [],
+                   'log': [], 'audit_status': 200, 'stop': threading.Event()}
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                              daemon=True)
+    thread.start()
+    yield httpd
+    httpd.state['stop'].set()
+    httpd.shutdown()
+
+
+def _client(server):
+    return PlaidClient(f'http://127.0.0.1:{server.server_port}', 'tok')
+
+
+def _wait(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_reopened_connection_catches_up_from_the_audit_log(server):
+    # op3 was published while the stream was down; op2 is re-read by the
+    # overlap and op4 arrives live on the new stream too.
+    server.state.update(streams=[[(None, 1), (None, 2)], [(None, 4), (None, 5)]],
+                        log=[2, 3, 4])
+    client, resume, seen = _client(server), ResumePoint(), []
+
+    def on_event(event_type, data):
+        seen.append(data['id'])
+
+    conn = SSEConnection(client, 'p', on_event, resume=resume)
+    _wait(lambda: conn.ready_state == 2)
+    assert seen == ['op1', 'op2'] and server.state['audits'] == []
+    assert resume.resumable and resume.last_event_time == '2026-01-01T00:00:02.000Z'
+
+    conn = SSEConnection(client, 'p', on_event, resume=resume)
+    _wait(lambda: conn.ready_state == 2)
+    assert seen == ['op1', 'op2', 'op3', 'op4', 'op5']
+    assert server.state['audits'] == ['2025-12-31T23:59:57.000Z']
+    assert server.state['connects'] == [None, None] and resume.catch_ups == 1
+
+
+def test_caught_up_entries_look_like_live_events(server):
+    server.state.update(streams=[[(None, 1)], [(None, 3)]], log=[1, 2])
+    client, resume, seen = _client(server), ResumePoint(), []
+    for _ in range(2):
+        conn = SSEConnection(client, 'p', lambda t, d: seen.append(d), resume=resume)
+        _wait(lambda: conn.ready_state == 2)
+    live, caught_up = seen[0], seen[1]
+    assert caught_up['id'] == 'op2' and caught_up['ops'] == [
+        {'id': 'op2', 'type': 'token_layer:create', 'project': 'p', 'document': 'd',
+         'description': 'x'}]
+    assert caught_up['user'] == live['user'] == 'u'
+    assert caught_up['projects'] == live['projects'] == ['p']
+    # Only the op's own document: the other bumped documents are not logged.
+    assert caught_up['documents'] == ['d'] and live['documents'] == ['d', 'd2']
+
+
+def test_catch_up_runs_while_the_client_is_batching(server):
+    server.state.update(streams=[[(None, 1)], [(None, 3)]], log=[1, 2])
+    client, resume, seen = _client(server), ResumePoint(), []
+    conn = SSEConnection(client, 'p', lambda t, d: seen.append(d['id']), resume=resume)
+    _wait(lambda: conn.ready_state == 2)
+    with client.batched():
+        conn = SSEConnection(client, 'p', lambda t, d: seen.append(d['id']), resume=resume)
+        _wait(lambda: conn.ready_state == 2)
+    assert seen == ['op1', 'op2', 'op3'] and resume.catch_ups == 1
+
+
+def test_event_ids_are_sent_back_instead_of_catching_up(server):
+    server.state.update(streams=[[('e1', 1)], [('e2', 2)]], log=[1, 2])
+    client, resume, seen = _client(server), ResumePoint(), []
+    for _ in range(2):
+        conn = SSEConnection(client, 'p', lambda t, d: seen.append(d['id']), resume=resume)
+        _wait(lambda: conn.ready_state == 2)
+    assert seen == ['op1', 'op2']
+    assert server.state['connects'] == [None, 'e1'] and server.state['audits'] == []
+    assert resume.last_event_id == 'e2'
+
+
+def test_failed_catch_up_closes_and_starts_afresh(server):
+    server.state.update(streams=[[(None, 1)]], audit_status=500)
+    client, resume = _client(server), ResumePoint()
+    conn = SSEConnection(client, 'p', lambda t, d: None, resume=resume)
+    _wait(lambda: conn.ready_state == 2)
+    conn = SSEConnection(client, 'p', lambda t, d: None, resume=resume)
+    _wait(lambda: conn.ready_state == 2)
+    assert len(server.state['audits']) == 1 and not resume.resumable
+    # Nothing to resume from: the next connection just opens.
+    conn = SSEConnection(client, 'p', lambda t, d: None, resume=resume)
+    _wait(lambda: conn.ready_state == 1)
+    assert len(server.state['audits']) == 1
+    conn.close()
+
+
+def test_multiplexed_listener_resumes_by_itself(server):
+    server.state.update(streams=[[(None, 1)], [(None, 3)]], log=[1, 2])
+    seen = []
+    with SSEMultiplexer(reconnect_interval=5) as mux:
+        # The stream's 10 ms retry hint overrides the interval.
+        channel = _client(server).messages.listen('p', lambda t, d: seen.append(d['id']),
+                                                  mux=mux)
+        _wait(lambda: len(seen) == 3 and channel.ready_state == 1)
+        assert seen == ['op1', 'op2', 'op3'] and len(server.state['audits']) == 2
+
+
+def test_async_listen_resumes(server):
+    server.state.update(streams=[[(None, 1)], [(None, 3)]], log=[1, 2])
+    client = _client(server)
+
+    async def read():
+        seen = []
+        async for _event_type, data in sse_async.listen(client, 'p'):
+            seen.append(data['id'])
+            if len(seen) == 3:
+                return seen
+
+    assert asyncio.run(asyncio.wait_for(read(), 5)) == ['op1', 'op2', 'op3']
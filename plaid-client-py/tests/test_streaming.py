@@ -0,0 +1,101 @@
+"""Tests for streamed (chunked-upload) JSON request bodies.
+
+The end-to-end test runs a throwaway local HTTP server that decodes the
+chunked upload, so it needs no Plaid server.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import PlaidClient
+from plaid_client.http import iter_json_array
+from plaid_client.transforms import transform_request
+
+
+def _items(n):
+    return [{'token_layer_id': 'L', 'text': 'T', 'begin': i, 'end': i + 1,
+             'metadata': {'note': 'ü' * (i % 3)}} for i in range(n)]
+
+
+def test_iter_json_array_matches_json_dumps():
+    items = _items(500)
+    streamed = b''.join(iter_json_array(items, transform_request, chunk_bytes=1024))
+    assert json.loads(streamed) == transform_request(items)
+    assert b''.join(iter_json_array([])) == b'[]'
+
+
+def test_iter_json_array_flushes_bounded_chunks():
+    chunks = list(iter_json_array(_items(2000), chunk_bytes=4096))
+    assert len(chunks) > 10
+    # each chunk stops right after crossing the threshold (one item's worth)
+    assert max(len(c) for c in chunks) < 4096 + 200
+
+
+class _ChunkedEcho(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        assert self.headers.get('Transfer-Encoding') == 'chunked'
+        body = b''
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                break
+            body += self.rfile.read(size)
+            self.rfile.readline()
+        items = json.loads(body)
+        type(self).received.append(items)
+        if self.path.startswith('/api/v1/batch'):
+            out = [{'status': 201, 'headers': {}, 'body': {'ids': ['x']}} for _ in items]
+        else:
+            out = {'ids': [f'id-{i}' for i in range(len(items))]}
+        payload = json.dumps(out).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    _ChunkedEcho.received = []
+    server = HTTPServer(('127.0.0.1', 0), _ChunkedEcho)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_bulk_create_streams_a_chunked_upload(echo_server):
+    client = PlaidClient(echo_server, 'tok', stream_json=True)
+    result = client.tokens.bulk_create(_items(3000))
+    assert result == {'ids': [f'id-{i}' for i in range(3000)]}
+    assert _ChunkedEcho.received[0] == transform_request(_items(3000))
+
+
+def test_batch_submission_streams_a_chunked_upload(echo_server):
+    client = PlaidClient(echo_server, 'tok', stream_json=True)
+    with client.batched() as b:
+        client.tokens.bulk_create(_items(10))
+        client.spans.bulk_delete(['S1', 'S2'])
+    assert len(b.results) == 2
+    ops = _ChunkedEcho.received[0]
+    assert ops[0]['path'] == '/api/v1/tokens/bulk'
+    assert ops[0]['body'] == transform_request(_items(10))
+    assert ops[1] == {'path': '/api/v1/spans/bulk', 'method': 'DELETE', 'body': ['S1', 'S2']}
@@ -0,0 +1,110 @@
+"""Tests for the columnar TokenTable / SpanTable.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+from plaid_client import SpanTable, TokenTable
+from plaid_client.tables import NO_PRECEDENCE
+
+from test_skeleton import _QueryServer, _client, _token
+
+
+def _tokens(extents, prefix='t'):
+    return [{'id': f'{prefix}{i}', 'text': 'X', 'begin': b, 'end': e, 'precedence': None}
+            for i, (b, e) in enumerate(extents)]
+
+
+def test_rows_are_sorted_and_round_trip():
+    tokens = _tokens([(6, 11), (0, 5), (0, 3)])
+    tokens[0]['metadata'] = {'timeBegin': 1.5}
+    tokens[1]['precedence'] = 2
+    table = TokenTable.from_tokens(tokens, layer='WORD')
+
+    assert len(table) == 3 and table.layer == 'WORD'
+    assert table.ids == ['t2', 't1', 't0']
+    assert list(table.begin) == [0, 0, 6] and list(table.end) == [3, 5, 11]
+    assert list(table.precedence) == [NO_PRECEDENCE, 2, NO_PRECEDENCE]
+    assert table.row(2) == tokens[0]
+    assert table.to_tokens() == sorted(tokens, key=lambda t: (t['begin'], t['end']))
+    assert table.metadata(0) == {} and table.metadata(2) == {'timeBegin': 1.5}
+    assert table.metadata_column('timeBegin', 0) == [0, 0, 1.5]
+    assert table.row_of('t0') == 2
+    with pytest.raises(KeyError):
+        table.row_of('nope')
+
+
+def test_ids_are_interned():
+    table = TokenTable.from_tokens(_tokens([(0, 1)], prefix=''.join(['to', 'ken-'])))
+    assert table.ids[0] is sys.intern('token-0')
+
+
+def test_within_overlapping_and_overlaps_any():
+    # A long token early on must still be found by overlap queries far to its right.
+    table = TokenTable.from_tokens(_tokens([(0, 100), (10, 12), (20, 25), (30, 30), (40, 45)]))
+    assert table.within(10, 30) == [1, 2, 3]
+    assert table.within(11, 30) == [2, 3]
+    assert table.overlapping(24, 41) == [0, 2, 3, 4]
+    assert table.overlapping(100, 200) == []
+    assert table.overlapping(12, 20) == [0]
+    assert table.overlaps_any([0, 100, 44], [1, 150, 46]) == [True, False, True]
+    assert TokenTable.from_tokens([]).overlaps_any([0], [5]) == [False]
+
+
+def test_containers_and_group():
+    sentences = TokenTable.from_tokens(_tokens([(13, 17), (0, 12)], prefix='s'))
+    words = TokenTable.from_tokens(_tokens([(0, 5), (6, 12), (10, 14), (13, 17), (18, 20)]))
+    assert list(sentences.containers(words)) == [0, 0, -1, 1, -1]
+    assert sentences.group(words) == [[0, 1], [3]]
+
+
+def test_take_and_argsort():
+    tokens = _tokens([(0, 5), (6, 11), (12, 15)])
+    tokens[2]['metadata'] = {'timeBegin': 0.0}
+    tokens[0]['metadata'] = {'timeBegin': 3.0}
+    table = TokenTable.from_tokens(tokens)
+    subset = table.take([2, 0])
+    assert subset.ids == ['t0', 't2'] and subset.metadata(1) == {'timeBegin': 0.0}
+    assert table.argsort(table.metadata_column('timeBegin', 1.0)) == [2, 1, 0]
+    assert table.argsort('end') == [0, 1, 2]
+    with pytest.raises(ValueError):
+        table.argsort([1])
+
+
+def test_span_table():
+    tokens = TokenTable.from_tokens(_tokens([(0, 5), (6, 11), (12, 15)]))
+    spans = [
+        {'id': 'b', 'value': 'NOUN', 'tokens': ['t2']},
+        {'id': 'a', 'value': 'VERB', 'tokens': ['t1', 't0'], 'metadata': {'prov': 'inferred'}},
+        {'id': 'c', 'value': 'NOUN', 'tokens': ['t1']},
+    ]
+    table = SpanTable.from_spans(spans, tokens, layer='UPOS')
+    assert table.ids == ['a', 'c', 'b']
+    assert table.values[1] is table.values[2]
+    assert list(table.token_rows(0)) == [0, 1]
+    assert table.row(0) == {'id': 'a', 'value': 'VERB', 'tokens': ['t0', 't1'],
+                            'metadata': {'prov': 'inferred'}}
+    assert table.extent(0) == (0, 11)
+    assert table.spans_of(1) == [0, 1]
+    assert table.overlapping(10, 13) == [0, 1, 2]
+    assert table.row_of('b') == 2
+    with pytest.raises(ValueError, match='not in the token table'):
+        SpanTable.from_spans([{'id': 'x', 'tokens': ['zz']}], tokens)
+
+
+def test_skeleton_tables():
+    rows = [_token(1, 'WORD', 6, 11, {'timeBegin': 2.0}), _token(0, 'WORD', 0, 5)]
+    result = _client(_QueryServer(rows)).documents.get_skeleton(
+        'D', ['WORD', 'EMPTY'], text_layer_ids=[], metadata=['timeBegin'], tables=True)
+    word = result['token_layers']['WORD']
+    assert isinstance(word, TokenTable) and word.layer == 'WORD'
+    assert word.ids == ['WORD-0', 'WORD-1']
+    assert word.metadata(1) == {'timeBegin': 2.0} and word.metadata(0) == {}
+    assert len(result['token_layers']['EMPTY']) == 0
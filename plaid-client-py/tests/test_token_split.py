@@ -0,0 +1,59 @@
+"""Tests for TokenProcessor's cross-sentence token splitting.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from plaid_client.workflows.tokenization import TokenProcessor
+
+
+def _span(begin, end, **extra):
+    return {'begin': begin, 'end': end, **extra}
+
+
+def _scan(tokens, sentences):
+    """The per-token scan over every sentence the sweep replaces."""
+    result = []
+    for t in tokens:
+        hits = [s for s in sentences if t['begin'] < s['end'] and t['end'] > s['begin']]
+        if len(hits) <= 1:
+            result.append(None)
+        else:
+            result.append([_span(max(t['begin'], s['begin']), min(t['end'], s['end']))
+                           for s in sorted(hits, key=lambda s: (s['begin'], s['end']))])
+    return result
+
+
+def test_pieces_and_flat_split():
+    processor = TokenProcessor()
+    sentences = [_span(10, 20), _span(0, 10), _span(20, 30)]
+    tokens = [_span(25, 28, id='c'), _span(8, 22, id='a'), _span(2, 5, id='b'),
+              _span(30, 35, id='d')]
+    assert processor._split_pieces(tokens, sentences) == [
+        None, [_span(8, 10), _span(10, 20), _span(20, 22)], None, None]
+    assert processor._split_cross_sentence_tokens(tokens, sentences) == [
+        tokens[0], _span(8, 10), _span(10, 20), _span(20, 22), tokens[2], tokens[3]]
+    # Nothing to split against with a single sentence.
+    assert processor._split_pieces(tokens, [_span(0, 40)]) == [None] * 4
+
+
+def test_sweep_matches_a_full_scan():
+    rng = random.Random(3)
+    processor = TokenProcessor()
+    for _ in range(50):
+        cuts = sorted(rng.sample(range(1, 200), 12))
+        sentences = [_span(b, e) for b, e in zip([0] + cuts, cuts + [200])]
+        if rng.random() < 0.3:
+            sentences.append(_span(rng.randrange(200), rng.randrange(200, 260)))  # overlapping
+        tokens = []
+        for _ in range(80):
+            b = rng.randrange(210)
+            tokens.append(_span(b, b + rng.randrange(1, 40)))
+        assert processor._split_pieces(tokens, sentences) == _scan(tokens, sentences)
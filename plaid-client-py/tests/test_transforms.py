@@ -20,7 +20,8 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from plaid_client.transforms import transform_request
+from plaid_client import transforms
+from plaid_client.transforms import OPAQUE_KEYS, transform_request, transform_response
 
 
 def test_field_path_value_is_not_recased():
@@ -62,8 +63,103 @@ def test_layer_structural_slot_keys_recase():
                                   'parent-token-layer': '?p'}
 
 
+def _reference(obj, convert, opaque_on_new_key):
+    # The original recursive transformer, kept as the behavioural spec.
+    if isinstance(obj, list):
+        return [_reference(item, convert, opaque_on_new_key) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    out = {}
+    for key, value in obj.items():
+        new_key = convert(key)
+        if (new_key if opaque_on_new_key else key) in OPAQUE_KEYS and isinstance(value, dict):
+            out[new_key] = value
+        else:
+            out[new_key] = _reference(value, convert, opaque_on_new_key)
+    return out
+
+
+def _response_doc():
+    return {
+        'document/id': 'D', 'document/name': 'doc', 'document/version': 'v1',
+        'document/metadata': {'case-marker': {'nested-key': 1}},
+        'document/text-layers': [{
+            'text-layer/id': 'TL', 'config': {'ui-hint': True},
+            'text-layer/text': {'text/id': 'T', 'text/body': 'a-b', 'metadata': 'not-a-dict'},
+            'text-layer/token-layers': [{
+                'token-layer/tokens': [{'token/id': f't{i}', 'token/begin': i, 'token/end': i + 1,
+                                        'metadata': {'x-y': i}} for i in range(5)],
+                'token-layer/span-layers': [[{'span/value': None, 'span/tokens': ['t0']}]],
+            }],
+        }],
+    }
+
+
+def test_response_transform_matches_recursive_reference():
+    doc = _response_doc()
+    out = transform_response(doc)
+    assert out == _reference(doc, lambda k: k.replace('-', '_').split('/', 1)[-1], True)
+    assert list(out) == ['id', 'name', 'version', 'metadata', 'text_layers']
+    # opaque dicts are shared verbatim; everything else is a fresh copy
+    assert out['metadata'] is doc['document/metadata']
+    token = out['text_layers'][0]['token_layers'][0]['tokens'][0]
+    assert token['metadata'] == {'x-y': 0}
+    assert out['text_layers'][0]['token_layers'] is not \
+        doc['document/text-layers'][0]['text-layer/token-layers']
+
+
+def test_request_transform_matches_recursive_reference():
+    body = {'layer_id': 'L', 'metadata': {'keep_me': 1}, 'config': 'scalar_value',
+            'tokens': [{'text_id': 'T', 'metadata': {'a_b': [1, {'c_d': 2}]}},
+                       [{'nested_list': [None, 1.5, 'x_y']}]]}
+    out = transform_request(body)
+    assert out == _reference(body, lambda k: k.replace('_', '-'), False)
+    assert out['metadata'] is body['metadata']
+    assert out['tokens'][0]['metadata'] is body['tokens'][0]['metadata']
+
+
+def test_opaque_check_uses_original_key_on_requests_and_new_key_on_responses():
+    # 'meta_data' -> 'meta-data' is never opaque; a namespaced response key
+    # that strips to 'config' is.
+    assert transform_request({'meta_data': {'a_b': 1}}) == {'meta-data': {'a-b': 1}}
+    assert transform_response({'layer/config': {'a-b': 1}}) == {'config': {'a-b': 1}}
+
+
+def test_deep_nesting_does_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    doc = leaf = {}
+    for _ in range(depth):
+        child = {}
+        leaf['child-node'] = [child]
+        leaf = child
+    out = transform_response(doc)
+    for _ in range(depth):
+        out = out['child_node'][0]
+    assert out == {}
+
+
+def test_scalars_and_none_pass_through():
+    assert transform_response(None) is None
+    assert transform_request('a_b') == 'a_b'
+    assert transform_response(3) == 3
+    assert transform_response([]) == []
+
+
+def test_key_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(transforms, '_KEY_CACHE_MAX', 8)
+    monkeypatch.setattr(transforms, '_to_snake_cache', {})
+    for i in range(50):
+        assert transforms.key_to_snake(f'ns/key-{i}') == f'key_{i}'
+    assert len(transforms._to_snake_cache) <= 8
+
+
 if __name__ == '__main__':
     test_field_path_value_is_not_recased()
     test_bindings_keys_and_values_pass_through_verbatim()
     test_layer_structural_slot_keys_recase()
+    test_response_transform_matches_recursive_reference()
+    test_request_transform_matches_recursive_reference()
+    test_opaque_check_uses_original_key_on_requests_and_new_key_on_responses()
+    test_deep_nesting_does_not_recurse()
+    test_scalars_and_none_pass_through()
     print('ok')
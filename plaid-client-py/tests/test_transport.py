@@ -0,0 +1,183 @@
+"""Tests for the optional httpx transport — through httpx.MockTransport, and
+against a local server for aborting a streamed body.
+
+Skipped when httpx is not installed.
+
+Run with::
+
+    cd plaid-client-py && python -m pytest tests/ -q
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from plaid_client import PlaidAPIError, PlaidClient
+from plaid_client.sse import abort_response
+from plaid_client.transport import HTTPXSession
+
+
+def _client(handler, **kwargs):
+    session = HTTPXSession(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return PlaidClient('http://x', 'tok', session=session, **kwargs)
+
+
+def test_json_request_and_response():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={'document/id': 'D', 'document/version': 'v2',
+                                         'document/name': 'n'},
+                              headers={'X-Document-Versions': '{"D": "v2"}'})
+
+    client = _client(handler)
+    assert client.documents.update('D', 'n') == {'id': 'D', 'version': 'v2', 'name': 'n'}
+    request = seen[0]
+    assert request.method == 'PATCH' and request.url.path == '/api/v1/documents/D'
+    assert request.headers['Authorization'] == 'Bearer tok'
+    assert json.loads(request.content) == {'name': 'n'}
+    assert client.document_versions == {'D': 'v2'}
+
+
+def test_strict_mode_stamp_and_binary_response():
+    urls = []
+
+    def handler(request):
+        urls.append(str(request.url))
+        return httpx.Response(200, content=b'\x00\x01', headers={'content-type': 'audio/wav'})
+
+    client = _client(handler)
+    client.document_versions['D'] = 'v7'
+    client.enter_strict_mode('D')
+    assert client.documents.update('D', 'n') == '\x00\x01'
+    assert urls[-1].endswith('?document-version=v7')
+    assert client.documents.get_media('D') == b'\x00\x01'
+
+
+def test_http_errors_match_requests_transport():
+    def handler(request):
+        return httpx.Response(404, json={'error': 'Document not found'})
+
+    with pytest.raises(PlaidAPIError) as info:
+        _client(handler).documents.get('D')
+    err = info.value
+    assert err.status == 404 and err.status_text == 'Not Found'
+    assert str(err) == 'HTTP 404 Document not found at http://x/api/v1/documents/D'
+    assert err.response_data == {'error': 'Document not found'}
+
+
+def test_timeouts_and_network_errors():
+    def timing_out(request):
+        raise httpx.ReadTimeout('slow', request=request)
+
+    with pytest.raises(PlaidAPIError, match='timed out') as info:
+        _client(timing_out, timeout=0.5).documents.get('D')
+    assert type(info.value.original_error).__name__ == 'ReadTimeout'
+
+    def refusing(request):
+        raise httpx.ConnectError('refused', request=request)
+
+    with pytest.raises(PlaidAPIError, match='Network error') as info:
+        _client(refusing).documents.get('D')
+    assert info.value.status == 0
+
+
+def test_streamed_body_is_sent_chunked():
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(200, json={'ids': ['a', 'b']})
+
+    client = _client(handler, stream_json=True)
+    ops = [{'token_layer_id': 'L', 'text': 'T', 'begin': 0, 'end': 1}] * 2
+    assert client.tokens.bulk_create(ops) == {'ids': ['a', 'b']}
+    assert json.loads(bodies[0])[0]['token-layer-id'] == 'L'
+
+
+def test_streamed_response_lines():
+    body = (b'event: progress\ndata: {"progress": {"percent": 50}}\n\n'
+            b'event: result\ndata: {"data": {"ok": true}}\n\n')
+
+    def handler(request):
+        assert request.headers['Accept'] == 'text/event-stream'
+        return httpx.Response(200, content=body, headers={'content-type': 'text/event-stream'})
+
+    resp = _client(handler).session.post('http://x/stream', stream=True, timeout=(10, None),
+                                         headers={'Accept': 'text/event-stream'})
+    lines = list(resp.iter_lines(decode_unicode=True))
+    resp.close()
+    assert lines[:2] == ['event: progress', 'data: {"progress": {"percent": 50}}']
+    assert lines[-2] == 'data: {"data": {"ok": true}}'
+
+
+class _IdleStream(BaseHTTPRequestHandler):
+    """Sends one SSE line, then nothing until the test ends."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.wfile.write(b'8\r\n: hello\n\r\n')
+        self.wfile.flush()
+        self.server.stop.wait(10)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_abort_wakes_a_blocked_streamed_read():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _IdleStream)
+    httpd.daemon_threads = True
+    httpd.stop = threading.Event()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    session = HTTPXSession(http2=False)
+    try:
+        resp = session.get(f'http://127.0.0.1:{httpd.server_port}/listen', stream=True,
+                           timeout=(5, 30))
+        lines, ended = [], threading.Event()
+
+        def read():
+            try:
+                for line in resp.iter_lines(decode_unicode=True):
+                    lines.append(line)
+            except Exception:
+                pass
+            ended.set()
+
+        threading.Thread(target=read, daemon=True).start()
+        deadline = time.time() + 5
+        while not lines:
+            assert time.time() < deadline
+            time.sleep(0.01)
+        started = time.time()
+        abort_response(resp)
+        assert ended.wait(5) and time.time() - started < 2
+        assert lines == [': hello']
+    finally:
+        httpd.stop.set()
+        httpd.shutdown()
+        session.close()
+
+
+def test_transport_selection():
+    client = PlaidClient('http://x', 'tok', transport='httpx')
+    try:
+        assert isinstance(client.session, HTTPXSession)
+    finally:
+        client.close()
+    with pytest.raises(ValueError, match='Unknown transport'):
+        PlaidClient('http://x', 'tok', transport='carrier-pigeon')
@@ -138,27 +138,18 @@ class NLTKTokenizerService(BaseService):
             return
         
         try:
-            # Get document text
+            # Get document text (just the text: the token processor reads
+            # the token offsets it needs itself)
             response_helper.progress(5, "Fetching document...")
-            full_document = self.client.documents.get(document_id, include_body=True)
-
-            # Find the specified text layer
-            text_layer = None
-            for layer in full_document.get("text_layers", []):
-                if layer.get("id") == text_layer_id:
-                    text_layer = layer
-                    break
-            
-            if not text_layer:
-                response_helper.error(f"Text layer {text_layer_id} not found in document {document_id}")
-                return
-            
-            if "text" not in text_layer or text_layer["text"] is None:
+            skeleton = self.client.documents.get_skeleton(document_id, [],
+                                                          text_layer_ids=[text_layer_id])
+            text = skeleton["texts"].get(text_layer_id)
+            if text is None:
                 response_helper.error(f"Text does not exist for text layer {text_layer_id}")
                 return
 
             # Find the text content
-            text_content = text_layer["text"]["body"]
+            text_content = text["body"]
             
             if not text_content.strip():
                 response_helper.error(f"Text content is empty for document {document_id}")
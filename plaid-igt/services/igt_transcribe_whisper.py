@@ -215,7 +215,7 @@ class WhisperASRService(BaseService):
         try:
             # Get document to fetch media URL
             response_helper.progress(5, "Fetching document...")
-            full_document = self.client.documents.get(document_id, include_body=True)
+            full_document = self.client.documents.get(document_id, include_body=True, raw=False)
             
             # Get media URL from document
             media_url = full_document.get("media_url")
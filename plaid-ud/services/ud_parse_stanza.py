@@ -1,7 +1,8 @@
 import stanza
 import traceback
-from plaid_client import (BaseService, TASKS, Param, ROLES, find_by_role,
+from plaid_client import (BaseService, TASKS, Param, ROLES, LayerIndex, get_layer_index,
                           stamp_inferred, is_protected, service_source)
+from plaid_client.workflows.intervals import IntervalIndex
 
 
 def prov_fragment(language):
@@ -66,10 +67,10 @@ clobbering their work.
 class PipelineProvider:
     """Lazily build and cache one Stanza pipeline per language.
 
-    The pipelines are not thread-safe, so callers must build + drive them under
-    a single-flight lock (BaseService.handle_service_request provides one). Each
-    distinct language used adds one cached pipeline (and a one-time model
-    download)."""
+    The pipelines are not thread-safe, so a provider must only be driven from
+    one thread at a time (the service declares ``thread_safe=False``, so each
+    BaseService worker builds its own). Each distinct language used adds one
+    cached pipeline (and a one-time model download)."""
 
     def __init__(self, processors='tokenize,pos,lemma,depparse'):
         self.processors = processors
@@ -89,30 +90,6 @@ class PipelineProvider:
         return pipe
 
 
-def span_layer_by_ud_config(layers, key, fallback_name=None):
-    for layer in layers:
-        if layer.get("config", {}).get("ud", {}).get(key) is True:
-            return layer
-    if fallback_name:
-        return next((layer for layer in layers if layer.get("name") == fallback_name), None)
-    return None
-
-
-def relation_layer_by_ud_config(span_layer, key, fallback_index=0):
-    if not span_layer:
-        return None
-    relation_layers = span_layer.get("relation_layers") or []
-    for relation_layer in relation_layers:
-        if relation_layer.get("config", {}).get("ud", {}).get(key) is True:
-            return relation_layer
-    if relation_layers:
-        try:
-            return relation_layers[fallback_index]
-        except IndexError:
-            return relation_layers[0]
-    return None
-
-
 def make_bulk_token(token_layer_id, text, begin, end, metadata=None):
     op = {
         "token_layer_id": token_layer_id,
@@ -197,12 +174,12 @@ def morpheme_sentence_index(sent_groups, morphemes):
     """Map each syntactic-word (morpheme) token id to the index of its sentence
     in `sent_groups`, by character containment (the sentence layer partitions
     the text, so each morpheme falls in exactly one sentence)."""
+    sentences = IntervalIndex(sent for sent, _ws in sent_groups)
     m2s = {}
     for m in morphemes or []:
-        for idx, (sent, _ws) in enumerate(sent_groups):
-            if sent["begin"] <= m["begin"] and m["end"] <= sent["end"]:
-                m2s[m["id"]] = idx
-                break
+        idx = sentences.find_container(m["begin"], m["end"])
+        if idx is not None:
+            m2s[m["id"]] = idx
     return m2s
 
 
@@ -291,44 +268,91 @@ def parse_document(pipeline_provider, client, document_id, language='en', overwr
         log(f"Starting parse for document {document_id}")
 
         # Resolve layers FIRST — the parse mode depends on what exists.
-        log("Fetching document with layers…")
-        full_document = client.documents.get(document_id, include_body=True)
-        log("  …document fetched")
         # Resolve the substrate by its cross-app role tag (config.plaid.role),
-        # never by position: find_by_role returns None rather than guessing, so
-        # a missing/mistagged baseline fails loudly instead of parsing the wrong
+        # never by position: by_role returns None rather than guessing, so a
+        # missing/mistagged baseline fails loudly instead of parsing the wrong
         # text layer. The parse runs on (and offsets into) THIS baseline body —
         # parsing one string while offsetting into another would corrupt tokens.
-        text_layers = full_document["text_layers"]
-        text_layer = find_by_role(text_layers, ROLES.BASELINE)
-        if not text_layer:
+        # Layer ids come from the project's shared layer index, which may be
+        # up to a minute old (or, in a --multiplex service, as old as the
+        # audit stream's delivery): a layer it lacks is looked up afresh
+        # before it is reported missing.
+        document = client.documents.get(document_id, raw=False)
+
+        def resolve(refresh=False):
+            layers = get_layer_index(client, document["project"], refresh=refresh)
+            baseline = layers.by_role(ROLES.BASELINE)
+            # Substrate token layers are bound by their shared role
+            # (config.plaid.role), NOT by the per-app ud.* flags. UD's
+            # "Morphemes" layer carries role "syntactic-word" (it holds CoNLL-U
+            # syntactic words), not "morpheme".
+            substrate = [layers.by_role(role, parent_id=baseline["id"]) if baseline else None
+                         for role in (ROLES.SENTENCE, ROLES.WORD, ROLES.SYNTACTIC_WORD)]
+            return layers, baseline, substrate
+
+        layers, baseline, substrate = resolve()
+        fresh = not (baseline and all(substrate))
+        if fresh:
+            layers, baseline, substrate = resolve(refresh=True)
+        if not baseline:
             raise RuntimeError("Project has no baseline-role text layer")
-        text_id = text_layer["text"]["id"]
-        body = text_layer["text"]["body"]
+        if not all(substrate):
+            raise RuntimeError("Project is missing the sentence/word/morpheme token layers")
+        substrate_ids = [layer["id"] for layer in substrate]
+
+        if overwrite:
+            # Human-made work is replaced anyway, so the provenance guards have
+            # nothing to protect: read just the text and the substrate offsets,
+            # not every annotation in the document. The guards then walk the
+            # project's (annotation-free) layer tree and find nothing. That
+            # tree is also where the layers written to come from, so it must
+            # not be a cached copy that predates a layer's deletion.
+            if not fresh:
+                layers, baseline, substrate = resolve(refresh=True)
+                if not (baseline and all(substrate)
+                        and [layer["id"] for layer in substrate] == substrate_ids):
+                    raise RuntimeError(
+                        f"Layers of project {document['project']} changed while the "
+                        f"parse was starting; please try again")
+            log("Fetching text and substrate tokens…")
+            skeleton = client.documents.get_skeleton(document_id, substrate_ids,
+                                                     text_layer_ids=[baseline["id"]])
+            tree = layers
+            text = skeleton["texts"].get(baseline["id"])
+            tokens = skeleton["token_layers"]
+        else:
+            log("Fetching document with layers…")
+            full_document = client.documents.get(document_id, include_body=True, raw=False)
+            tree = LayerIndex(full_document["text_layers"])
+            text = (tree.layer(baseline["id"]) or {}).get("text")
+            tokens = {layer_id: (tree.layer(layer_id) or {}).get("tokens") or []
+                      for layer_id in substrate_ids}
+        log("  …document fetched")
+
+        text_layer = tree.layer(baseline["id"])
+        sentence_layer, word_layer, morpheme_layer = (tree.layer(i) for i in substrate_ids)
+        if not (text_layer and sentence_layer and word_layer and morpheme_layer):
+            raise RuntimeError(f"Layers of document {document_id} changed while it was being read")
+        text_id = (text or {}).get("id")
+        body = (text or {}).get("body")
         if not (body or "").strip():
             raise RuntimeError(f"Text content is empty for document {document_id}")
-
-        # Substrate token layers are bound by their shared role (config.plaid.role),
-        # NOT by the per-app ud.* flags. UD's "Morphemes" layer carries role
-        # "syntactic-word" (it holds CoNLL-U syntactic words), not "morpheme".
         token_layers = text_layer.get("token_layers", [])
-        sentence_layer = find_by_role(token_layers, ROLES.SENTENCE)
-        word_layer = find_by_role(token_layers, ROLES.WORD)
-        morpheme_layer = find_by_role(token_layers, ROLES.SYNTACTIC_WORD)
 
-        if not (sentence_layer and word_layer and morpheme_layer):
-            raise RuntimeError("Project is missing the sentence/word/morpheme token layers")
+        def ud_span_layer(key, fallback_name):
+            layer = layers.span_layer_by_ud_config(morpheme_layer["id"], key, fallback_name)
+            return tree.layer(layer["id"]) if layer else None
 
-        span_layers = morpheme_layer.get("span_layers", [])
-        form_layer = span_layer_by_ud_config(span_layers, "form", "Form")
-        lemma_layer = span_layer_by_ud_config(span_layers, "lemma", "Lemma")
-        upos_layer = span_layer_by_ud_config(span_layers, "upos", "UPOS")
-        xpos_layer = span_layer_by_ud_config(span_layers, "xpos", "XPOS")
-        features_layer = span_layer_by_ud_config(span_layers, "features", "Features")
+        form_layer = ud_span_layer("form", "Form")
+        lemma_layer = ud_span_layer("lemma", "Lemma")
+        upos_layer = ud_span_layer("upos", "UPOS")
+        xpos_layer = ud_span_layer("xpos", "XPOS")
+        features_layer = ud_span_layer("features", "Features")
 
-        existing_sentences = sorted(sentence_layer.get("tokens") or [], key=lambda t: t["begin"])
-        existing_words = sorted(word_layer.get("tokens") or [], key=lambda t: (t["begin"], t["end"]))
-        existing_morphemes = morpheme_layer.get("tokens", []) or []
+        sentence_id, word_id, morpheme_id = substrate_ids
+        existing_sentences = sorted(tokens[sentence_id], key=lambda t: t["begin"])
+        existing_words = sorted(tokens[word_id], key=lambda t: (t["begin"], t["end"]))
+        existing_morphemes = tokens[morpheme_id]
         log(f"Existing tokens: {len(existing_sentences)} sentences, "
             f"{len(existing_words)} words, {len(existing_morphemes)} syntactic words")
 
@@ -345,11 +369,9 @@ def parse_document(pipeline_provider, client, document_id, language='en', overwr
             # Group the existing words under their containing sentences (the
             # sentence layer is partitioning, so containment is well-defined);
             # keep the sentence object alongside for per-sentence decisions.
-            sent_groups = []  # [(sentence_token, [word_tokens])]
-            for sent in existing_sentences:
-                ws = [w for w in existing_words
-                      if sent["begin"] <= w["begin"] and w["end"] <= sent["end"]]
-                sent_groups.append((sent, ws))
+            words = IntervalIndex(existing_words)
+            sent_groups = [(sent, words.within(sent["begin"], sent["end"]))
+                           for sent in existing_sentences]  # [(sentence_token, [word_tokens])]
             grouped_count = sum(len(ws) for _, ws in sent_groups)
             if grouped_count != len(existing_words):
                 log(f"  WARNING: {len(existing_words) - grouped_count} word token(s) "
@@ -524,7 +546,8 @@ def parse_document(pipeline_provider, client, document_id, language='en', overwr
         order = []  # which kind sits at each index in the batch results
         with client.batched() as token_batch:
             if sentence_ops:
-                client.tokens.bulk_create(sentence_ops)
+                # Sentences partition the text: never split into sub-requests.
+                client.tokens.bulk_create(sentence_ops, chunked=False)
                 order.append("sentences")
             if word_ops:
                 client.tokens.bulk_create(word_ops)
@@ -628,7 +651,8 @@ def parse_document(pipeline_provider, client, document_id, language='en', overwr
             log(f"Created {count} {label} spans")
 
         # 5. Dependency relations on lemma spans.
-        relation_layer = relation_layer_by_ud_config(lemma_layer, "dependency")
+        relation_layer = (layers.relation_layer_by_ud_config(lemma_layer["id"], "dependency")
+                          if lemma_layer else None)
         if relation_layer and lemma_layer:
             relation_ops = []
             for sent_idx, sentence_data in enumerate(sentences_data):
@@ -678,7 +702,7 @@ class StanzaParserService(BaseService):
     """Stanza-based UD parser served on every accessible project.
 
     Built on the shared `BaseService` SDK (client/token bootstrap, registration,
-    the single-flight processing lock, and the CLI loop). Per-request user args
+    the worker pool, and the CLI loop). Per-request user args
     (`language`, `overwrite`) are declared in the parameter schema below and read
     back from `request_data` in `process_request`. Audit attribution comes from
     the named API token the service authenticates with (mint one under
@@ -701,23 +725,25 @@ class StanzaParserService(BaseService):
                                           'verified annotations (discarding them). When off, '
                                           'those sentences are left untouched.'),
             ],
+            # Stanza pipelines are not thread-safe: with --workers N, each
+            # worker gets its own PipelineProvider.
+            thread_safe=False,
         )
-        self.pipeline_provider = None
 
-    def setup(self, args):
+    def create_worker_model(self):
         # Pipelines are built lazily per requested language and cached; preload
         # the default so the common case is warm at startup.
         print("Loading Stanza pipeline (en)…")
-        self.pipeline_provider = PipelineProvider(processors='tokenize,pos,lemma,depparse')
-        self.pipeline_provider.get('en')
+        pipeline_provider = PipelineProvider(processors='tokenize,pos,lemma,depparse')
+        pipeline_provider.get('en')
+        return pipeline_provider
 
     def process_request(self, request_data, response_helper):
-        # `BaseService.handle_service_request` already wraps this in a
-        # non-blocking single-flight lock — only one parse runs at a time across
-        # every served project, which is what the shared (not thread-safe) Stanza
-        # pipelines need — and reports any exception via response_helper.error.
-        # So this just does the work; a second concurrent request is rejected
-        # with "try again later" rather than queued (parsing is CPU-bound).
+        # `BaseService` runs this on one of its workers (one by default; see
+        # --workers / --queue-size), each driving its own Stanza pipelines, and
+        # reports any exception via response_helper.error. So this just does the
+        # work; a request arriving while every worker is busy and the queue is
+        # full is rejected with "try again later".
         print(f"Received service request: {request_data}")
         document_id = request_data.get('document_id')
         # User-controlled arguments (declared in the parameter schema above; the
@@ -737,7 +763,7 @@ class StanzaParserService(BaseService):
         # generic per-op "Bulk create N tokens", etc.).
         with self.client.audit_message(f"Stanza UD parse ({language})"):
             with self.client.documents.locked(document_id):
-                summary = parse_document(self.pipeline_provider, self.client, document_id,
+                summary = parse_document(self.worker_model, self.client, document_id,
                                          language=language, overwrite=overwrite)
 
         # parse_document returns a summary dict; report what it actually did.
@@ -759,4 +785,5 @@ if __name__ == '__main__':
     #   python ud_parse_stanza.py --all          → serve ALL accessible projects
     #   python ud_parse_stanza.py PROJECT_ID     → serve one project
     #   --url URL                                → Plaid API URL (default :8080)
+    #   --workers N / --queue-size N             → parallel parses / waiting room
     StanzaParserService().run()